@@ -0,0 +1,95 @@
+"""Local stand-in for an OpenAI-compatible endpoint, used by the benchmarks.
+
+Minimal HTTP/1.1 server on asyncio streams: honours keep-alive, counts accepted
+TCP connections, and can inject per-request latency and failure rates.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+
+DEFAULT_CONTENT = (
+    '{"intent": "off_topic", "response_text": "Let\'s get back to your email.", '
+    '"confidence": 0.9}'
+)
+
+
+class StubLLMServer:
+    """Serve ``POST /v1/chat/completions`` and ``GET /v1/models`` on localhost."""
+
+    def __init__(
+        self,
+        content: str = DEFAULT_CONTENT,
+        latency: float = 0.0,
+        failure_rate: float = 0.0,
+        failure_status: int = 503,
+    ) -> None:
+        self.content = content
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.connections = 0
+        self.requests = 0
+        self._server: asyncio.AbstractServer | None = None
+
+    @property
+    def url(self) -> str:
+        assert self._server is not None
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def start(self) -> StubLLMServer:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def __aenter__(self) -> StubLLMServer:
+        return await self.start()
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.decode("latin-1").split("\r\n")
+                method, path, _ = lines[0].split(" ", 2)
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        k, v = line.split(":", 1)
+                        headers[k.strip().lower()] = v.strip()
+                length = int(headers.get("content-length", "0"))
+                if length:
+                    await reader.readexactly(length)
+                self.requests += 1
+                status, body = await self._respond(method, path)
+                writer.write(
+                    f"HTTP/1.1 {status} X\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, method: str, path: str) -> tuple[int, bytes]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if path == "/v1/models":
+            return 200, b'{"data": []}'
+        if self.failure_rate and random.random() < self.failure_rate:
+            return self.failure_status, b'{"error": "injected"}'
+        payload = {"choices": [{"message": {"role": "assistant", "content": self.content}}]}
+        return 200, json.dumps(payload).encode()
@@ -0,0 +1,78 @@
+"""Benchmark: lead validation throughput, validate_field per value vs validate_batch vs file import.
+
+Generates ``--rows`` synthetic leads (with the duplicates and blanks real dumps
+have) for the default config, then measures values/s for one validate_field
+call per value, rows/s for validate_columns over whole columns, and rows/s for
+validate_lead_file on a JSONL file with 1 and ``--workers`` processes.
+
+    PYTHONPATH=src python benchmarks/bench_batch_validation.py [--rows 500000] [--workers 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from konko_agent.config.loader import load_config
+from konko_agent.domain.validators import validate_columns, validate_field
+from konko_agent.infrastructure.lead_import import validate_lead_file
+
+CONFIG = os.path.join(os.path.dirname(__file__), "..", "configs", "default_agent.yaml")
+
+
+def leads(n: int, seed: int = 7) -> list[dict[str, str]]:
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        uid = rng.randrange(n // 3 or 1)  # about a third distinct
+        rows.append(
+            {
+                "email": rng.choice([f"user{uid}@example.com", "", "n/a", f"user{uid}@example"]),
+                "name": rng.choice([f"User {uid}", "", "???"]),
+                "phone": rng.choice([f"+1 (555) {uid % 1000:03d}-{uid % 10000:04d}", "555-0100", ""]),
+                "address": rng.choice([f"{uid} Main St", "", "n/a"]),
+            }
+        )
+    return rows
+
+
+def main(n: int, workers: int) -> None:
+    config = load_config(CONFIG)
+    rows = leads(n)
+    columns = {f.name: [r[f.name] for r in rows] for f in config.fields}
+    values = n * len(config.fields)
+
+    start = time.perf_counter()
+    for f in config.fields:
+        for v in columns[f.name]:
+            validate_field(v, f.type, f.validation_regex)
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    validate_columns(columns, config.fields)
+    batch = time.perf_counter() - start
+
+    print(f"validate_field per value: {values / single:12,.0f} values/s")
+    print(f"validate_columns        : {values / batch:12,.0f} values/s  ({single / batch:.1f}x)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "leads.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            for r in rows:
+                f.write(json.dumps(r) + "\n")
+        for w in sorted({1, workers}):
+            with open(os.devnull, "w", encoding="utf-8") as out:
+                stats = validate_lead_file(path, config, out, workers=w)
+            print(f"validate_lead_file, {w:2d} worker(s): {stats.rows_per_second:10,.0f} rows/s ({stats.valid} valid)")
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--rows", type=int, default=500_000)
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = p.parse_args()
+    main(args.rows, args.workers)
@@ -0,0 +1,82 @@
+"""Benchmark: latency and cost per turn, large model only vs a small/large cascade.
+
+Simulates ``--turns`` turns against two scripted tiers with fixed latencies and
+prices. A share ``--hard`` of turns gets an untrusted small-model reply (low
+confidence, a correction, or a reply that does not parse) and is re-run on the
+large tier. Reports mean latency, estimated cost and the escalation rate.
+
+    PYTHONPATH=src python benchmarks/bench_cascade.py [--turns 200] [--hard 0.2]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+
+from konko_agent.infrastructure.llm_cascade import CascadeLLMClient
+
+SYSTEM = "You collect contact details for a sales team. " * 40
+GOOD = '{"intent": "field_response", "response_text": "Thanks!", "extracted_value": "a@b.com", "confidence": 0.93}'
+HARD = (
+    '{"intent": "field_response", "response_text": "Hmm?", "confidence": 0.41}',
+    '{"intent": "correction", "response_text": "Fixed.", "extracted_value": "b@c.com", "confidence": 0.9}',
+    '{"intent": "field_response", "response_te',
+)
+
+
+SMALL_PRICE, LARGE_PRICE = 0.15, 2.5  # per 1k tokens
+
+
+class ScriptedTier:
+    """Returns scripted replies after a fixed delay."""
+
+    def __init__(self, latency: float, replies: list[str]) -> None:
+        self.latency = latency
+        self.replies = replies
+        self.calls = 0
+
+    async def complete(self, system_prompt: str, user_message: str) -> str:
+        await asyncio.sleep(self.latency)
+        reply = self.replies[self.calls % len(self.replies)]
+        self.calls += 1
+        return reply
+
+
+async def main(turns: int, hard: float, small_latency: float, large_latency: float) -> None:
+    rng = random.Random(7)
+    small_replies = [rng.choice(HARD) if rng.random() < hard else GOOD for _ in range(turns)]
+    small = ScriptedTier(small_latency, small_replies)
+    large = ScriptedTier(large_latency, [GOOD])
+    llm = CascadeLLMClient([small, large], costs_per_1k_tokens=[SMALL_PRICE, LARGE_PRICE])
+    messages = [f"my email is user{i}@example.com" for i in range(turns)]
+
+    start = time.perf_counter()
+    for m in messages:
+        await large.complete(SYSTEM, m)
+    large_ms = (time.perf_counter() - start) * 1000 / turns
+    start = time.perf_counter()
+    for m in messages:
+        await llm.complete(SYSTEM, m)
+    cascade_ms = (time.perf_counter() - start) * 1000 / turns
+
+    stats = llm.stats
+    large_tier = stats.tiers[1]
+    large_cost = large_tier.cost / large_tier.calls if large_tier.calls else 0.0  # same prompts and replies
+    print(
+        f"{turns} turns, {hard:.0%} hard; "
+        f"latency small {small_latency * 1000:.0f} ms, large {large_latency * 1000:.0f} ms"
+    )
+    print(f"{'':12}{'ms/turn':>10}{'cost/turn':>12}{'escalated':>11}")
+    print(f"{'large only':12}{large_ms:10.1f}{large_cost:12.5f}{'':>11}")
+    print(f"{'cascade':12}{cascade_ms:10.1f}{stats.cost / turns:12.5f}{stats.escalation_rate:11.0%}")
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--turns", type=int, default=200)
+    p.add_argument("--hard", type=float, default=0.2)
+    p.add_argument("--small-latency", type=float, default=0.02)
+    p.add_argument("--large-latency", type=float, default=0.08)
+    args = p.parse_args()
+    asyncio.run(main(args.turns, args.hard, args.small_latency, args.large_latency))
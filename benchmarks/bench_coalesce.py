@@ -0,0 +1,78 @@
+"""Benchmark: LLM calls per conversation with and without burst coalescing.
+
+Simulates chat-widget traffic: each of ``--sessions`` sessions sends
+``--bursts`` bursts of 1-``--max-burst`` messages, ``--gap`` seconds apart
+within a burst, against a mock LLM with ``--latency`` seconds of latency.
+
+    PYTHONPATH=src python benchmarks/bench_coalesce.py [--sessions 200] [--window 0.3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import time
+
+from konko_agent.config.loader import load_config
+from konko_agent.infrastructure.state_store import InMemoryStateStore
+from konko_agent.orchestration.runtime import AgentRuntime
+
+CONFIG = os.path.join(os.path.dirname(__file__), "..", "configs", "default_agent.yaml")
+REPLY = '{"intent": "off_topic", "response_text": "Noted.", "confidence": 0.5}'
+
+
+class LatencyLLM:
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.calls = 0
+
+    async def complete(self, system_prompt: str, user_message: str) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return REPLY
+
+
+async def conversation(rt: AgentRuntime, sid: str, rng: random.Random, args: argparse.Namespace) -> int:
+    await rt.start_session(sid)
+    sent = 0
+    for _ in range(args.bursts):
+        pending = []
+        for _ in range(rng.randint(1, args.max_burst)):
+            pending.append(asyncio.create_task(rt.handle_message(sid, "part of a thought")))
+            sent += 1
+            await asyncio.sleep(rng.uniform(0, args.gap))
+        await asyncio.gather(*pending)
+    return sent
+
+
+async def run(window: float, args: argparse.Namespace) -> None:
+    llm = LatencyLLM(args.latency)
+    rt = AgentRuntime(load_config(CONFIG), llm, InMemoryStateStore(), coalesce_window=window)
+    start = time.perf_counter()
+    sent = await asyncio.gather(
+        *(conversation(rt, f"s{i}", random.Random(i), args) for i in range(args.sessions))
+    )
+    elapsed = time.perf_counter() - start
+    print(
+        f"window={window:5.2f}s  messages={sum(sent):6d}  llm_calls={llm.calls:6d}  "
+        f"calls/conversation={llm.calls / args.sessions:5.2f}  wall={elapsed:5.2f}s  "
+        f"superseded={rt.stats.superseded_turns}"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    await run(0.0, args)
+    await run(args.window, args)
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--sessions", type=int, default=200)
+    p.add_argument("--bursts", type=int, default=5)
+    p.add_argument("--max-burst", type=int, default=3)
+    p.add_argument("--gap", type=float, default=0.2)
+    p.add_argument("--latency", type=float, default=0.5)
+    p.add_argument("--window", type=float, default=0.3)
+    asyncio.run(main(p.parse_args()))
@@ -0,0 +1,59 @@
+"""Benchmark: prompt tokens per turn over long conversations, latest message vs full history vs budgeted context.
+
+Simulates ``--turns`` turns (a user and an assistant message each) and reports,
+at a few points of the conversation, the estimated tokens of the user message
+sent to the LLM for: the latest message only, the full history, and the
+ContextAssembler with ``--budget``. Also reports the assembler's cost per turn.
+
+    PYTHONPATH=src python benchmarks/bench_context.py [--turns 500] [--budget 600]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+from konko_agent.config.loader import load_config
+from konko_agent.domain.compact_state import CompactState, MessageRecord
+from konko_agent.orchestration.context import ContextAssembler, estimate_tokens
+
+CONFIG = os.path.join(os.path.dirname(__file__), "..", "configs", "default_agent.yaml")
+
+
+def full_history(state: CompactState) -> str:
+    return "\n".join(f"{m.role}: {m.content}" for m in state.messages)
+
+
+def main(turns: int, budget: int) -> None:
+    config = load_config(CONFIG).model_copy(update={"context_token_budget": budget})
+    assembler = ContextAssembler(config)
+    state = CompactState(session_id="bench", phase="collecting")
+    state.messages.append(MessageRecord("assistant", "Hi! What's your email?"))
+    checkpoints = {10, 50, 100, 200, turns}
+    rows = []
+    elapsed = 0.0
+    for t in range(1, turns + 1):
+        user = f"Sure - it's user{t}@example.com, and I'd also like to ask about plan {t}."
+        state.messages.append(MessageRecord("user", user))
+        start = time.perf_counter()
+        text = assembler.user_message(state)
+        elapsed += time.perf_counter() - start
+        if t in checkpoints:
+            latest = state.messages[-1].content
+            rows.append((t, estimate_tokens(latest), estimate_tokens(full_history(state)), estimate_tokens(text)))
+        reply = f"Thanks! I noted that. Could you confirm your phone number for request {t}?"
+        state.messages.append(MessageRecord("assistant", reply))
+
+    print(f"budget {budget} tokens; assembler {elapsed * 1e6 / turns:.1f} us/turn")
+    print(f"{'turn':>6}{'latest only':>14}{'full history':>14}{'budgeted':>12}")
+    for t, latest, full, budgeted in rows:
+        print(f"{t:6d}{latest:14d}{full:14d}{budgeted:12d}")
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--turns", type=int, default=500)
+    p.add_argument("--budget", type=int, default=600)
+    args = p.parse_args()
+    main(args.turns, args.budget)
@@ -0,0 +1,107 @@
+"""Benchmark: JournalStateStore turns/s with fsync on and off, and recovery time.
+
+Runs ``--sessions`` concurrent sessions for ``--turns`` turns each (one
+user/assistant exchange per turn, persisted as a StateDelta) and reports
+turns/s and p50/p99 turn latency with and without fsync. Then writes a
+journal of ``--records`` records and times reopening it.
+
+    PYTHONPATH=src python benchmarks/bench_journal_store.py [--sessions 1000] [--turns 20] [--records 1000000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from konko_agent.domain.state import ConversationState, FieldState, Message, StateDelta
+from konko_agent.infrastructure.journal_store import JournalStateStore
+
+
+def new_state(session_id: str) -> ConversationState:
+    return ConversationState(
+        session_id=session_id,
+        phase="collecting",
+        messages=[Message(role="assistant", content="Hi! What's your email?")],
+        fields={name: FieldState(field_name=name) for name in ("email", "name", "phone")},
+        current_field="email",
+    )
+
+
+def turn_delta(state: ConversationState, t: int) -> StateDelta:
+    return StateDelta(
+        message_offset=len(state.messages),
+        messages=[
+            Message(role="user", content=f"turn {t}: here is some text from the user"),
+            Message(role="assistant", content="Thanks! Anything else?"),
+        ],
+        phase=state.phase,
+        current_field=state.current_field,
+    )
+
+
+async def run_turns(store: JournalStateStore, sessions: int, turns: int) -> list[float]:
+    latencies: list[float] = []
+
+    async def session(i: int) -> None:
+        sid = f"s{i}"
+        await store.set(sid, new_state(sid))
+        for t in range(turns):
+            state = await store.get(sid)
+            t0 = time.perf_counter()
+            await store.apply_delta(sid, turn_delta(state, t))
+            latencies.append(time.perf_counter() - t0)
+
+    await asyncio.gather(*(session(i) for i in range(sessions)))
+    return latencies
+
+
+async def bench_turns(sessions: int, turns: int, fsync: bool) -> None:
+    with tempfile.TemporaryDirectory() as d:
+        store = JournalStateStore(d, fsync=fsync)
+        start = time.perf_counter()
+        latencies = await run_turns(store, sessions, turns)
+        elapsed = time.perf_counter() - start
+        await store.aclose()
+    q = statistics.quantiles(latencies, n=100)
+    label = "fsync=on " if fsync else "fsync=off"
+    print(
+        f"{label} {len(latencies) / elapsed:9.0f} turns/s  p50={q[49] * 1e3:7.3f} ms  "
+        f"p99={q[98] * 1e3:7.3f} ms  {store.stats}"
+    )
+
+
+async def bench_recovery(records: int, sessions: int) -> None:
+    turns = max(1, records // sessions - 1)
+    with tempfile.TemporaryDirectory() as d:
+        store = JournalStateStore(d, fsync=False)
+        await run_turns(store, sessions, turns)
+        await store.aclose()
+        written = store.stats.records
+        size = sum(p.stat().st_size for p in Path(d).iterdir())
+
+        reopened = JournalStateStore(d)
+        s = reopened.stats
+        print(
+            f"recovery: {written} records written, {s.recovered_records} on disk "
+            f"({size / 1e6:.1f} MB), {s.replayed_records} replayed in {s.recovery_seconds:.2f} s"
+        )
+        await reopened.aclose()
+
+
+async def main(sessions: int, turns: int, records: int) -> None:
+    await bench_turns(sessions, turns, fsync=True)
+    await bench_turns(sessions, turns, fsync=False)
+    await bench_recovery(records, sessions)
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--sessions", type=int, default=1000)
+    p.add_argument("--turns", type=int, default=20)
+    p.add_argument("--records", type=int, default=1_000_000)
+    args = p.parse_args()
+    asyncio.run(main(args.sessions, args.turns, args.records))
@@ -0,0 +1,69 @@
+"""Benchmark: per-call httpx.AsyncClient vs the pooled KonkoLLMClient.
+
+Runs both against a local stand-in endpoint and reports wall time per call and
+how many TCP connections the server had to accept. Over TLS the per-connection
+cost is larger still, so the savings here are a lower bound.
+
+    PYTHONPATH=src python benchmarks/bench_llm_pool.py [--calls 500] [--concurrency 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from _stub_server import StubLLMServer
+from konko_agent.infrastructure.llm_client import KonkoLLMClient
+
+
+async def fresh_client_call(base_url: str) -> None:
+    """The previous behaviour: one AsyncClient (and connection) per turn."""
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        r = await client.post(
+            f"{base_url}/v1/chat/completions",
+            json={"model": "m", "messages": [{"role": "user", "content": "hi"}]},
+        )
+        r.raise_for_status()
+        r.json()
+
+
+async def drive(call, calls: int, concurrency: int) -> float:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with sem:
+            await call()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(calls)))
+    return time.perf_counter() - start
+
+
+async def main(calls: int, concurrency: int) -> None:
+    async with StubLLMServer() as server:
+        elapsed = await drive(lambda: fresh_client_call(server.url), calls, concurrency)
+        print(
+            f"fresh client : {elapsed * 1000 / calls:7.3f} ms/call  "
+            f"connections={server.connections}"
+        )
+
+    async with StubLLMServer() as server:
+        async with KonkoLLMClient(server.url, max_keepalive_connections=concurrency) as llm:
+            await llm.warmup(concurrency)
+            warm = server.connections
+            elapsed = await drive(lambda: llm.complete("sys", "hi"), calls, concurrency)
+        print(
+            f"pooled client: {elapsed * 1000 / calls:7.3f} ms/call  "
+            f"connections={server.connections} (warmup opened {warm})"
+        )
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--calls", type=int, default=500)
+    p.add_argument("--concurrency", type=int, default=50)
+    args = p.parse_args()
+    asyncio.run(main(args.calls, args.concurrency))
@@ -0,0 +1,103 @@
+"""Benchmark: serialized size and encode/decode speed, binary state codec vs pydantic JSON.
+
+Builds one conversation of ``--turns`` turns (a user and an assistant message
+per turn, an attempt every other turn) and reports bytes and microseconds per
+encode/decode for model_dump_json/model_validate_json and for the codec,
+with and without compression of the message bodies.
+
+    PYTHONPATH=src python benchmarks/bench_state_codec.py [--turns 50] [--repeat 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from konko_agent.domain.compact_state import compact_from_model
+from konko_agent.domain.state import ConversationState, EscalationState, FieldAttempt, FieldState, Message
+from konko_agent.domain.state_codec import decode_compact, decode_state, encode_state
+
+FIELDS = ("email", "name", "phone", "address")
+
+
+def conversation(turns: int) -> ConversationState:
+    start = datetime(2024, 5, 1, 12, 0, 0)
+    fields = {name: FieldState(field_name=name) for name in FIELDS}
+    messages = []
+    for i in range(turns):
+        messages.append(Message(role="user", content=f"Sure, my {FIELDS[i % 4]} is value number {i}, thanks!"))
+        messages.append(Message(role="assistant", content=f"Thanks! Got it. Could you also share your {FIELDS[(i + 1) % 4]}?"))
+        if i % 2 == 0:
+            fields[FIELDS[i % 4]].attempts.append(
+                FieldAttempt(
+                    value=f"value-{i}",
+                    timestamp=start + timedelta(seconds=30 * i, microseconds=i),
+                    confidence=0.9,
+                    validation_status="valid" if i % 3 else "invalid",
+                )
+            )
+    return ConversationState(
+        session_id="bench-session-0001",
+        phase="escalated",
+        messages=messages,
+        fields=fields,
+        current_field=None,
+        escalation=EscalationState(reason="all_fields_collected", fields={f: "x" for f in FIELDS}),
+    )
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1e6 / repeat
+
+
+def main(turns: int, repeat: int) -> None:
+    state = conversation(turns)
+    compact = compact_from_model(state)
+    rows = []
+
+    raw = state.model_dump_json()
+    rows.append(
+        (
+            "pydantic JSON",
+            len(raw.encode()),
+            timed(state.model_dump_json, repeat),
+            timed(lambda: ConversationState.model_validate_json(raw), repeat),
+        )
+    )
+    for label, compress in (("codec", False), ("codec + zlib", True)):
+        data = encode_state(state, compress=compress)
+        assert decode_state(data) == state
+        rows.append(
+            (
+                label,
+                len(data),
+                timed(lambda c=compress: encode_state(state, compress=c), repeat),
+                timed(lambda d=data: decode_state(memoryview(d)), repeat),
+            )
+        )
+    data = encode_state(compact, compress=False)
+    rows.append(
+        (
+            "codec, CompactState",
+            len(data),
+            timed(lambda: encode_state(compact, compress=False), repeat),
+            timed(lambda: decode_compact(memoryview(data)), repeat),
+        )
+    )
+
+    print(f"{turns} turns, {len(state.messages)} messages")
+    print(f"{'':22}{'bytes':>8}{'encode us':>12}{'decode us':>12}")
+    for label, size, enc, dec in rows:
+        print(f"{label:22}{size:8d}{enc:12.1f}{dec:12.1f}")
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--turns", type=int, default=50)
+    p.add_argument("--repeat", type=int, default=2000)
+    args = p.parse_args()
+    main(args.turns, args.repeat)
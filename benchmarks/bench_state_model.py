@@ -0,0 +1,105 @@
+"""Benchmark: bytes per session and per-turn record cost, pydantic models vs compact state.
+
+Builds ``--sessions`` conversations of ``--turns`` turns each in both
+representations and reports resident bytes per session (tracemalloc), the
+cost of creating one turn's records, and end-to-end agent turns/s on the
+in-memory store.
+
+    PYTHONPATH=src python benchmarks/bench_state_model.py [--sessions 2000] [--turns 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import os
+import time
+import tracemalloc
+from datetime import datetime
+
+from konko_agent.config.loader import load_config
+from konko_agent.domain.compact_state import CompactState, FieldSlot, MessageRecord, new_attempt
+from konko_agent.domain.state import ConversationState, FieldAttempt, FieldState, Message
+from konko_agent.infrastructure.llm_client import MockLLMClient
+from konko_agent.infrastructure.state_store import InMemoryStateStore
+from konko_agent.orchestration.agent import ConversationAgent
+
+CONFIG = os.path.join(os.path.dirname(__file__), "..", "configs", "default_agent.yaml")
+FIELDS = ("email", "name", "phone", "address")
+
+
+def model_turn(state: ConversationState, t: int) -> None:
+    state.messages.append(Message(role="user", content=f"turn {t}: some user text"))
+    state.fields[FIELDS[t % len(FIELDS)]].attempts.append(
+        FieldAttempt(value=f"value {t}", timestamp=datetime.utcnow(), confidence=0.9, validation_status="valid")
+    )
+    state.messages.append(Message(role="assistant", content="Thanks! What's next?"))
+
+
+def compact_turn(state: CompactState, t: int) -> None:
+    state.messages.append(MessageRecord("user", f"turn {t}: some user text"))
+    state.fields[FIELDS[t % len(FIELDS)]].attempts.append(new_attempt(f"value {t}", 0.9, "valid"))
+    state.messages.append(MessageRecord("assistant", "Thanks! What's next?"))
+
+
+def build_model(i: int, turns: int) -> ConversationState:
+    state = ConversationState(
+        session_id=f"s{i}", phase="collecting", fields={f: FieldState(field_name=f) for f in FIELDS}
+    )
+    for t in range(turns):
+        model_turn(state, t)
+    return state
+
+
+def build_compact(i: int, turns: int) -> CompactState:
+    state = CompactState(session_id=f"s{i}", phase="collecting", fields={f: FieldSlot(f) for f in FIELDS})
+    for t in range(turns):
+        compact_turn(state, t)
+    return state
+
+
+def bytes_per_session(build, sessions: int, turns: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [build(i, turns) for i in range(sessions)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return (after - before) / sessions
+
+
+def turn_cost(build, turn, n: int) -> float:
+    state = build(0, 0)
+    start = time.perf_counter()
+    for t in range(n):
+        turn(state, t)
+    return (time.perf_counter() - start) / n
+
+
+async def agent_turns(sessions: int, turns: int) -> float:
+    reply = '{"intent": "off_topic", "response_text": "Sure.", "confidence": 0.5}'
+    agent = ConversationAgent(load_config(CONFIG), MockLLMClient([reply] * (sessions * turns)), InMemoryStateStore())
+    start = time.perf_counter()
+    for i in range(sessions):
+        await agent.start_session(f"s{i}")
+        for t in range(turns):
+            await agent.handle_message(f"s{i}", f"message {t}")
+    return sessions * turns / (time.perf_counter() - start)
+
+
+def main(sessions: int, turns: int) -> None:
+    for name, build, turn in (("pydantic", build_model, model_turn), ("compact", build_compact, compact_turn)):
+        size = bytes_per_session(build, sessions, turns)
+        cost = turn_cost(build, turn, 20000)
+        print(f"{name:9s} {size:10.0f} bytes/session   {cost * 1e6:6.2f} us to record one turn")
+    print(f"agent     {asyncio.run(agent_turns(min(sessions, 200), turns)):10.0f} turns/s (mock LLM, in-memory store)")
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--sessions", type=int, default=2000)
+    p.add_argument("--turns", type=int, default=20)
+    args = p.parse_args()
+    main(args.sessions, args.turns)
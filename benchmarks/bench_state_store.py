@@ -0,0 +1,109 @@
+"""Benchmark: StateStore get/set/turn throughput and latency, in-memory vs SQLite vs bounded.
+
+Writes and reads ``--sessions`` realistic conversation states with
+``--concurrency`` concurrent tasks and reports ops/s and p50/p99 latency.
+"turn" appends one user/assistant exchange to every session as a StateDelta.
+
+    PYTHONPATH=src python benchmarks/bench_state_store.py [--sessions 10000] [--concurrency 64]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from konko_agent.domain.state import (
+    ConversationState,
+    FieldAttempt,
+    FieldState,
+    Message,
+    StateDelta,
+)
+from konko_agent.infrastructure.bounded_store import BoundedInMemoryStateStore
+from konko_agent.infrastructure.sqlite_store import SQLiteStateStore
+from konko_agent.infrastructure.state_store import InMemoryStateStore
+
+
+def make_state(i: int, turns: int = 6) -> ConversationState:
+    fields = {name: FieldState(field_name=name) for name in ("email", "name", "phone", "address")}
+    fields["email"].attempts.append(
+        FieldAttempt(value=f"user{i}@example.com", timestamp=datetime.utcnow(), confidence=0.9, validation_status="valid")
+    )
+    messages = []
+    for t in range(turns):
+        messages.append(Message(role="user", content=f"message {t} from session {i}"))
+        messages.append(Message(role="assistant", content="Thanks! What's your name?"))
+    return ConversationState(session_id=f"s{i}", phase="collecting", messages=messages, fields=fields, current_field="name")
+
+
+async def timed(op, ids: list[str], concurrency: int) -> tuple[float, list[float]]:
+    sem = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one(sid: str) -> None:
+        async with sem:
+            t0 = time.perf_counter()
+            await op(sid)
+            latencies.append(time.perf_counter() - t0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(sid) for sid in ids))
+    return time.perf_counter() - start, latencies
+
+
+def report(name: str, op: str, n: int, elapsed: float, latencies: list[float]) -> None:
+    q = statistics.quantiles(latencies, n=100)
+    print(
+        f"{name:10s} {op}: {n / elapsed:9.0f} ops/s  p50={q[49] * 1e3:7.3f} ms  p99={q[98] * 1e3:7.3f} ms"
+    )
+
+
+async def bench(name: str, store, states: dict[str, ConversationState], concurrency: int) -> None:
+    ids = list(states)
+    elapsed, lat = await timed(lambda sid: store.set(sid, states[sid]), ids, concurrency)
+    report(name, "set", len(ids), elapsed, lat)
+    elapsed, lat = await timed(store.get, ids, concurrency)
+    report(name, "get", len(ids), elapsed, lat)
+
+    def turn(sid: str) -> StateDelta:
+        state = states[sid]
+        return StateDelta(
+            message_offset=len(state.messages),
+            messages=[Message(role="user", content="one more"), Message(role="assistant", content="Noted.")],
+            phase=state.phase,
+            current_field=state.current_field,
+        )
+
+    elapsed, lat = await timed(lambda sid: store.apply_delta(sid, turn(sid)), ids, concurrency)
+    report(name, "turn", len(ids), elapsed, lat)
+    stats = getattr(store, "stats", None)
+    if stats is not None:
+        print(f"{'':10s} {stats}")
+
+
+async def main(sessions: int, concurrency: int) -> None:
+    states = {f"s{i}": make_state(i) for i in range(sessions)}
+    await bench("in-memory", InMemoryStateStore(), states, concurrency)
+    with tempfile.TemporaryDirectory() as d:
+        store = SQLiteStateStore(Path(d) / "bench.db")
+        await bench("sqlite", store, states, concurrency)
+        await store.aclose()
+    with tempfile.TemporaryDirectory() as d:
+        # A tenth of the sessions resident; the rest spill to SQLite and fault back in.
+        spill = SQLiteStateStore(Path(d) / "spill.db")
+        store = BoundedInMemoryStateStore(spill, max_sessions=max(1, sessions // 10))
+        await bench("bounded", store, states, concurrency)
+        await store.aclose()
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--sessions", type=int, default=10000)
+    p.add_argument("--concurrency", type=int, default=64)
+    args = p.parse_args()
+    asyncio.run(main(args.sessions, args.concurrency))
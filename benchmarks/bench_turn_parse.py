@@ -0,0 +1,64 @@
+"""Benchmark: cost of turning an LLM reply into a TurnAnalysis, by reply shape.
+
+Parses ``--repeat`` copies of a clean reply, the same reply in a code fence,
+wrapped in prose, and cut off mid-object, and reports microseconds per reply
+for the old path (json.loads + model_validate, clean replies only) and for
+parse_turn_analysis, with the ParseStats outcome of each shape.
+
+    PYTHONPATH=src python benchmarks/bench_turn_parse.py [--repeat 20000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+from konko_agent.domain.intent import ParseStats, TurnAnalysis, parse_turn_analysis
+
+REPLY = json.dumps(
+    {
+        "intent": "field_response",
+        "response_text": "Thanks, Alice! What's the best phone number to reach you?",
+        "extracted_value": "alice@example.com",
+        "confidence": 0.92,
+        "field_name": "email",
+        "extractions": [
+            {"field_name": "email", "value": "alice@example.com", "confidence": 0.92},
+            {"field_name": "name", "value": "Alice", "confidence": 0.85},
+        ],
+    }
+)
+
+SHAPES = {
+    "clean": REPLY,
+    "fenced": "```json\n" + REPLY + "\n```",
+    "prose-wrapped": "Sure! Here is the analysis:\n" + REPLY + "\nHope this helps.",
+    "truncated": REPLY[: len(REPLY) * 2 // 3],
+}
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1e6 / repeat
+
+
+def main(repeat: int) -> None:
+    old = timed(lambda: TurnAnalysis.model_validate(json.loads(REPLY)), repeat)
+    print(f"{'':16}{'us/reply':>10}  outcome")
+    print(f"{'clean, old path':16}{old:10.1f}  json.loads + model_validate")
+    for label, raw in SHAPES.items():
+        stats = ParseStats()
+        parse_turn_analysis(raw, stats)
+        outcome = next(name for name in ("parsed", "repaired", "failed") if getattr(stats, name))
+        us = timed(lambda r=raw: parse_turn_analysis(r), repeat)
+        print(f"{label:16}{us:10.1f}  {outcome}")
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--repeat", type=int, default=20000)
+    args = p.parse_args()
+    main(args.repeat)
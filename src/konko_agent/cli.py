@@ -8,40 +8,105 @@ import os
 import sys
 
 from konko_agent.config.loader import load_config
+from konko_agent.domain.intent import turn_response_format
+from konko_agent.infrastructure.lead_import import DEFAULT_CHUNK_ROWS, validate_lead_file
+from konko_agent.infrastructure.llm_cascade import CascadeLLMClient
 from konko_agent.infrastructure.llm_client import KonkoLLMClient
+from konko_agent.infrastructure.llm_router import MultiEndpointLLMClient
 from konko_agent.infrastructure.state_store import InMemoryStateStore
 from konko_agent.orchestration.runtime import AgentRuntime
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Konko Agent interactive demo")
     p.add_argument("--config", "-c", required=True, help="Path to agent YAML config")
     p.add_argument("--session", "-s", default="cli-session", help="Session ID")
-    return p.parse_args()
-
-
-async def run_interactive(runtime: AgentRuntime, session_id: str) -> None:
-    # Start the session and show the configured greeting from state.
-    greeting = await runtime.start_session(session_id)
-    print(greeting)
-    print()
-    while True:
-        try:
-            line = input("You: ").strip()
-        except EOFError:
-            break
-        if not line:
-            continue
-        if line.lower() in ("quit", "exit", "q"):
-            print("Goodbye.")
-            break
-        reply = await runtime.handle_message(session_id, line)
-        print(f"Agent: {reply}")
+    p.add_argument("--no-stream", action="store_true", help="Wait for full replies instead of streaming")
+    p.add_argument(
+        "--endpoint",
+        action="append",
+        default=[],
+        help="OpenAI-compatible base URL; repeat to route across several endpoints",
+    )
+    p.add_argument("--hedge", action="store_true", help="Hedge slow requests to a second endpoint")
+    return p.parse_args(argv)
+
+
+def parse_validate_args(argv: list[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        prog="konko-agent validate",
+        description="Validate a CSV/JSONL lead file with the agent's field rules",
+    )
+    p.add_argument("--config", "-c", required=True, help="Path to agent YAML config")
+    p.add_argument("input", help="Lead file (.csv with a header row, or .jsonl)")
+    p.add_argument("--output", "-o", help="Write one JSON result per row here ('-' for stdout)")
+    p.add_argument("--workers", "-j", type=int, default=None, help="Worker processes (default: CPU count)")
+    p.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="Rows per batch")
+    return p.parse_args(argv)
+
+
+def run_validate(argv: list[str]) -> int:
+    args = parse_validate_args(argv)
+    try:
+        config = load_config(args.config)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    try:
+        if args.output in (None, "-"):
+            out = sys.stdout if args.output == "-" else None
+            stats = validate_lead_file(args.input, config, out, workers=args.workers, chunk_rows=args.chunk_rows)
+        else:
+            with open(args.output, "w", encoding="utf-8") as out:
+                stats = validate_lead_file(
+                    args.input, config, out, workers=args.workers, chunk_rows=args.chunk_rows
+                )
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(
+        f"{stats.rows} rows: {stats.valid} valid, {stats.invalid} invalid "
+        f"({stats.rows_per_second:,.0f} rows/s)",
+        file=sys.stderr,
+    )
+    for key, count in stats.errors.most_common():
+        print(f"  {key}: {count}", file=sys.stderr)
+    return 0 if stats.invalid == 0 else 2
+
+
+async def run_interactive(runtime: AgentRuntime, session_id: str, stream: bool = True) -> None:
+    # Warm the LLM connection pool up front; close it cleanly on exit.
+    async with runtime:
+        # Start the session and show the configured greeting from state.
+        greeting = await runtime.start_session(session_id)
+        print(greeting)
         print()
+        while True:
+            try:
+                line = input("You: ").strip()
+            except EOFError:
+                break
+            if not line:
+                continue
+            if line.lower() in ("quit", "exit", "q"):
+                print("Goodbye.")
+                break
+            if stream:
+                print("Agent: ", end="", flush=True)
+                async for delta in runtime.handle_message_stream(session_id, line):
+                    print(delta, end="", flush=True)
+                print()
+            else:
+                reply = await runtime.handle_message(session_id, line)
+                print(f"Agent: {reply}")
+            print()
 
 
-def main() -> int:
-    args = parse_args()
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["validate"]:
+        return run_validate(argv[1:])
+    args = parse_args(argv)
     try:
         config = load_config(args.config)
     except FileNotFoundError as e:
@@ -54,11 +119,27 @@ def main() -> int:
     base_url = config.llm_base_url or os.environ.get("OPENAI_BASE_URL", "https://api.openai.com")
     api_key = os.environ.get("OPENAI_API_KEY", "")
 
-    llm = KonkoLLMClient(base_url=base_url, model=config.llm_model, api_key=api_key or None)
+    endpoints = args.endpoint or [base_url]
+    client_kwargs = {"response_format": turn_response_format()} if config.structured_output else {}
+
+    def make_client(model: str) -> object:
+        if len(endpoints) > 1:
+            return MultiEndpointLLMClient.from_urls(
+                endpoints,
+                model=model,
+                api_key=api_key or None,
+                client_kwargs=client_kwargs,
+                hedge=args.hedge,
+            )
+        return KonkoLLMClient(base_url=endpoints[0], model=model, api_key=api_key or None, **client_kwargs)
+
+    llm = make_client(config.llm_model)
+    if config.cascade is not None:
+        llm = CascadeLLMClient.from_config(config, make_client(config.cascade.model), llm)
     store = InMemoryStateStore()
     runtime = AgentRuntime(config, llm, store)
 
-    asyncio.run(run_interactive(runtime, args.session))
+    asyncio.run(run_interactive(runtime, args.session, stream=not args.no_stream))
     return 0
 
 
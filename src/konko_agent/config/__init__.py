@@ -6,12 +6,15 @@ from konko_agent.config.models import (
     FieldConfig,
     PersonalityConfig,
 )
+from konko_agent.config.compiled import CompiledAgentConfig, compile_config
 from konko_agent.config.loader import load_config
 
 __all__ = [
     "AgentConfig",
+    "CompiledAgentConfig",
     "EscalationPolicy",
     "FieldConfig",
     "PersonalityConfig",
+    "compile_config",
     "load_config",
 ]
@@ -0,0 +1,69 @@
+"""Runtime view of an AgentConfig: indexed lookups and precompiled pieces, built once per config."""
+
+from __future__ import annotations
+
+import re
+import weakref
+
+from konko_agent.config.models import AgentConfig, FieldConfig
+
+
+class CompiledAgentConfig:
+    """
+    Everything the turn loop derives from an AgentConfig, computed once.
+
+    Lookups by field name and order are dicts instead of scans over ``fields``;
+    custom validation regexes are compiled; trigger phrases are lowered with
+    whitespace collapsed; the per-field prompt lines are rendered. Treat the
+    source config as immutable once compiled. Only a weak reference to it is
+    kept, so the compile_config cache does not keep configs alive.
+    """
+
+    def __init__(self, config: AgentConfig) -> None:
+        self._config = weakref.ref(config)
+        self.fields: tuple[FieldConfig, ...] = tuple(config.fields)
+        self.order: tuple[str, ...] = tuple(f.name for f in self.fields)
+        self.position: dict[str, int] = {name: i for i, name in enumerate(self.order)}
+        self.by_name: dict[str, FieldConfig] = {f.name: f for f in self.fields}
+        self.required_names: tuple[str, ...] = tuple(f.name for f in self.fields if f.required)
+        self.required: frozenset[str] = frozenset(self.required_names)
+        # FieldConfig has already rejected patterns that do not compile; FieldValidator
+        # checks them for super-linear constructs before matching anything.
+        self.patterns: dict[str, re.Pattern[str]] = {
+            f.name: re.compile(f.validation_regex)
+            for f in self.fields
+            if f.type == "custom" and f.validation_regex
+        }
+        self.trigger_phrases: tuple[str, ...] = tuple(
+            " ".join(p.lower().split()) for p in config.escalation.trigger_phrases if p.strip()
+        )
+        self.field_lines: tuple[str, ...] = tuple(f"  - {f.name} ({f.type}): {f.prompt}" for f in self.fields)
+
+    @property
+    def config(self) -> AgentConfig | None:
+        """The source config, or None once it has been garbage collected."""
+        return self._config()
+
+    def field(self, name: str | None) -> FieldConfig | None:
+        """The FieldConfig for ``name``, or None if it is not configured."""
+        return self.by_name.get(name) if name is not None else None
+
+    def pattern(self, field: FieldConfig) -> re.Pattern[str] | str | None:
+        """Compiled regex to validate ``field`` with (the raw config value for foreign fields)."""
+        return self.patterns.get(field.name, field.validation_regex)
+
+
+_compiled: dict[int, CompiledAgentConfig] = {}
+
+
+def compile_config(config: AgentConfig) -> CompiledAgentConfig:
+    """
+    The CompiledAgentConfig for ``config``, built on first use and cached until
+    the config object is garbage collected.
+    """
+    key = id(config)
+    compiled = _compiled.get(key)
+    if compiled is None or compiled.config is not config:
+        compiled = _compiled[key] = CompiledAgentConfig(config)
+        weakref.finalize(config, _compiled.pop, key, None)
+    return compiled
@@ -7,12 +7,14 @@ from pathlib import Path
 import yaml
 from pydantic import ValidationError
 
+from konko_agent.config.compiled import compile_config
 from konko_agent.config.models import AgentConfig
 
 
 def load_config(path: str | Path) -> AgentConfig:
     """
-    Load YAML file and validate into AgentConfig.
+    Load YAML file and validate into AgentConfig, compiling its runtime view
+    (cached; see compile_config) so the first turn does not pay for it.
     Raises FileNotFoundError, yaml.YAMLError, or ValidationError on invalid config.
     """
     path = Path(path)
@@ -25,6 +27,8 @@ def load_config(path: str | Path) -> AgentConfig:
         raise ValueError("Config file is empty")
 
     try:
-        return AgentConfig.model_validate(data)
+        config = AgentConfig.model_validate(data)
     except ValidationError as e:
         raise ValueError(f"Invalid config: {e}") from e
+    compile_config(config)
+    return config
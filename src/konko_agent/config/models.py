@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
+import re
 from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 # --- Field configuration ---
@@ -22,6 +23,18 @@ class FieldConfig(BaseModel):
     # For type="custom", validation uses this regex
     validation_regex: str | None = Field(default=None, description="Optional regex for custom type")
 
+    @field_validator("validation_regex")
+    @classmethod
+    def _check_validation_regex(cls, v: str | None) -> str | None:
+        # Fail at load time rather than per turn. Super-linear patterns are rejected where
+        # they are matched (FieldValidator, lead import), by the domain's safety check.
+        if v:
+            try:
+                re.compile(v)
+            except re.error as e:
+                raise ValueError(f"Invalid validation_regex {v!r}: {e}") from e
+        return v
+
 
 # --- Personality ---
 
@@ -72,6 +85,31 @@ class EscalationPolicy(BaseModel):
     trigger_phrases: list[str] = Field(default_factory=list)
 
 
+# --- Model cascade ---
+
+# Values of domain.intent.Intent; the cascade converts them where it uses them.
+IntentName = Literal["field_response", "correction", "escalation_request", "off_topic"]
+
+
+class CascadePolicy(BaseModel):
+    """Try a small model first; re-run the turn on llm_model when its reply is not trusted."""
+
+    model: str = Field(..., description="Small, fast model that answers every turn first")
+    confidence_threshold: float = Field(
+        default=0.7,
+        ge=0.0,
+        le=1.0,
+        description="Small-model replies below this confidence are re-run on llm_model.",
+    )
+    escalate_intents: list[IntentName] = Field(
+        default_factory=lambda: ["correction", "escalation_request"],
+        description="Intents always re-run on llm_model, whatever the confidence.",
+    )
+    # Prices only feed the cost counters; 0 leaves cost untracked
+    small_cost_per_1k_tokens: float = Field(default=0.0, ge=0.0)
+    large_cost_per_1k_tokens: float = Field(default=0.0, ge=0.0)
+
+
 # --- Top-level agent config ---
 
 
@@ -85,3 +123,49 @@ class AgentConfig(BaseModel):
     # LLM endpoint (optional in config; can be overridden by env)
     llm_base_url: str | None = Field(default=None)
     llm_model: str = Field(default="gpt-4o-mini")
+    structured_output: bool = Field(
+        default=False,
+        description="Request replies constrained to the TurnAnalysis JSON schema (OpenAI response_format).",
+    )
+    cascade: CascadePolicy | None = Field(
+        default=None,
+        description="Answer turns with a small model first and fall back to llm_model (unset: llm_model only).",
+    )
+    # Answer plain replies that already validate for current_field without calling the LLM
+    fast_path: bool = Field(
+        default=False,
+        description="Skip the LLM when the reply is a confident local match for the current field.",
+    )
+    # Custom-regex validation limits (user input is untrusted)
+    validation_max_length: int = Field(
+        default=256,  # domain.validators.MAX_CUSTOM_VALUE_LENGTH
+        gt=0,
+        description="Longest value a custom validation_regex is run against; longer values are invalid.",
+    )
+    validation_budget_ms: float = Field(
+        default=20.0,
+        gt=0,
+        description="A custom regex match slower than this moves that field's matching off the event loop.",
+    )
+    validation_timeout_ms: float = Field(
+        default=1000.0,
+        gt=0,
+        description="Off-loop matches taking longer than this are abandoned and the value treated as invalid.",
+    )
+    # Bounded message history (None keeps every message in the hot state)
+    history_window: int | None = Field(
+        default=None,
+        ge=2,
+        description="Messages kept in the session state; older ones move to the message archive.",
+    )
+    history_archive_batch: int = Field(
+        default=32,
+        gt=0,
+        description="Messages moved to the archive at a time, once the window is exceeded by this many.",
+    )
+    # Conversation context sent to the LLM (None sends only the latest user message)
+    context_token_budget: int | None = Field(
+        default=None,
+        ge=32,
+        description="Estimated tokens of history sent each turn: recent messages verbatim, older ones summarized.",
+    )
@@ -0,0 +1,330 @@
+"""Compact conversation state for the turn hot path: slotted records, pydantic only at the edges."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from konko_agent.domain.state import (
+    AttemptsDelta,
+    ConversationState,
+    EscalationState,
+    FieldAttempt,
+    FieldState,
+    Message,
+    StateDelta,
+    StateMark,
+    splice_messages,
+)
+
+
+@dataclass(slots=True)
+class AttemptRecord:
+    """FieldAttempt without validation; ``timestamp`` is POSIX seconds (UTC)."""
+
+    value: str
+    timestamp: float
+    confidence: float
+    validation_status: str
+    source: str = "user_provided"
+
+
+@dataclass(slots=True)
+class MessageRecord:
+    role: str
+    content: str
+
+
+@dataclass(slots=True)
+class FieldSlot:
+    """
+    FieldState counterpart: same attribute names, so domain functions accept either.
+    The position of the last valid attempt is maintained as attempts are added, so
+    ``current_value`` and ``is_collected`` are O(1). Mutate through ``add``/``truncate``
+    (or the CompactState methods, which also keep its DerivedIndex current).
+    """
+
+    field_name: str
+    attempts: list[AttemptRecord] = field(default_factory=list)
+    _current: int = field(default=-1, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._current = self._last_valid(len(self.attempts))
+
+    def _last_valid(self, end: int) -> int:
+        for i in range(end - 1, -1, -1):
+            if self.attempts[i].validation_status == "valid":
+                return i
+        return -1
+
+    @property
+    def current_value(self) -> str | None:
+        return self.attempts[self._current].value if self._current >= 0 else None
+
+    @property
+    def is_collected(self) -> bool:
+        return self._current >= 0
+
+    def add(self, attempt: AttemptRecord) -> bool:
+        """Append an attempt; True if the field just became collected."""
+        was_collected = self._current >= 0
+        self.attempts.append(attempt)
+        if attempt.validation_status == "valid":
+            self._current = len(self.attempts) - 1
+        return not was_collected and self._current >= 0
+
+    def truncate(self, count: int) -> bool:
+        """Keep the first ``count`` attempts; True if the field is no longer collected."""
+        if count >= len(self.attempts):
+            return False
+        del self.attempts[count:]
+        if self._current < count:
+            return False
+        self._current = self._last_valid(count)
+        return self._current < 0
+
+
+@dataclass(slots=True)
+class DerivedIndex:
+    """
+    Facts derived from a state's attempts for one field configuration, kept current
+    as attempts change: a collected bitmap over ``order``, the number of required
+    fields still missing, and the first uncollected field in order. ``source`` is
+    the configuration it was built for (compared by identity); ``required_names``
+    is the exact sequence callers pass to next_phase, so it can be matched by identity too.
+    """
+
+    source: object
+    order: Sequence[str]
+    required_names: Sequence[str]
+    position: dict[str, int]
+    required: frozenset[str]
+    collected: int = 0  # bit i set: order[i] is collected
+    missing_required: int = 0
+    next_pos: int = 0
+
+    @classmethod
+    def build(
+        cls,
+        source: object,
+        order: Sequence[str],
+        required_names: Sequence[str],
+        fields: dict[str, FieldSlot],
+        position: dict[str, int] | None = None,
+    ) -> DerivedIndex:
+        index = cls(
+            source=source,
+            order=order,
+            required_names=required_names,
+            position=position if position is not None else {name: i for i, name in enumerate(order)},
+            required=frozenset(required_names),
+            missing_required=len(set(required_names)),
+        )
+        for name, fs in fields.items():
+            if fs.is_collected:
+                index.mark_collected(name)
+        return index
+
+    @property
+    def next_field(self) -> str | None:
+        return self.order[self.next_pos] if self.next_pos < len(self.order) else None
+
+    def is_collected(self, name: str) -> bool:
+        pos = self.position.get(name)
+        return pos is not None and bool(self.collected >> pos & 1)
+
+    def mark_collected(self, name: str) -> None:
+        pos = self.position.get(name)
+        if pos is None or self.collected >> pos & 1:
+            return
+        self.collected |= 1 << pos
+        if name in self.required:
+            self.missing_required -= 1
+        while self.next_pos < len(self.order) and self.collected >> self.next_pos & 1:
+            self.next_pos += 1
+
+    def mark_missing(self, name: str) -> None:
+        pos = self.position.get(name)
+        if pos is None or not self.collected >> pos & 1:
+            return
+        self.collected &= ~(1 << pos)
+        if name in self.required:
+            self.missing_required += 1
+        self.next_pos = min(self.next_pos, pos)
+
+
+@dataclass(slots=True)
+class CompactState:
+    """ConversationState counterpart used inside ConversationAgent and in-process stores."""
+
+    session_id: str
+    phase: str
+    messages: list[MessageRecord] = field(default_factory=list)
+    fields: dict[str, FieldSlot] = field(default_factory=dict)
+    current_field: str | None = None
+    escalation: EscalationState | None = None
+    archived_messages: int = 0
+    derived: DerivedIndex | None = field(default=None, repr=False, compare=False)
+    # orchestration.context.RollingSummary of older messages; a cache, never persisted.
+    context_summary: object | None = field(default=None, repr=False, compare=False)
+
+    def bind_index(
+        self,
+        source: object,
+        order: Sequence[str],
+        required_names: Sequence[str],
+        position: dict[str, int] | None = None,
+    ) -> DerivedIndex:
+        """(Re)build the derived index for a field configuration; kept current from then on."""
+        self.derived = DerivedIndex.build(source, order, required_names, self.fields, position)
+        return self.derived
+
+    def field_slot(self, name: str) -> FieldSlot:
+        """The field's slot, created empty if missing."""
+        fs = self.fields.get(name)
+        if fs is None:
+            fs = self.fields[name] = FieldSlot(name)
+        return fs
+
+    def index_for(self, source: object) -> DerivedIndex | None:
+        """The derived index if it was bound for ``source``, else None."""
+        derived = self.derived
+        return derived if derived is not None and derived.source is source else None
+
+    def add_attempt(self, name: str, attempt: AttemptRecord) -> None:
+        if self.field_slot(name).add(attempt) and self.derived is not None:
+            self.derived.mark_collected(name)
+
+    def truncate_attempts(self, name: str, count: int) -> None:
+        fs = self.fields.get(name)
+        if fs is not None and fs.truncate(count) and self.derived is not None:
+            self.derived.mark_missing(name)
+
+    def archive_messages(self, count: int) -> list[MessageRecord]:
+        """Drop the oldest ``count`` hot messages (already copied to an archive) and return them."""
+        moved = self.messages[:count]
+        del self.messages[:count]
+        self.archived_messages += len(moved)
+        return moved
+
+
+def new_attempt(value: str, confidence: float, validation_status: str, source: str = "user_provided") -> AttemptRecord:
+    """An attempt stamped with the current time."""
+    return AttemptRecord(value, time.time(), confidence, validation_status, source)
+
+
+# --- boundary conversions ---
+
+
+def _to_epoch(ts: datetime) -> float:
+    if ts.tzinfo is None:  # the models store naive UTC (datetime.utcnow)
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
+
+def _to_datetime(ts: float) -> datetime:
+    return datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None)
+
+
+def attempt_record(a: FieldAttempt) -> AttemptRecord:
+    return AttemptRecord(a.value, _to_epoch(a.timestamp), a.confidence, a.validation_status, a.source)
+
+
+def attempt_model(a: AttemptRecord) -> FieldAttempt:
+    # Records only ever come from validated models or the agent, so skip re-validation.
+    return FieldAttempt.model_construct(
+        value=a.value,
+        timestamp=_to_datetime(a.timestamp),
+        confidence=a.confidence,
+        validation_status=a.validation_status,
+        source=a.source,
+    )
+
+
+def message_model(m: MessageRecord) -> Message:
+    return Message.model_construct(role=m.role, content=m.content)
+
+
+def compact_from_model(state: ConversationState) -> CompactState:
+    """Convert a loaded ConversationState to the compact form."""
+    return CompactState(
+        session_id=state.session_id,
+        phase=state.phase,
+        messages=[MessageRecord(m.role, m.content) for m in state.messages],
+        fields={
+            name: FieldSlot(fs.field_name, [attempt_record(a) for a in fs.attempts])
+            for name, fs in state.fields.items()
+        },
+        current_field=state.current_field,
+        escalation=state.escalation,
+        archived_messages=state.archived_messages,
+    )
+
+
+def compact_to_model(state: CompactState) -> ConversationState:
+    """Convert to a ConversationState for stores and API callers."""
+    return ConversationState.model_construct(
+        session_id=state.session_id,
+        phase=state.phase,
+        messages=[message_model(m) for m in state.messages],
+        fields={
+            name: FieldState.model_construct(
+                field_name=fs.field_name, attempts=[attempt_model(a) for a in fs.attempts]
+            )
+            for name, fs in state.fields.items()
+        },
+        current_field=state.current_field,
+        escalation=state.escalation,
+        archived_messages=state.archived_messages,
+    )
+
+
+def compact_delta_since(state: CompactState, mark: StateMark) -> StateDelta:
+    """delta_since for a CompactState: only the appended records are converted."""
+    fields: dict[str, AttemptsDelta] = {}
+    for name, fs in state.fields.items():
+        start = mark.attempts.get(name)
+        if start is None:
+            start = 0
+        elif len(fs.attempts) <= start:
+            continue
+        fields[name] = AttemptsDelta.model_construct(
+            offset=start, attempts=[attempt_model(a) for a in fs.attempts[start:]]
+        )
+    base = state.archived_messages
+    return StateDelta.model_construct(
+        message_offset=max(mark.messages, base),
+        messages=[message_model(m) for m in state.messages[max(mark.messages - base, 0) :]],
+        fields=fields,
+        phase=state.phase,
+        current_field=state.current_field,
+        escalation=state.escalation,
+        archived_messages=base,
+    )
+
+
+def rollback_compact(state: CompactState, mark: StateMark) -> None:
+    """rollback_to_mark for a CompactState, keeping its derived index current."""
+    del state.messages[max(mark.messages - state.archived_messages, 0) :]
+    for name, count in mark.attempts.items():
+        state.truncate_attempts(name, count)
+
+
+def apply_delta_to_compact(state: CompactState, delta: StateDelta) -> None:
+    """StateDelta.apply_to for a CompactState (positional, idempotent)."""
+    splice_messages(
+        state,
+        delta.message_offset,
+        [MessageRecord(m.role, m.content) for m in delta.messages],
+        delta.archived_messages,
+    )
+    for name, change in delta.fields.items():
+        state.field_slot(name)
+        state.truncate_attempts(name, change.offset)
+        for a in change.attempts:
+            state.add_attempt(name, attempt_record(a))
+    state.phase = delta.phase
+    state.current_field = delta.current_field
+    state.escalation = delta.escalation
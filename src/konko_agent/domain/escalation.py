@@ -2,10 +2,88 @@
 
 from __future__ import annotations
 
+import unicodedata
+from collections import deque
+from collections.abc import Iterable
+
 from konko_agent.config.models import AgentConfig, EscalationPolicy
 from konko_agent.domain.state import ConversationState, EscalationState, FieldState
 
 
+def normalize_text(text: str) -> str:
+    """NFKC-normalize, casefold, and collapse whitespace runs to single spaces."""
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+class TriggerMatcher:
+    """
+    Aho-Corasick automaton over normalized trigger phrases.
+    Build once per policy; search is linear in message length regardless of phrase count.
+    """
+
+    def __init__(self, phrases: Iterable[str]) -> None:
+        self.phrases: list[str] = []
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[int] = [-1]  # index into phrases of a match ending here, or -1
+        for phrase in phrases:
+            norm = normalize_text(phrase)
+            if norm:
+                self._add(norm)
+        self._link()
+
+    def _add(self, phrase: str) -> None:
+        node = 0
+        for ch in phrase:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(-1)
+            node = nxt
+        if self._out[node] < 0:
+            self._out[node] = len(self.phrases)
+        self.phrases.append(phrase)
+
+    def _link(self) -> None:
+        """Breadth-first pass computing failure links and inherited outputs."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[child] = self._goto[f].get(ch, 0)
+                if self._out[child] < 0:
+                    self._out[child] = self._out[self._fail[child]]
+
+    def __bool__(self) -> bool:
+        return bool(self.phrases)
+
+    def search(self, text: str) -> str | None:
+        """Return the first configured phrase found in text (after normalization), or None."""
+        if not self.phrases:
+            return None
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for ch in normalize_text(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node] >= 0:
+                return self.phrases[out[node]]
+        return None
+
+
+def compile_trigger_matcher(policy: EscalationPolicy) -> TriggerMatcher:
+    """Compile the policy's trigger phrases into a TriggerMatcher."""
+    return TriggerMatcher(policy.trigger_phrases)
+
+
 def _collected_fields_dict(fields: dict[str, FieldState]) -> dict[str, str]:
     """Build field_name -> current_value for all collected fields."""
     return {
@@ -15,40 +93,54 @@ def _collected_fields_dict(fields: dict[str, FieldState]) -> dict[str, str]:
     }
 
 
+def _all_required_collected(state: ConversationState, config: AgentConfig) -> bool:
+    """
+    True if config has fields and every required one is collected. O(1) for a
+    CompactState whose derived index was bound to ``config.fields``.
+    """
+    if not config.fields:
+        return False
+    index_for = getattr(state, "index_for", None)
+    derived = index_for(config.fields) if index_for is not None else None
+    if derived is not None:
+        return derived.missing_required == 0
+    return all(
+        state.fields.get(f.name) and state.fields[f.name].is_collected
+        for f in config.fields
+        if f.required
+    )
+
+
 def evaluate_escalation(
     state: ConversationState,
     config: AgentConfig,
     user_message_lower: str,
+    trigger_matcher: TriggerMatcher | None = None,
 ) -> EscalationState | None:
     """
     If escalation conditions are met, return EscalationState (reason + fields + optional history).
     Otherwise return None. Pure function, no I/O.
+    Pass a precompiled trigger_matcher to avoid rebuilding it from the policy on every call.
     """
     policy: EscalationPolicy = config.escalation
     if not policy.enabled:
         return None
-    collected = _collected_fields_dict(state.fields)
-    all_required = len(config.fields) > 0 and all(
-        state.fields.get(f.name) and state.fields[f.name].is_collected
-        for f in config.fields
-        if f.required
-    )
 
     # Trigger phrases (e.g. "speak to human")
     if policy.trigger_phrases and user_message_lower:
-        for phrase in policy.trigger_phrases:
-            if phrase.lower() in user_message_lower:
-                return EscalationState(
-                    reason="user_request",
-                    fields=collected,
-                    history_summary=None,
-                )
-
-    if policy.after_all_fields and all_required:
+        matcher = trigger_matcher if trigger_matcher is not None else compile_trigger_matcher(policy)
+        if matcher.search(user_message_lower) is not None:
+            return EscalationState(
+                reason="user_request",
+                fields=_collected_fields_dict(state.fields),
+                history_summary=None,
+            )
+
+    if policy.after_all_fields and _all_required_collected(state, config):
         reason = policy.reason or "all_fields_collected"
         return EscalationState(
             reason=reason,
-            fields=collected,
+            fields=_collected_fields_dict(state.fields),
             history_summary=_brief_history_summary(state),
         )
 
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from enum import Enum
-from typing import Literal
+from functools import cache
+from typing import Any, NamedTuple
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class Intent(str, Enum):
@@ -17,6 +19,14 @@ class Intent(str, Enum):
     OFF_TOPIC = "off_topic"
 
 
+class FieldExtraction(BaseModel):
+    """One field value found in the user's message."""
+
+    field_name: str
+    value: str
+    confidence: float = Field(default=1.0, ge=0.0, le=1.0)
+
+
 class TurnAnalysis(BaseModel):
     """Structured output from LLM for one turn."""
 
@@ -25,3 +35,180 @@ class TurnAnalysis(BaseModel):
     extracted_value: str | None = Field(default=None, description="For field_response/correction")
     confidence: float = Field(default=1.0, ge=0.0, le=1.0)
     field_name: str | None = Field(default=None, description="Which field this value is for")
+    extractions: list[FieldExtraction] = Field(
+        default_factory=list,
+        description="Every field value given in this message, when there is more than one",
+    )
+
+
+# Validates straight from the JSON text (parsed in pydantic-core, no intermediate dict).
+TURN_ANALYSIS_ADAPTER: TypeAdapter[TurnAnalysis] = TypeAdapter(TurnAnalysis)
+
+# Keywords strict structured-output endpoints reject, or that only document the schema.
+_UNSUPPORTED_KEYWORDS = frozenset({"default", "title", "minimum", "maximum"})
+
+
+def _strict(node: object) -> object:
+    """Strict-mode JSON schema: every property required, no extra properties."""
+    if isinstance(node, list):
+        return [_strict(n) for n in node]
+    if not isinstance(node, dict):
+        return node
+    out = {k: _strict(v) for k, v in node.items() if k not in _UNSUPPORTED_KEYWORDS}
+    if "properties" in out:
+        out["required"] = list(out["properties"])
+        out["additionalProperties"] = False
+    return out
+
+
+@cache
+def turn_response_format() -> dict[str, Any]:
+    """
+    OpenAI-compatible ``response_format`` that constrains replies to the TurnAnalysis
+    JSON schema (strict mode: optional fields become required but nullable/empty).
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "turn_analysis",
+            "strict": True,
+            "schema": _strict(TurnAnalysis.model_json_schema()),
+        },
+    }
+
+
+@dataclass
+class ParseStats:
+    """How LLM replies were turned into TurnAnalysis."""
+
+    parsed: int = 0  # valid as received
+    repaired: int = 0  # valid after repair_json (fences, prose, truncation)
+    failed: int = 0  # unusable: answered with a generic off_topic reply
+
+
+def _strip_code_fence(raw: str) -> str:
+    """Remove a surrounding markdown code block if present."""
+    raw = raw.strip()
+    if raw.startswith("```"):
+        lines = raw.split("\n")
+        if lines[0].startswith("```"):
+            lines = lines[1:]
+        if lines and lines[-1].strip() == "```":
+            lines = lines[:-1]
+        raw = "\n".join(lines)
+    return raw
+
+
+_CLOSERS = {"{": "}", "[": "]"}
+TRUNCATED_CONFIDENCE = 0.5  # upper bound on the confidence of a reply that was cut off
+
+
+class Repair(NamedTuple):
+    """repair_json result: candidate texts, most faithful first."""
+
+    candidates: list[str]
+    truncated: bool  # the reply was cut off and had to be closed
+
+
+def repair_json(raw: str) -> Repair:
+    """
+    Candidate repairs of a reply that should hold one JSON object: the first
+    balanced ``{...}`` (dropping fences or prose around it) or, if the text is cut
+    off, the object closed where it stopped (only if that was between values),
+    closed at the last complete member, and closed at the last complete top-level
+    member. Partial strings and numbers are never kept. Scans the text once; no
+    candidates if there is no ``{``.
+    """
+    start = raw.find("{")
+    if start < 0:
+        return Repair([], False)
+    stack: list[str] = []
+    in_string = escaped = False
+    last_comma: tuple[int, str] | None = None  # position and closers at the last member boundary
+    top_comma: int | None = None  # position of the last top-level member boundary
+    for i in range(start, len(raw)):
+        c = raw[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif c == "\\":
+                escaped = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c in _CLOSERS:
+            stack.append(_CLOSERS[c])
+        elif c in "}]":
+            if not stack or stack.pop() != c:
+                return Repair([], False)
+            if not stack:
+                return Repair([raw[start : i + 1]], False)
+        elif c == ",":
+            last_comma = (i, "".join(reversed(stack)))
+            if len(stack) == 1:
+                top_comma = i
+
+    # Truncated. A string cut off mid-way is never closed: its partial text would be
+    # taken as data (a half name) or shown to the user. Nor is a bare scalar that may
+    # have been cut (``0.9`` from ``0.95``, ``tru``). Only whole members are kept.
+    candidates: list[str] = []
+    text = raw[start:].rstrip()
+    if not in_string and text[-1] in ',:{["]}':
+        if text.endswith(","):
+            text = text[:-1]
+        elif text.endswith(":"):
+            text += " null"
+        candidates.append(text + "".join(reversed(stack)))
+    if last_comma is not None:
+        pos, closers = last_comma
+        candidates.append(raw[start:pos] + closers)
+    if top_comma is not None and last_comma is not None and top_comma != last_comma[0]:
+        candidates.append(raw[start:top_comma] + "}")
+    return Repair(candidates, True)
+
+
+def try_parse_turn_analysis(raw: str) -> TurnAnalysis | None:
+    """Parse an LLM reply into TurnAnalysis, or return None if it is not valid."""
+    try:
+        return TURN_ANALYSIS_ADAPTER.validate_json(raw)
+    except ValueError:
+        pass
+    try:
+        return TURN_ANALYSIS_ADAPTER.validate_json(_strip_code_fence(raw))
+    except ValueError:
+        return None
+
+
+def parse_turn_analysis(raw: str, stats: ParseStats | None = None) -> TurnAnalysis:
+    """
+    Parse LLM response into TurnAnalysis. A reply that is not valid as received is
+    repaired locally (see repair_json); a truncated one gets at most
+    TRUNCATED_CONFIDENCE. If nothing usable remains, return off_topic:
+    with the reply itself if it was prose, or a request to rephrase if it was broken JSON.
+    """
+    stats = stats if stats is not None else ParseStats()
+    analysis = try_parse_turn_analysis(raw)
+    if analysis is not None:
+        stats.parsed += 1
+        return analysis
+    repair = repair_json(raw)
+    for candidate in repair.candidates:
+        try:
+            analysis = TURN_ANALYSIS_ADAPTER.validate_json(candidate)
+        except ValueError:
+            continue
+        stats.repaired += 1
+        if repair.truncated:
+            # What was cut off may have been the confidence itself (it defaults to 1.0).
+            analysis.confidence = min(analysis.confidence, TRUNCATED_CONFIDENCE)
+        return analysis
+    stats.failed += 1
+    text = _strip_code_fence(raw)
+    if "{" in text:
+        text = ""  # never show the user half a JSON object
+    return TurnAnalysis(
+        intent=Intent.OFF_TOPIC,
+        response_text=text or "I didn't understand. Could you rephrase?",
+        confidence=0.0,
+    )
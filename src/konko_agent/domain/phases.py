@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from enum import Enum
 
 from konko_agent.domain.state import ConversationState
@@ -19,7 +20,7 @@ class ConversationPhase(str, Enum):
 def next_phase(
     phase: ConversationPhase,
     state: ConversationState,
-    required_field_names: list[str],
+    required_field_names: Sequence[str],
 ) -> ConversationPhase:
     """
     Pure transition: given current phase, state, and list of required field names,
@@ -44,10 +45,16 @@ def next_phase(
     return phase
 
 
-def _all_required_fields_collected(state: ConversationState, required_field_names: list[str]) -> bool:
-    """True if every required field has at least one valid attempt."""
+def _all_required_fields_collected(state: ConversationState, required_field_names: Sequence[str]) -> bool:
+    """
+    True if every required field has at least one valid attempt. O(1) for a
+    CompactState whose derived index was built from this same name sequence.
+    """
     if not required_field_names:
         return True
+    derived = getattr(state, "derived", None)
+    if derived is not None and derived.required_names is required_field_names:
+        return derived.missing_required == 0
     return all(
         state.fields.get(name) and state.fields[name].is_collected
         for name in required_field_names
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime
 
 from pydantic import BaseModel, Field
@@ -67,3 +68,116 @@ class ConversationState(BaseModel):
     fields: dict[str, FieldState] = Field(default_factory=dict)
     current_field: str | None = None
     escalation: EscalationState | None = None
+    archived_messages: int = Field(
+        default=0,
+        ge=0,
+        description="Older messages moved to the message archive; messages[0] is message number archived_messages",
+    )
+
+
+# --- Per-turn deltas (incremental persistence) ---
+
+
+class AttemptsDelta(BaseModel):
+    """Attempts of one field from position ``offset`` on."""
+
+    offset: int = 0
+    attempts: list[FieldAttempt] = Field(default_factory=list)
+
+
+class StateDelta(BaseModel):
+    """
+    Changes to one session's state since a StateMark, for incremental stores.
+
+    List changes are positional (``messages[offset:] = messages``), so applying
+    a delta is idempotent: applying it to a state that already contains the
+    changes is a no-op, and replaying a delta after a crash is safe. Message
+    positions count archived messages too; ``archived_messages`` moves the
+    state's archive boundary forward (never back).
+    """
+
+    message_offset: int = 0
+    messages: list[Message] = Field(default_factory=list)
+    fields: dict[str, AttemptsDelta] = Field(default_factory=dict)
+    phase: str
+    current_field: str | None = None
+    escalation: EscalationState | None = None
+    archived_messages: int = 0
+
+    def apply_to(self, state: ConversationState) -> None:
+        """Apply this delta to state in place."""
+        splice_messages(state, self.message_offset, self.messages, self.archived_messages)
+        for name, change in self.fields.items():
+            fs = state.fields.get(name)
+            if fs is None:
+                fs = state.fields[name] = FieldState(field_name=name)
+            del fs.attempts[change.offset :]
+            fs.attempts.extend(change.attempts)
+        state.phase = self.phase
+        state.current_field = self.current_field
+        state.escalation = self.escalation
+
+
+def splice_messages(state: ConversationState, offset: int, messages: list, archived: int) -> None:
+    """
+    ``messages[offset:] = messages`` in absolute message positions, then drop the
+    messages before ``archived`` from the hot list. Positions that are already
+    archived are skipped. Works on ConversationState and CompactState.
+    """
+    start = offset - state.archived_messages
+    if start < 0:
+        messages, start = messages[-start:], 0
+    del state.messages[start:]
+    state.messages.extend(messages)
+    if archived > state.archived_messages:
+        del state.messages[: archived - state.archived_messages]
+        state.archived_messages = archived
+
+
+@dataclass(frozen=True)
+class StateMark:
+    """Sizes of a state's append-only lists at a point in time (messages counted from the first ever)."""
+
+    messages: int
+    attempts: dict[str, int]
+
+
+def mark_state(state: ConversationState) -> StateMark:
+    """
+    Remember list sizes so delta_since can later pick out what was appended.
+    Only reads .messages and .fields[*].attempts, so it also accepts a CompactState.
+    """
+    return StateMark(
+        messages=state.archived_messages + len(state.messages),
+        attempts={name: len(fs.attempts) for name, fs in state.fields.items()},
+    )
+
+
+def rollback_to_mark(state: ConversationState, mark: StateMark) -> None:
+    """Drop messages and attempts appended since mark (e.g. when a turn is abandoned)."""
+    del state.messages[max(mark.messages - state.archived_messages, 0) :]
+    for name, count in mark.attempts.items():
+        fs = state.fields.get(name)
+        if fs is not None:
+            del fs.attempts[count:]
+
+
+def delta_since(state: ConversationState, mark: StateMark) -> StateDelta:
+    """Everything appended or changed in state since mark (header fields always included)."""
+    fields: dict[str, AttemptsDelta] = {}
+    for name, fs in state.fields.items():
+        start = mark.attempts.get(name)
+        if start is None:
+            fields[name] = AttemptsDelta(offset=0, attempts=list(fs.attempts))
+        elif len(fs.attempts) > start:
+            fields[name] = AttemptsDelta(offset=start, attempts=fs.attempts[start:])
+    base = state.archived_messages
+    return StateDelta(
+        message_offset=max(mark.messages, base),
+        messages=state.messages[max(mark.messages - base, 0) :],
+        fields=fields,
+        phase=state.phase,
+        current_field=state.current_field,
+        escalation=state.escalation,
+        archived_messages=base,
+    )
@@ -0,0 +1,321 @@
+"""Compact, versioned binary codec for conversation state (ConversationState or CompactState)."""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+
+from konko_agent.domain.compact_state import (
+    AttemptRecord,
+    CompactState,
+    FieldSlot,
+    MessageRecord,
+)
+from konko_agent.domain.state import ConversationState, EscalationState, Message
+
+# Layout (little-endian), version 2. Repeated values are stored column-wise, so
+# each column is packed and unpacked with one call instead of one per item:
+#   header    "KS" <version u8> <flags u8>
+#   strs      <n u32><bytes u32><lengths u32*n><utf-8 of the n strings concatenated>
+#             lengths count code points; 0xFFFFFFFF marks a None
+#   enum col  <codes u8*n> strs  (code 0xFF takes the next string of strs)
+#   state     phase:enum col(1) strs(session_id, current_field) escalation
+#             <archived messages u32> fields messages
+#             (version 1 has no archived count: it is 0)
+#   escalation  <present u8> [strs(reason, history_summary, k1, v1, k2, v2, ...)]
+#   fields    strs(names) <attempt counts u32*n> <n attempts u32>
+#             <ts_us i64*n> <confidence f64*n> status:enum col source:enum col values:strs
+#   messages  <n u32> roles:enum col contents:strs; with FLAG_ZLIB the whole block is
+#             <raw len u32><compressed len u32><zlib bytes>
+MAGIC = b"KS"
+MESSAGES_MAGIC = b"KM"  # encode_messages: header, then a zlib-compressed messages block
+CODEC_VERSION = 2
+FLAG_ZLIB = 0x01
+COMPRESS_MIN_BYTES = 1024  # auto-compress the messages block from this size on
+
+# Interned values. Append-only: codes are part of the on-disk format.
+PHASES = ("greeting", "collecting", "escalated", "completed")
+ROLES = ("user", "assistant", "system")
+STATUSES = ("valid", "invalid", "pending")
+SOURCES = ("user_provided", "corrected")
+_OTHER = 0xFF
+_NONE = 0xFFFFFFFF
+
+_HEAD = struct.Struct("<2sBB")
+_U32 = struct.Struct("<I")
+_STRS = struct.Struct("<II")
+_ZBLOCK = struct.Struct("<II")
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_US = timedelta(microseconds=1)
+
+
+class CodecError(ValueError):
+    """Not a state payload, an unsupported version, or truncated data."""
+
+
+def _index(table: tuple[str, ...]) -> dict[str, int]:
+    return {v: i for i, v in enumerate(table)}
+
+
+_PHASE_CODES, _ROLE_CODES = _index(PHASES), _index(ROLES)
+_STATUS_CODES, _SOURCE_CODES = _index(STATUSES), _index(SOURCES)
+
+
+# --- encode ---
+
+
+def _pack_strs(values: list[str | None]) -> bytes:
+    n = len(values)
+    if None in values:
+        lengths = [_NONE if v is None else len(v) for v in values]
+        values = [v for v in values if v is not None]
+    else:
+        lengths = list(map(len, values))
+    blob = "".join(values).encode("utf-8", "surrogatepass")
+    return struct.pack(f"<II{n}I", n, len(blob), *lengths) + blob
+
+
+def _pack_enum(codes: dict[str, int], values: list[str]) -> bytes:
+    col = [codes.get(v, _OTHER) for v in values]
+    return bytes(col) + _pack_strs([v for v, c in zip(values, col) if c == _OTHER])
+
+
+def _timestamp_us(ts: datetime | float) -> int:
+    """Microseconds since the epoch: exact for datetimes (naive = UTC), rounded for POSIX floats."""
+    if isinstance(ts, datetime):
+        return (ts - (_EPOCH if ts.tzinfo is None else _EPOCH_UTC)) // _US
+    return round(ts * 1_000_000)
+
+
+def _messages_block(messages: Sequence[Message | MessageRecord]) -> bytes:
+    return b"".join(
+        (
+            _U32.pack(len(messages)),
+            _pack_enum(_ROLE_CODES, [m.role for m in messages]),
+            _pack_strs([m.content for m in messages]),
+        )
+    )
+
+
+def encode_state(state: ConversationState | CompactState, compress: bool | None = None) -> bytes:
+    """
+    Serialize a ConversationState or CompactState. ``compress`` zlib-compresses the
+    message bodies; None compresses them once they reach COMPRESS_MIN_BYTES.
+    """
+    out = [_pack_enum(_PHASE_CODES, [state.phase]), _pack_strs([state.session_id, state.current_field])]
+    esc = state.escalation
+    if esc is None:
+        out.append(b"\x00")
+    else:
+        flat: list[str | None] = [esc.reason, esc.history_summary]
+        for kv in esc.fields.items():
+            flat += kv
+        out += (b"\x01", _pack_strs(flat))
+    out.append(_U32.pack(state.archived_messages))
+
+    slots = state.fields
+    attempts = [a for fs in slots.values() for a in fs.attempts]
+    n = len(attempts)
+    out += (
+        _pack_strs(list(slots)),
+        struct.pack(f"<{len(slots)}I", *[len(fs.attempts) for fs in slots.values()]),
+        _U32.pack(n),
+        struct.pack(f"<{n}q{n}d", *[_timestamp_us(a.timestamp) for a in attempts], *[a.confidence for a in attempts]),
+        _pack_enum(_STATUS_CODES, [a.validation_status for a in attempts]),
+        _pack_enum(_SOURCE_CODES, [a.source for a in attempts]),
+        _pack_strs([a.value for a in attempts]),
+    )
+
+    block = _messages_block(state.messages)
+    if compress is None:
+        compress = len(block) >= COMPRESS_MIN_BYTES
+    flags = 0
+    if compress:
+        flags |= FLAG_ZLIB
+        packed = zlib.compress(block, 1)
+        block = _ZBLOCK.pack(len(block), len(packed)) + packed
+    return _HEAD.pack(MAGIC, CODEC_VERSION, flags) + b"".join(out) + block
+
+
+# --- decode ---
+
+
+def _unpack_strs(buf: memoryview, pos: int) -> tuple[list[str | None], int]:
+    """Read a strs column at ``pos``; returns (strings, end position)."""
+    n, size = _STRS.unpack_from(buf, pos)
+    lengths = struct.unpack_from(f"<{n}I", buf, pos + 8)
+    pos += 8 + 4 * n
+    end = pos + size
+    if end > len(buf):
+        raise CodecError("truncated state payload")
+    text = str(buf[pos:end], "utf-8", "surrogatepass")
+    present = [k for k in lengths if k != _NONE] if _NONE in lengths else lengths
+    ends = list(accumulate(present))
+    if ends and ends[-1] != len(text):
+        raise CodecError("corrupt state payload: string lengths do not match")
+    values: list[str | None] = [text[a:b] for a, b in zip([0, *ends], ends)]
+    if present is not lengths:
+        it = iter(values)
+        values = [None if k == _NONE else next(it) for k in lengths]
+    return values, end
+
+
+def _unpack_enum(buf: memoryview, pos: int, n: int, table: tuple[str, ...]) -> tuple[list[str], int]:
+    codes = buf[pos : pos + n].tobytes()
+    if len(codes) < n:
+        raise CodecError("truncated state payload")
+    others, pos = _unpack_strs(buf, pos + n)
+    if not others:
+        return [table[c] for c in codes], pos
+    it = iter(others)
+    return [next(it) if c == _OTHER else table[c] for c in codes], pos
+
+
+def _read_messages_block(buf: memoryview, pos: int) -> tuple[list[str], list[str]]:
+    (n,) = _U32.unpack_from(buf, pos)
+    roles, pos = _unpack_enum(buf, pos + 4, n, ROLES)
+    contents, pos = _unpack_strs(buf, pos)
+    if len(contents) != n:
+        raise CodecError("corrupt state payload: message columns differ in length")
+    return roles, contents
+
+
+def _decode_v2(
+    buf: memoryview, pos: int, flags: int, model: bool, *, has_archived: bool = True
+) -> ConversationState | CompactState:
+    (phase,), pos = _unpack_enum(buf, pos, 1, PHASES)
+    (session_id, current_field), pos = _unpack_strs(buf, pos)
+    escalation = None
+    if buf[pos]:
+        (reason, history_summary, *flat), pos = _unpack_strs(buf, pos + 1)
+        escalation = EscalationState(
+            reason=reason, fields=dict(zip(flat[::2], flat[1::2])), history_summary=history_summary
+        )
+    else:
+        pos += 1
+    archived = 0
+    if has_archived:
+        (archived,) = _U32.unpack_from(buf, pos)
+        pos += 4
+
+    names, pos = _unpack_strs(buf, pos)
+    counts = struct.unpack_from(f"<{len(names)}I", buf, pos)
+    (n,) = _U32.unpack_from(buf, pos + 4 * len(names))
+    pos += 4 * len(names) + 4
+    numbers = struct.unpack_from(f"<{n}q{n}d", buf, pos)
+    pos += 16 * n
+    statuses, pos = _unpack_enum(buf, pos, n, STATUSES)
+    sources, pos = _unpack_enum(buf, pos, n, SOURCES)
+    values, pos = _unpack_strs(buf, pos)
+    columns = zip(values, numbers[:n], numbers[n:], statuses, sources)
+    if model:
+        attempts: list = [
+            {"value": v, "timestamp": _EPOCH + ts * _US, "confidence": c, "validation_status": st, "source": so}
+            for v, ts, c, st, so in columns
+        ]
+    else:
+        attempts = [AttemptRecord(v, ts / 1_000_000, c, st, so) for v, ts, c, st, so in columns]
+    fields: dict = {}
+    start = 0
+    for name, count in zip(names, counts):
+        chunk = attempts[start : start + count]
+        start += count
+        fields[name] = {"field_name": name, "attempts": chunk} if model else FieldSlot(name, chunk)
+
+    if flags & FLAG_ZLIB:
+        raw_len, packed_len = _ZBLOCK.unpack_from(buf, pos)
+        start = pos + _ZBLOCK.size
+        buf, pos = memoryview(zlib.decompress(buf[start : start + packed_len], bufsize=raw_len)), 0
+    roles, contents = _read_messages_block(buf, pos)
+
+    if model:
+        # One validation call builds every nested model (faster than constructing them one by one).
+        return ConversationState.model_validate(
+            {
+                "session_id": session_id,
+                "phase": phase,
+                "messages": [{"role": r, "content": c} for r, c in zip(roles, contents)],
+                "fields": fields,
+                "current_field": current_field,
+                "escalation": escalation,
+                "archived_messages": archived,
+            }
+        )
+    return CompactState(
+        session_id=session_id,
+        phase=phase,
+        messages=[MessageRecord(r, c) for r, c in zip(roles, contents)],
+        fields=fields,
+        current_field=current_field,
+        escalation=escalation,
+        archived_messages=archived,
+    )
+
+
+def _decode_v1(buf: memoryview, pos: int, flags: int, model: bool) -> ConversationState | CompactState:
+    return _decode_v2(buf, pos, flags, model, has_archived=False)
+
+
+# Decoders for every version ever written. Each reads its own layout into the
+# current objects, so old payloads are migrated on read. Add one per version bump.
+_DECODERS = {1: _decode_v1, 2: _decode_v2}
+
+
+def _header(buf: memoryview, magic: bytes) -> tuple[int, int]:
+    """(version, flags) of a payload starting with ``magic``."""
+    try:
+        found, version, flags = _HEAD.unpack_from(buf, 0)
+    except struct.error as e:
+        raise CodecError("truncated state payload") from e
+    if found != magic:
+        raise CodecError("not a state payload")
+    if version not in _DECODERS:
+        raise CodecError(f"unsupported state codec version {version}")
+    if flags & ~FLAG_ZLIB:
+        raise CodecError(f"unknown state codec flags {flags:#x}")
+    return version, flags
+
+
+def _decode(data: bytes | bytearray | memoryview, model: bool) -> ConversationState | CompactState:
+    buf = memoryview(data).cast("B")
+    version, flags = _header(buf, MAGIC)
+    try:
+        return _DECODERS[version](buf, _HEAD.size, flags, model)
+    except CodecError:
+        raise
+    except (struct.error, IndexError, ValueError, zlib.error) as e:
+        raise CodecError(f"corrupt state payload: {e}") from e
+
+
+def decode_compact(data: bytes | bytearray | memoryview) -> CompactState:
+    """Decode a payload into a CompactState (no pydantic objects are built)."""
+    return _decode(data, model=False)
+
+
+def decode_state(data: bytes | bytearray | memoryview) -> ConversationState:
+    """Decode a payload into a ConversationState."""
+    return _decode(data, model=True)
+
+
+def encode_messages(messages: Sequence[Message | MessageRecord]) -> bytes:
+    """A compressed block of messages (the same columns as in a state payload), e.g. for archives."""
+    return _HEAD.pack(MESSAGES_MAGIC, CODEC_VERSION, FLAG_ZLIB) + zlib.compress(_messages_block(messages))
+
+
+def decode_messages(data: bytes | bytearray | memoryview) -> list[MessageRecord]:
+    """Decode an encode_messages block."""
+    buf = memoryview(data).cast("B")
+    _header(buf, MESSAGES_MAGIC)
+    try:
+        roles, contents = _read_messages_block(memoryview(zlib.decompress(buf[_HEAD.size :])), 0)
+    except CodecError:
+        raise
+    except (struct.error, IndexError, ValueError, zlib.error) as e:
+        raise CodecError(f"corrupt message block: {e}") from e
+    return [MessageRecord(r, c) for r, c in zip(roles, contents)]
+
@@ -3,7 +3,18 @@
 from __future__ import annotations
 
 import re
-from typing import Literal
+import sys
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from typing import Literal, NamedTuple, Protocol
+
+# The regex safety check walks the stdlib parse tree. Its modules are private and
+# were renamed in 3.11 (the old names still import, with a DeprecationWarning).
+if sys.version_info >= (3, 11):
+    import re._constants as sre_constants
+    import re._parser as sre_parse
+else:  # pragma: no cover
+    import sre_constants
+    import sre_parse
 
 # Simple patterns; can be tightened per requirements
 EMAIL_RE = re.compile(r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$")
@@ -14,68 +25,397 @@ NAME_RE = re.compile(r"^[\w\s\-']{1,120}$", re.UNICODE)
 ADDRESS_RE = re.compile(r"^.+\d.*$")  # simplistic: has some digits (street number)
 
 
-def validate_email(value: str) -> tuple[bool, str]:
-    """Return (is_valid, error_message)."""
-    v = value.strip()
+_NON_DIGIT_RE = re.compile(r"\D")
+
+# Error codes shared by the single-value and batch validators ("" means valid).
+ERROR_MESSAGES: dict[str, dict[str, str]] = {
+    "email": {
+        "required": "Email is required.",
+        "invalid_format": "Please enter a valid email address.",
+    },
+    "phone": {
+        "required": "Phone number is required.",
+        "too_short": "Please enter a valid phone number (at least 10 digits).",
+        "invalid_format": "Please enter a valid phone number.",
+    },
+    "name": {
+        "required": "Name is required.",
+        "invalid_format": "Please enter a valid name.",
+    },
+    "address": {
+        "required": "Address is required.",
+        "too_short": "Please enter a complete address.",
+    },
+    "custom": {
+        "required": "This field is required.",
+        "too_long": "Value is too long.",
+        "invalid_format": "Invalid format.",
+        "regex_error": "Validation error.",
+    },
+}
+
+
+def error_message(field_type: str, code: str) -> str:
+    """User-facing message for an error code ("" for valid)."""
+    if not code:
+        return ""
+    if code == "unknown_type":
+        return f"Unknown field type: {field_type}"
+    return ERROR_MESSAGES[field_type][code]
+
+
+def _result(field_type: str, code: str) -> tuple[bool, str]:
+    return not code, error_message(field_type, code)
+
+
+# Checks on a stripped value, returning an error code.
+
+
+def _email_code(v: str) -> str:
     if not v:
-        return False, "Email is required."
+        return "required"
     if not EMAIL_RE.match(v):
-        return False, "Please enter a valid email address."
-    return True, ""
+        return "invalid_format"
+    return ""
 
 
-def validate_phone(value: str) -> tuple[bool, str]:
-    """Return (is_valid, error_message)."""
-    v = value.strip()
+def _phone_code(v: str) -> str:
     if not v:
-        return False, "Phone number is required."
-    digits = re.sub(r"\D", "", v)
-    if len(digits) < 10:
-        return False, "Please enter a valid phone number (at least 10 digits)."
+        return "required"
+    if len(_NON_DIGIT_RE.sub("", v)) < 10:
+        return "too_short"
     if not PHONE_RE.match(v):
-        return False, "Please enter a valid phone number."
-    return True, ""
+        return "invalid_format"
+    return ""
 
 
-def validate_name(value: str) -> tuple[bool, str]:
-    """Return (is_valid, error_message)."""
-    v = value.strip()
+def _name_code(v: str) -> str:
     if not v:
-        return False, "Name is required."
+        return "required"
     if not NAME_RE.match(v):
-        return False, "Please enter a valid name."
-    return True, ""
+        return "invalid_format"
+    return ""
 
 
-def validate_address(value: str) -> tuple[bool, str]:
-    """Return (is_valid, error_message)."""
-    v = value.strip()
+def _address_code(v: str) -> str:
     if not v:
-        return False, "Address is required."
+        return "required"
     if len(v) < 5:
-        return False, "Please enter a complete address."
-    return True, ""
+        return "too_short"
+    return ""
+
+
+def validate_email(value: str) -> tuple[bool, str]:
+    """Return (is_valid, error_message)."""
+    return _result("email", _email_code(value.strip()))
+
+
+def validate_phone(value: str) -> tuple[bool, str]:
+    """Return (is_valid, error_message)."""
+    return _result("phone", _phone_code(value.strip()))
+
+
+def validate_name(value: str) -> tuple[bool, str]:
+    """Return (is_valid, error_message)."""
+    return _result("name", _name_code(value.strip()))
+
+
+def validate_address(value: str) -> tuple[bool, str]:
+    """Return (is_valid, error_message)."""
+    return _result("address", _address_code(value.strip()))
+
+
+# Longest value a custom regex is ever run against; bounds the cost of any match.
+MAX_CUSTOM_VALUE_LENGTH = 256
+
+_REPEATS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT)
+
+
+def _min_width(items: list, state: object) -> int:
+    return sre_parse.SubPattern(state, list(items)).getwidth()[0]
+
+
+def _unbounded(op: object, av: object) -> bool:
+    return op in _REPEATS and av[1] == sre_constants.MAXREPEAT
+
+
+def _solo_repeat(items: list, state: object) -> bool:
+    """
+    True if ``items`` can match as nothing but one unbounded repeat, i.e. it holds
+    such a repeat (possibly inside groups/alternatives) and everything else may be
+    empty. An unbounded repeat around such a body can split its input exponentially.
+    """
+    for i, (op, av) in enumerate(items):
+        rest = items[:i] + items[i + 1 :]
+        if rest and _min_width(rest, state) > 0:
+            continue
+        if _unbounded(op, av):
+            return True
+        if op == sre_constants.SUBPATTERN and _solo_repeat(list(av[3]), state):
+            return True
+        if op == sre_constants.BRANCH and any(_solo_repeat(list(b), state) for b in av[1]):
+            return True
+    return False
+
+
+def _flatten(items: list) -> list:
+    """``items`` with plain groups spliced in (groups that set inline flags are kept whole)."""
+    flat = []
+    for op, av in items:
+        if op == sre_constants.SUBPATTERN and not av[1] and not av[2]:
+            flat.extend(_flatten(list(av[3])))
+        else:
+            flat.append((op, av))
+    return flat
+
+
+# Whole-category pairs that share no character, in both Unicode and ASCII mode.
+_DISJOINT_CATEGORIES = {
+    frozenset(pair)
+    for pair in [
+        (sre_constants.CATEGORY_DIGIT, sre_constants.CATEGORY_SPACE),
+        (sre_constants.CATEGORY_WORD, sre_constants.CATEGORY_SPACE),
+        (sre_constants.CATEGORY_DIGIT, sre_constants.CATEGORY_NOT_DIGIT),
+        (sre_constants.CATEGORY_DIGIT, sre_constants.CATEGORY_NOT_WORD),
+        (sre_constants.CATEGORY_WORD, sre_constants.CATEGORY_NOT_WORD),
+        (sre_constants.CATEGORY_SPACE, sre_constants.CATEGORY_NOT_SPACE),
+    ]
+}
+_CATEGORY_RE = {
+    sre_constants.CATEGORY_DIGIT: re.compile(r"\d"),
+    sre_constants.CATEGORY_NOT_DIGIT: re.compile(r"\D"),
+    sre_constants.CATEGORY_SPACE: re.compile(r"\s"),
+    sre_constants.CATEGORY_NOT_SPACE: re.compile(r"\S"),
+    sre_constants.CATEGORY_WORD: re.compile(r"\w"),
+    sre_constants.CATEGORY_NOT_WORD: re.compile(r"\W"),
+}
+_MAX_ENUMERATED_CHARS = 4096
+
 
+def _char_set(items: list) -> tuple[object, object] | None:
+    """The single-character matcher a repeat body consists of, or None."""
+    if len(items) == 1 and items[0][0] in (
+        sre_constants.LITERAL,
+        sre_constants.NOT_LITERAL,
+        sre_constants.ANY,
+        sre_constants.IN,
+    ):
+        return items[0]
+    return None
 
-def validate_custom(value: str, pattern: str | None) -> tuple[bool, str]:
-    """Validate with optional regex. If no pattern, accept non-empty."""
-    v = value.strip()
+
+def _finite_chars(op: object, av: object) -> set[int] | None:
+    """Code points of a literal or a non-negated class of literals/ranges, if few enough."""
+    if op == sre_constants.LITERAL:
+        return {av}
+    if op != sre_constants.IN:
+        return None
+    chars: set[int] = set()
+    for iop, iav in av:
+        if iop == sre_constants.LITERAL:
+            chars.add(iav)
+        elif iop == sre_constants.RANGE and iav[1] - iav[0] < _MAX_ENUMERATED_CHARS:
+            chars.update(range(iav[0], iav[1] + 1))
+        else:
+            return None
+    return chars if len(chars) <= _MAX_ENUMERATED_CHARS else None
+
+
+def _categories(op: object, av: object) -> set[object] | None:
+    if op != sre_constants.IN or any(iop != sre_constants.CATEGORY for iop, _ in av):
+        return None
+    return {iav for _, iav in av}
+
+
+def _char_matches(op: object, av: object, c: int, flags: int) -> bool:
+    if op == sre_constants.LITERAL:
+        return c == av
+    if op == sre_constants.NOT_LITERAL:
+        return c != av
+    if op == sre_constants.ANY:
+        return bool(flags & re.DOTALL) or c != ord("\n")
+    negate = hit = False
+    for iop, iav in av:
+        if iop == sre_constants.NEGATE:
+            negate = True
+        elif iop == sre_constants.LITERAL:
+            hit = hit or c == iav
+        elif iop == sre_constants.RANGE:
+            hit = hit or iav[0] <= c <= iav[1]
+        elif iop == sre_constants.CATEGORY and iav in _CATEGORY_RE:
+            pattern = _CATEGORY_RE[iav]
+            if flags & re.ASCII:
+                pattern = re.compile(pattern.pattern, re.ASCII)
+            hit = hit or pattern.match(chr(c)) is not None
+        else:
+            return True  # unknown member: assume it matches
+    return hit != negate
+
+
+def _case_variants(c: int) -> set[int]:
+    ch = chr(c)
+    return {c} | {ord(v) for v in (ch.lower(), ch.upper()) if len(v) == 1}
+
+
+def _sets_overlap(a: tuple[object, object] | None, b: tuple[object, object] | None, flags: int) -> bool:
+    """
+    Whether two single-character matchers can match the same character. Conservative:
+    anything but a single character, or two unbounded sets not known to be disjoint,
+    counts as overlapping.
+    """
+    if a is None or b is None:
+        return True
+    finite_a, finite_b = _finite_chars(*a), _finite_chars(*b)
+    if finite_a is None and finite_b is None:
+        cats_a, cats_b = _categories(*a), _categories(*b)
+        if cats_a is None or cats_b is None:
+            return True
+        return any(frozenset((x, y)) not in _DISJOINT_CATEGORIES for x in cats_a for y in cats_b)
+    if finite_a is None or (finite_b is not None and len(finite_b) < len(finite_a)):
+        finite_a, b = finite_b, a
+    for c in finite_a:
+        variants = _case_variants(c) if flags & re.IGNORECASE else (c,)
+        if any(_char_matches(*b, v, flags) for v in variants):
+            return True
+    return False
+
+
+def _adjacent_overlapping_repeats(items: list, state: object) -> bool:
+    """
+    True if ``items`` holds two unbounded repeats with nothing but optional items
+    between them (also counting from the end of one iteration into the start of the
+    next) whose bodies can match the same character: ``x+x+``, ``\\w+\\d+``,
+    ``x+yx+`` repeated. The input then splits between them in many ways per iteration.
+    """
+    flat = _flatten(items)
+    repeats = [i for i, (op, av) in enumerate(flat) if _unbounded(op, av)]
+    flags = state.flags
+
+    def _overlap(i: int, j: int) -> bool:
+        return _sets_overlap(_char_set(list(flat[i][1][2])), _char_set(list(flat[j][1][2])), flags)
+
+    def _empty(part: list) -> bool:
+        return not part or _min_width(part, state) == 0
+
+    for n, i in enumerate(repeats):
+        for j in repeats[n + 1 :]:
+            if not _empty(flat[i + 1 : j]):
+                break
+            if _overlap(i, j):
+                return True
+    # Across iterations: a repeat the body can end with, then one it can start with.
+    for i in repeats:
+        if not _empty(flat[i + 1 :]):
+            continue
+        for j in repeats:
+            if j != i and _empty(flat[:j]) and _overlap(i, j):
+                return True
+    return False
+
+
+def _overlapping_branches(branches: list) -> bool:
+    """
+    Conservative: alternatives count as overlapping unless each one starts with a
+    literal character and no two start with the same one (character classes,
+    repeats or empty alternatives could all match the same input).
+    """
+    seen_first: set[int] = set()
+    for b in branches:
+        items = list(b)
+        if not items or items[0][0] != sre_constants.LITERAL or items[0][1] in seen_first:
+            return True
+        seen_first.add(items[0][1])
+    return False
+
+
+def _superlinear_construct(items: list, state: object, in_repeat: bool = False) -> str | None:
+    for op, av in items:
+        if op in _REPEATS:
+            body = list(av[2])
+            if _unbounded(op, av) and _solo_repeat(body, state):
+                return "nested quantifier"
+            if _unbounded(op, av) and _adjacent_overlapping_repeats(body, state):
+                return "adjacent overlapping quantifiers inside a repeat"
+            found = _superlinear_construct(body, state, in_repeat or _unbounded(op, av))
+        elif op == sre_constants.SUBPATTERN:
+            found = _superlinear_construct(list(av[3]), state, in_repeat)
+        elif op == sre_constants.BRANCH:
+            if in_repeat and _overlapping_branches(av[1]):
+                return "possibly overlapping alternatives inside a repeat"
+            found = next(
+                (r for b in av[1] if (r := _superlinear_construct(list(b), state, in_repeat))), None
+            )
+        elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            found = _superlinear_construct(list(av[1]), state, in_repeat)
+        else:
+            # Possessive repeats and atomic groups never backtrack into their body.
+            found = None
+        if found:
+            return found
+    return None
+
+
+def check_regex_safety(pattern: str) -> str | None:
+    """
+    Static check for constructs that make backtracking super-linear in the input
+    (e.g. ``(a+)+``, ``(\\w+\\s?)*``, ``(x+x+)+``, ``(a|a)*``). Returns a short reason,
+    or None if none were found. Alternation inside an unbounded repeat is rejected
+    unless the alternatives start with distinct literals. Still a heuristic: a None
+    result does not prove the pattern linear.
+    Raises re.error if the pattern does not parse.
+    """
+    parsed = sre_parse.parse(pattern)
+    return _superlinear_construct(list(parsed), parsed.state)
+
+
+def compile_validation_regex(pattern: str) -> re.Pattern[str]:
+    """Compile a custom field regex, raising ValueError if invalid or super-linear."""
+    try:
+        compiled = re.compile(pattern)
+        reason = check_regex_safety(pattern)
+    except re.error as e:
+        raise ValueError(f"Invalid validation_regex {pattern!r}: {e}") from e
+    if reason:
+        raise ValueError(f"Unsafe validation_regex {pattern!r}: {reason} (catastrophic backtracking)")
+    return compiled
+
+
+def _custom_code(v: str, pattern: str | re.Pattern[str] | None, max_length: int) -> str:
     if not v:
-        return False, "This field is required."
+        return "required"
     if pattern:
+        if len(v) > max_length:
+            return "too_long"
         try:
             if not re.match(pattern, v):
-                return False, "Invalid format."
+                return "invalid_format"
         except re.error:
-            return False, "Validation error."
-    return True, ""
+            return "regex_error"
+    return ""
+
+
+def validate_custom(
+    value: str,
+    pattern: str | re.Pattern[str] | None,
+    max_length: int = MAX_CUSTOM_VALUE_LENGTH,
+) -> tuple[bool, str]:
+    """
+    Validate with optional regex (source or precompiled). If no pattern, accept non-empty.
+    Values longer than ``max_length`` are rejected without running the regex.
+    """
+    return _result("custom", _custom_code(value.strip(), pattern, max_length))
 
 
 FieldType = Literal["email", "phone", "name", "address", "custom"]
 
 
-def validate_field(value: str, field_type: FieldType, validation_regex: str | None = None) -> tuple[bool, str]:
-    """Dispatch to the right validator by field type."""
+def validate_field(
+    value: str,
+    field_type: FieldType,
+    validation_regex: str | re.Pattern[str] | None = None,
+    max_length: int = MAX_CUSTOM_VALUE_LENGTH,
+) -> tuple[bool, str]:
+    """Dispatch to the right validator by field type (``max_length`` applies to custom)."""
     if field_type == "email":
         return validate_email(value)
     if field_type == "phone":
@@ -85,5 +425,94 @@ def validate_field(value: str, field_type: FieldType, validation_regex: str | No
     if field_type == "address":
         return validate_address(value)
     if field_type == "custom":
-        return validate_custom(value, validation_regex)
+        return validate_custom(value, validation_regex, max_length)
     return False, f"Unknown field type: {field_type}"
+
+
+# --- Batch validation (offline imports) ---
+
+
+class BatchResult(NamedTuple):
+    """Per-value results of validate_batch, in input order."""
+
+    ok: list[bool]
+    codes: list[str]  # error code per value, "" where valid (see error_message)
+
+
+class BatchField(Protocol):
+    """What validate_columns needs from a field (FieldConfig satisfies it)."""
+
+    name: str
+    type: str
+    validation_regex: str | None
+
+
+def check_validation_regexes(fields: Iterable[BatchField]) -> None:
+    """compile_validation_regex for every custom field's pattern; ValueError on the first bad one."""
+    for f in fields:
+        if f.type == "custom" and f.validation_regex:
+            compile_validation_regex(f.validation_regex)
+
+
+def _code_checker(
+    field_type: str,
+    validation_regex: str | re.Pattern[str] | None,
+    max_length: int,
+) -> Callable[[str], str]:
+    """The per-type check, with the custom pattern compiled once for the whole batch."""
+    if field_type == "email":
+        return _email_code
+    if field_type == "phone":
+        return _phone_code
+    if field_type == "name":
+        return _name_code
+    if field_type == "address":
+        return _address_code
+    if field_type == "custom":
+        pattern = validation_regex
+        if isinstance(pattern, str) and pattern:
+            try:
+                pattern = re.compile(pattern)
+            except re.error:
+                pass  # _custom_code reports it as regex_error per value
+        return lambda v: _custom_code(v, pattern, max_length)
+    return lambda v: "unknown_type"
+
+
+def validate_batch(
+    values: Iterable[str],
+    field_type: FieldType,
+    validation_regex: str | re.Pattern[str] | None = None,
+    max_length: int = MAX_CUSTOM_VALUE_LENGTH,
+) -> BatchResult:
+    """
+    validate_field over a column of values. The pattern is compiled once and each
+    distinct raw value is checked once (imports repeat values a lot: empty cells,
+    placeholder emails), so the per-value cost is mostly a dict lookup.
+    """
+    check = _code_checker(field_type, validation_regex, max_length)
+    memo: dict[str, str] = {}
+    codes: list[str] = []
+    append = codes.append
+    for value in values:
+        code = memo.get(value)
+        if code is None:
+            code = memo[value] = check(value.strip())
+        append(code)
+    return BatchResult([not c for c in codes], codes)
+
+
+def validate_columns(
+    columns: Mapping[str, Sequence[str]],
+    fields: Iterable[BatchField],
+    max_length: int = MAX_CUSTOM_VALUE_LENGTH,
+) -> dict[str, BatchResult]:
+    """
+    validate_batch for each field over its column (``columns[field.name]``).
+    A field without a column is validated as all-empty values.
+    """
+    rows = max((len(c) for c in columns.values()), default=0)
+    return {
+        f.name: validate_batch(columns.get(f.name, [""] * rows), f.type, f.validation_regex, max_length)
+        for f in fields
+    }
@@ -0,0 +1,257 @@
+"""Memory-bounded in-memory StateStore: LRU + idle-TTL eviction with spill to a backing store."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from konko_agent.domain.compact_state import (
+    CompactState,
+    MessageRecord,
+    apply_delta_to_compact,
+    attempt_record,
+    compact_delta_since,
+    compact_from_model,
+    compact_to_model,
+)
+from konko_agent.domain.phases import ConversationPhase
+from konko_agent.domain.state import (
+    ConversationState,
+    EscalationState,
+    FieldAttempt,
+    Message,
+    StateDelta,
+    mark_state,
+)
+
+_FINISHED_PHASES = frozenset({ConversationPhase.COMPLETED.value, ConversationPhase.ESCALATED.value})
+
+
+def estimate_state_bytes(state: CompactState) -> int:
+    """Rough resident size of a compact state: string payloads plus a fixed per-record overhead."""
+    size = 256 + len(state.session_id)
+    for m in state.messages:
+        size += 120 + len(m.content)
+    for name, fs in state.fields.items():
+        size += 120 + len(name)
+        for a in fs.attempts:
+            size += 200 + len(a.value)
+    return size
+
+
+@dataclass
+class BoundedStoreStats:
+    """Resident gauges and eviction/spill counters."""
+
+    resident_sessions: int = 0
+    resident_bytes: int = 0
+    evictions: int = 0  # over max_sessions / max_bytes
+    idle_evictions: int = 0
+    finished_spills: int = 0
+    fault_ins: int = 0
+    spill_writes: int = 0
+
+
+@dataclass
+class _Resident:
+    state: CompactState
+    size: int
+    last_access: float
+    dirty: bool
+
+
+class BoundedInMemoryStateStore:
+    """
+    In-memory DeltaStateStore with a hard memory bound (sessions held as CompactState).
+
+    Sessions are kept in LRU order and evicted when the store holds more than
+    ``max_sessions`` sessions or ``max_bytes`` estimated bytes, or when untouched
+    for ``idle_ttl`` seconds. Sessions that reach COMPLETED or ESCALATED are
+    released as soon as their turn is persisted. Evicted sessions are written
+    to ``spill`` (any StateStore, e.g. SQLiteStateStore) and faulted back in
+    transparently by ``get``; sessions faulted in and not modified since are
+    dropped without another write.
+    """
+
+    def __init__(
+        self,
+        spill: object,  # StateStore protocol
+        *,
+        max_sessions: int = 10_000,
+        max_bytes: int | None = None,
+        idle_ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._spill = spill
+        self._max_sessions = max_sessions
+        self._max_bytes = max_bytes
+        self._idle_ttl = idle_ttl
+        self._clock = clock
+        self._resident: OrderedDict[str, _Resident] = OrderedDict()
+        # States whose spill write is still in flight; get() re-admits them from here.
+        self._spilling: dict[str, CompactState] = {}
+        self.stats = BoundedStoreStats()
+
+    def __len__(self) -> int:
+        return len(self._resident)
+
+    # --- residency ---
+
+    def _admit(self, session_id: str, state: CompactState, *, dirty: bool) -> _Resident:
+        old = self._resident.pop(session_id, None)
+        if old is not None:
+            self.stats.resident_bytes -= old.size
+            dirty = dirty or old.dirty
+        entry = _Resident(state, estimate_state_bytes(state), self._clock(), dirty)
+        self._resident[session_id] = entry
+        self.stats.resident_bytes += entry.size
+        self.stats.resident_sessions = len(self._resident)
+        return entry
+
+    def _touch(self, session_id: str, entry: _Resident) -> None:
+        entry.last_access = self._clock()
+        self._resident.move_to_end(session_id)
+
+    async def _release(self, session_id: str) -> None:
+        """Drop a session from memory, writing it to the spill store first if modified."""
+        entry = self._resident.pop(session_id)
+        self.stats.resident_bytes -= entry.size
+        self.stats.resident_sessions = len(self._resident)
+        if not entry.dirty:
+            return
+        self._spilling[session_id] = entry.state
+        try:
+            await self._spill.set(session_id, compact_to_model(entry.state))
+        except BaseException:
+            if session_id not in self._resident:
+                self._admit(session_id, entry.state, dirty=True)
+            raise
+        finally:
+            if self._spilling.get(session_id) is entry.state:
+                del self._spilling[session_id]
+        self.stats.spill_writes += 1
+
+    def _over_limit(self) -> bool:
+        if len(self._resident) <= 1:
+            return False  # never evict the session being served
+        if len(self._resident) > self._max_sessions:
+            return True
+        return self._max_bytes is not None and self.stats.resident_bytes > self._max_bytes
+
+    async def _evict(self) -> None:
+        if self._idle_ttl is not None:
+            deadline = self._clock() - self._idle_ttl
+            while self._resident:
+                session_id, entry = next(iter(self._resident.items()))
+                if entry.last_access > deadline:
+                    break
+                self.stats.idle_evictions += 1
+                await self._release(session_id)
+        while self._over_limit():
+            self.stats.evictions += 1
+            await self._release(next(iter(self._resident)))
+
+    async def _after_write(self, session_id: str, state: CompactState) -> None:
+        if state.phase in _FINISHED_PHASES and session_id in self._resident:
+            self.stats.finished_spills += 1
+            await self._release(session_id)
+        await self._evict()
+
+    async def _load(self, session_id: str) -> _Resident | None:
+        entry = self._resident.get(session_id)
+        if entry is not None:
+            self._touch(session_id, entry)
+            return entry
+        state = self._spilling.get(session_id)
+        if state is not None:
+            return self._admit(session_id, state, dirty=True)
+        loaded = await self._spill.get(session_id)
+        if loaded is None:
+            return None
+        entry = self._resident.get(session_id)
+        if entry is not None:  # admitted by a concurrent call meanwhile
+            self._touch(session_id, entry)
+            return entry
+        self.stats.fault_ins += 1
+        return self._admit(session_id, compact_from_model(loaded), dirty=False)
+
+    async def _require(self, session_id: str) -> CompactState:
+        entry = await self._load(session_id)
+        if entry is None:
+            raise KeyError(f"Unknown session: {session_id}")
+        return entry.state
+
+    # --- StateStore ---
+
+    async def get(self, session_id: str) -> ConversationState | None:
+        state = await self.get_compact(session_id)
+        return compact_to_model(state) if state is not None else None
+
+    async def get_compact(self, session_id: str) -> CompactState | None:
+        entry = await self._load(session_id)
+        await self._evict()
+        return entry.state if entry is not None else None
+
+    async def set(self, session_id: str, state: ConversationState) -> None:
+        compact = compact_from_model(state)
+        self._admit(session_id, compact, dirty=True)
+        await self._after_write(session_id, compact)
+
+    # --- DeltaStateStore ---
+
+    async def apply_delta(self, session_id: str, delta: StateDelta) -> None:
+        # The turn's object may have been evicted meanwhile; deltas are positional,
+        # so applying this one to the faulted-in copy yields the same state.
+        state = await self._require(session_id)
+        apply_delta_to_compact(state, delta)
+        self._admit(session_id, state, dirty=True)
+        await self._after_write(session_id, state)
+
+    async def append_message(self, session_id: str, message: Message) -> None:
+        state = await self._require(session_id)
+        mark = mark_state(state)
+        state.messages.append(MessageRecord(message.role, message.content))
+        await self.apply_delta(session_id, compact_delta_since(state, mark))
+
+    async def append_attempt(self, session_id: str, field_name: str, attempt: FieldAttempt) -> None:
+        state = await self._require(session_id)
+        mark = mark_state(state)
+        state.add_attempt(field_name, attempt_record(attempt))
+        await self.apply_delta(session_id, compact_delta_since(state, mark))
+
+    async def update_state(
+        self,
+        session_id: str,
+        *,
+        phase: str,
+        current_field: str | None,
+        escalation: EscalationState | None,
+    ) -> None:
+        state = await self._require(session_id)
+        mark = mark_state(state)
+        state.phase = phase
+        state.current_field = current_field
+        state.escalation = escalation
+        await self.apply_delta(session_id, compact_delta_since(state, mark))
+
+    async def flush(self) -> None:
+        """Write every modified resident session to the spill store (they stay resident)."""
+        for session_id, entry in list(self._resident.items()):
+            if entry.dirty:
+                await self._spill.set(session_id, compact_to_model(entry.state))
+                entry.dirty = False
+                self.stats.spill_writes += 1
+
+    def message_archive(self) -> object | None:
+        """The spill store's MessageArchive, since evicted sessions live on there (None if it has none)."""
+        make = getattr(self._spill, "message_archive", None)
+        return make() if make is not None else None
+
+    async def aclose(self) -> None:
+        """Flush resident sessions so a restart can fault them back in, then close the spill store."""
+        await self.flush()
+        aclose = getattr(self._spill, "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -0,0 +1,355 @@
+"""Append-only journal StateStore: segment log, group commit, snapshots and compaction."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import struct
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from konko_agent.domain.compact_state import (
+    CompactState,
+    MessageRecord,
+    apply_delta_to_compact,
+    attempt_record,
+    compact_delta_since,
+    compact_from_model,
+    compact_to_model,
+)
+from konko_agent.domain.state import (
+    ConversationState,
+    EscalationState,
+    FieldAttempt,
+    Message,
+    StateDelta,
+    mark_state,
+)
+from konko_agent.domain.state_codec import decode_compact, encode_state
+from konko_agent.infrastructure.message_archive import CompressedMessageArchive
+
+# Record: <payload length u32><crc32 u32> then payload = <kind u8><sid length u16><sid><body>.
+# Bodies are JSON, except binary snapshots (domain.state_codec), which are written
+# from now on; JSON snapshots from older journals are still read.
+_HEADER = struct.Struct("<II")
+_SID_LEN = struct.Struct("<H")
+_SNAPSHOT = 1
+_DELTA = 2
+_SNAPSHOT_BIN = 3
+_SNAPSHOTS = (_SNAPSHOT, _SNAPSHOT_BIN)
+_SUFFIX = ".journal"
+
+
+class JournalCorruptionError(RuntimeError):
+    """A sealed segment failed its checksum; only the newest segment may have a torn tail."""
+
+
+def _encode(kind: int, session_id: str, body: str | bytes) -> bytes:
+    sid = session_id.encode("utf-8")
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    payload = bytes((kind,)) + _SID_LEN.pack(len(sid)) + sid + body
+    return _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+@dataclass
+class JournalStoreStats:
+    """Write, compaction and recovery counters."""
+
+    commits: int = 0
+    records: int = 0
+    bytes_written: int = 0
+    fsyncs: int = 0
+    max_batch: int = 0
+    snapshots: int = 0
+    compactions: int = 0
+    recovered_records: int = 0
+    replayed_records: int = 0
+    truncated_bytes: int = 0
+    recovery_seconds: float = 0.0
+
+
+class JournalStateStore:
+    """
+    Durable DeltaStateStore on a directory of append-only segment files.
+
+    Every ``set`` appends a snapshot record and every ``apply_delta`` a delta
+    record (each length-prefixed and CRC-checked); live state is kept in memory
+    as CompactState, so ``get`` and ``get_compact`` never touch disk. Writes from concurrent turns are group-committed:
+    one write and one fsync per batch, and each call returns once its record is
+    durable. After ``snapshot_every`` deltas a session's next record is a full
+    snapshot, and once more than ``max_segments`` sealed segments exist the
+    oldest is compacted (its sessions are re-snapshotted into the active segment)
+    and deleted. On open, the log is replayed from each session's last snapshot;
+    a torn record at the end of the newest segment is truncated away.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        fsync: bool = True,
+        segment_bytes: int = 64 * 1024 * 1024,
+        snapshot_every: int = 32,
+        max_segments: int = 4,
+        max_batch: int = 1024,
+    ) -> None:
+        self._dir = Path(directory)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._fsync = fsync
+        self._segment_bytes = segment_bytes
+        self._snapshot_every = snapshot_every
+        self._max_segments = max_segments
+        self._max_batch = max_batch
+        self._index: dict[str, CompactState] = {}
+        self._since_snapshot: dict[str, int] = {}
+        # Oldest segment still holding a live record per session, and the reverse map.
+        self._first_live: dict[str, int] = {}
+        self._segment_sessions: dict[int, set[str]] = {}
+        self._pending: list[tuple[str, bytes, asyncio.Future[None]]] = []
+        self._flusher: asyncio.Task[None] | None = None
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="konko-journal")
+        self.stats = JournalStoreStats()
+
+        self._oldest, self._active = self._recover()
+        self._file: BinaryIO = open(self._segment_path(self._active), "ab")
+        self._active_size = self._file.tell()
+
+    def _segment_path(self, seq: int) -> Path:
+        return self._dir / f"{seq:010d}{_SUFFIX}"
+
+    # --- recovery ---
+
+    def _recover(self) -> tuple[int, int]:
+        """Rebuild the index from disk; return (oldest, active) segment numbers."""
+        start = time.perf_counter()
+        seqs = sorted(int(p.stem) for p in self._dir.glob(f"*{_SUFFIX}"))
+        entries: list[tuple[int, int, str, memoryview]] = []  # (segment, kind, sid, body)
+        for i, seq in enumerate(seqs):
+            path = self._segment_path(seq)
+            data = memoryview(path.read_bytes())
+            pos = 0
+            while pos + _HEADER.size <= len(data):
+                length, crc = _HEADER.unpack_from(data, pos)
+                begin, end = pos + _HEADER.size, pos + _HEADER.size + length
+                if end > len(data) or zlib.crc32(data[begin:end]) != crc:
+                    break
+                (sid_len,) = _SID_LEN.unpack_from(data, begin + 1)
+                sid_end = begin + 1 + _SID_LEN.size + sid_len
+                sid = bytes(data[begin + 1 + _SID_LEN.size : sid_end]).decode("utf-8")
+                entries.append((seq, data[begin], sid, data[sid_end:end]))
+                pos = end
+            if pos < len(data):
+                if i != len(seqs) - 1:
+                    raise JournalCorruptionError(f"{path}: bad record at byte {pos}")
+                # Torn write from a crash mid-append: drop the partial record.
+                self.stats.truncated_bytes += len(data) - pos
+                with open(path, "r+b") as f:
+                    f.truncate(pos)
+
+        last_snapshot: dict[str, int] = {}
+        for n, (_, kind, sid, _) in enumerate(entries):
+            if kind in _SNAPSHOTS:
+                last_snapshot[sid] = n
+        for n, (seq, kind, sid, body) in enumerate(entries):
+            if n < last_snapshot.get(sid, -1):
+                continue  # superseded by a later snapshot
+            if kind in _SNAPSHOTS:
+                if kind == _SNAPSHOT_BIN:
+                    self._index[sid] = decode_compact(body)
+                else:
+                    self._index[sid] = compact_from_model(ConversationState.model_validate_json(bytes(body)))
+                self._since_snapshot[sid] = 0
+                self._set_first_live(sid, seq)
+            elif sid in self._index:
+                apply_delta_to_compact(self._index[sid], StateDelta.model_validate_json(bytes(body)))
+                self._since_snapshot[sid] += 1
+            self.stats.replayed_records += 1
+
+        self.stats.recovered_records = len(entries)
+        self.stats.recovery_seconds = time.perf_counter() - start
+        if not seqs:
+            return 0, 0
+        return seqs[0], seqs[-1]
+
+    # --- bookkeeping ---
+
+    def _set_first_live(self, session_id: str, seq: int) -> None:
+        old = self._first_live.get(session_id)
+        if old == seq:
+            return
+        if old is not None:
+            self._segment_sessions[old].discard(session_id)
+        self._first_live[session_id] = seq
+        self._segment_sessions.setdefault(seq, set()).add(session_id)
+
+    def _require(self, session_id: str) -> CompactState:
+        state = self._index.get(session_id)
+        if state is None:
+            raise KeyError(f"Unknown session: {session_id}")
+        return state
+
+    # --- blocking helpers (run on the writer thread) ---
+
+    def _write(self, data: bytes, rotate_to: int | None) -> None:
+        if rotate_to is not None:
+            self._file.flush()
+            if self._fsync:
+                os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = open(self._segment_path(rotate_to), "ab")
+        self._file.write(data)
+        self._file.flush()
+        if self._fsync:
+            os.fsync(self._file.fileno())
+
+    def _close_file(self) -> None:
+        self._file.flush()
+        if self._fsync:
+            os.fsync(self._file.fileno())
+        self._file.close()
+
+    # --- StateStore ---
+
+    async def get(self, session_id: str) -> ConversationState | None:
+        state = self._index.get(session_id)
+        return compact_to_model(state) if state is not None else None
+
+    async def get_compact(self, session_id: str) -> CompactState | None:
+        return self._index.get(session_id)
+
+    async def set(self, session_id: str, state: ConversationState) -> None:
+        self._index[session_id] = compact_from_model(state)
+        self._since_snapshot[session_id] = 0
+        await self._submit(session_id, _encode(_SNAPSHOT_BIN, session_id, encode_state(state)))
+
+    # --- DeltaStateStore ---
+
+    async def apply_delta(self, session_id: str, delta: StateDelta) -> None:
+        state = self._require(session_id)
+        apply_delta_to_compact(state, delta)
+        count = self._since_snapshot.get(session_id, 0) + 1
+        if count >= self._snapshot_every:
+            self._since_snapshot[session_id] = 0
+            self.stats.snapshots += 1
+            record = _encode(_SNAPSHOT_BIN, session_id, encode_state(state))
+        else:
+            self._since_snapshot[session_id] = count
+            record = _encode(_DELTA, session_id, delta.model_dump_json())
+        await self._submit(session_id, record)
+
+    async def append_message(self, session_id: str, message: Message) -> None:
+        state = self._require(session_id)
+        mark = mark_state(state)
+        state.messages.append(MessageRecord(message.role, message.content))
+        await self.apply_delta(session_id, compact_delta_since(state, mark))
+
+    async def append_attempt(self, session_id: str, field_name: str, attempt: FieldAttempt) -> None:
+        state = self._require(session_id)
+        mark = mark_state(state)
+        state.add_attempt(field_name, attempt_record(attempt))
+        await self.apply_delta(session_id, compact_delta_since(state, mark))
+
+    async def update_state(
+        self,
+        session_id: str,
+        *,
+        phase: str,
+        current_field: str | None,
+        escalation: EscalationState | None,
+    ) -> None:
+        state = self._require(session_id)
+        mark = mark_state(state)
+        state.phase = phase
+        state.current_field = current_field
+        state.escalation = escalation
+        await self.apply_delta(session_id, compact_delta_since(state, mark))
+
+    # --- group commit ---
+
+    async def _submit(self, session_id: str, record: bytes) -> None:
+        fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._pending.append((session_id, record, fut))
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+        await fut
+
+    def _next_rotation(self) -> int | None:
+        """Seal the active segment if it is full; return the new segment number, if any."""
+        if self._active_size < self._segment_bytes:
+            return None
+        self._active += 1
+        self._active_size = 0
+        return self._active
+
+    async def _append(self, data: bytes) -> None:
+        loop = asyncio.get_running_loop()
+        rotate_to = self._next_rotation()
+        await loop.run_in_executor(self._writer, self._write, data, rotate_to)
+        self._active_size += len(data)
+        self.stats.commits += 1
+        self.stats.bytes_written += len(data)
+        if self._fsync:
+            self.stats.fsyncs += 1
+
+    async def _flush_loop(self) -> None:
+        while self._pending:
+            batch, self._pending = self._pending[: self._max_batch], self._pending[self._max_batch :]
+            try:
+                await self._append(b"".join(record for _, record, _ in batch))
+            except Exception as exc:
+                for _, _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(exc)
+                continue
+            for session_id, record, _ in batch:
+                if record[_HEADER.size] in _SNAPSHOTS:
+                    self._set_first_live(session_id, self._active)
+                elif session_id not in self._first_live:
+                    self._set_first_live(session_id, self._active)
+            self.stats.records += len(batch)
+            self.stats.max_batch = max(self.stats.max_batch, len(batch))
+            for _, _, fut in batch:
+                if not fut.done():
+                    fut.set_result(None)
+            await self._compact()
+
+    async def _compact(self) -> None:
+        """Retire sealed segments beyond max_segments, oldest first."""
+        while self._active - self._oldest > self._max_segments:
+            victim = self._oldest
+            sessions = sorted(self._segment_sessions.pop(victim, set()))
+            if sessions:
+                # Positional deltas still queued for these sessions replay cleanly on top.
+                data = b"".join(
+                    _encode(_SNAPSHOT_BIN, sid, encode_state(self._index[sid]))
+                    for sid in sessions
+                )
+                await self._append(data)
+                for sid in sessions:
+                    self._first_live.pop(sid, None)
+                    self._set_first_live(sid, self._active)
+                    self._since_snapshot[sid] = 0
+                self.stats.snapshots += len(sessions)
+            self._segment_path(victim).unlink(missing_ok=True)
+            self._oldest += 1
+            self.stats.compactions += 1
+
+    async def flush(self) -> None:
+        """Wait until every pending record is durable."""
+        while self._flusher is not None and not self._flusher.done():
+            await asyncio.shield(self._flusher)
+
+    def message_archive(self) -> CompressedMessageArchive:
+        """A file-backed MessageArchive in this journal's ``archive`` subdirectory."""
+        return CompressedMessageArchive(self._dir / "archive", fsync=self._fsync)
+
+    async def aclose(self) -> None:
+        """Make pending records durable, close the active segment and stop the writer thread."""
+        await self.flush()
+        await asyncio.get_running_loop().run_in_executor(self._writer, self._close_file)
+        self._writer.shutdown(wait=True)
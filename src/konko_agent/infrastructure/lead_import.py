@@ -0,0 +1,188 @@
+"""Offline lead validation: stream CSV/JSONL files through the batch validators in chunks."""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import time
+from collections import Counter, deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import NamedTuple, TextIO
+
+from konko_agent.config.models import AgentConfig
+from konko_agent.domain.validators import check_validation_regexes, validate_columns
+
+DEFAULT_CHUNK_ROWS = 10_000
+
+
+class _FieldSpec(NamedTuple):
+    """Picklable subset of FieldConfig shipped to worker processes."""
+
+    name: str
+    type: str
+    validation_regex: str | None
+    required: bool
+
+
+@dataclass
+class ImportStats:
+    """Totals for one validate_lead_file run."""
+
+    rows: int = 0
+    valid: int = 0
+    seconds: float = 0.0
+    errors: Counter[str] = field(default_factory=Counter)  # "field:code" -> count
+
+    @property
+    def invalid(self) -> int:
+        return self.rows - self.valid
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def _raw_chunks(path: Path, chunk_rows: int) -> Iterator[tuple[str, list[str] | None, list]]:
+    """
+    (kind, csv_header, chunk) with rows still undecoded: JSONL lines as strings,
+    CSV rows as lists of cells. Decoding happens where the chunk is validated.
+    """
+    suffix = path.suffix.lower()
+    if suffix not in (".csv", ".jsonl", ".ndjson"):
+        raise ValueError(f"Unsupported lead file type: {path.suffix} (expected .csv or .jsonl)")
+    with path.open(encoding="utf-8", newline="") as f:
+        if suffix == ".csv":
+            kind = "csv"
+            reader: Iterator = csv.reader(f)
+            header = next(reader, None)
+        else:
+            kind, header = "jsonl", None
+            reader = (line for line in f if line.strip())
+        while chunk := list(islice(reader, chunk_rows)):
+            yield kind, header, chunk
+
+
+def _decode(kind: str, header: list[str] | None, chunk: list) -> list[dict[str, str]]:
+    """Rows as dicts of strings; missing or null cells as ""."""
+    if kind == "csv":
+        return [dict(zip(header or (), cells)) for cells in chunk]
+    return [{k: "" if v is None else str(v) for k, v in json.loads(line).items()} for line in chunk]
+
+
+def iter_lead_chunks(path: str | Path, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[list[dict[str, str]]]:
+    """
+    Yield rows of a ``.csv`` (header row) or ``.jsonl`` file, ``chunk_rows`` at a time.
+    Values are returned as strings; missing or null cells as "".
+    """
+    for kind, header, chunk in _raw_chunks(Path(path), chunk_rows):
+        yield _decode(kind, header, chunk)
+
+
+def _row_results(
+    specs: tuple[_FieldSpec, ...], rows: list[dict[str, str]], max_length: int
+) -> list[dict[str, str]]:
+    """
+    {field: error_code} for each row (empty if the row is valid). Columns are
+    validated as batches; an empty optional field is not an error.
+    """
+    columns = {s.name: [row.get(s.name, "") for row in rows] for s in specs}
+    results = validate_columns(columns, specs, max_length)
+    checks = [(s.name, results[s.name].codes, s.required) for s in specs]
+    out: list[dict[str, str]] = []
+    for i in range(len(rows)):
+        errors: dict[str, str] = {}
+        for name, codes, required in checks:
+            code = codes[i]
+            if code and (required or code != "required"):
+                errors[name] = code
+        out.append(errors)
+    return out
+
+
+def _validate_chunk(
+    specs: tuple[_FieldSpec, ...],
+    kind: str,
+    header: list[str] | None,
+    chunk: list,
+    first_row: int,
+    max_length: int,
+    write: bool,
+) -> tuple[int, Counter[str], str]:
+    """
+    Decode and validate one chunk; returns (valid rows, "field:code" counts, output
+    JSON lines or ""). Runs in a worker process, so only raw rows and the finished
+    output cross the process boundary.
+    """
+    valid = 0
+    errors_seen: Counter[str] = Counter()
+    lines: list[str] = []
+    for n, errors in enumerate(_row_results(specs, _decode(kind, header, chunk), max_length), first_row):
+        if not errors:
+            valid += 1
+        for name, code in errors.items():
+            errors_seen[f"{name}:{code}"] += 1
+        if write:
+            lines.append(json.dumps({"row": n, "ok": not errors, "errors": errors}))
+    return valid, errors_seen, "\n".join(lines) + "\n" if lines else ""
+
+
+def validate_lead_file(
+    path: str | Path,
+    config: AgentConfig,
+    out: TextIO | None = None,
+    *,
+    workers: int | None = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> ImportStats:
+    """
+    Validate every row of ``path`` against ``config.fields`` with the agent's rules.
+
+    Chunks are decoded and validated on a pool of ``workers`` processes (default:
+    CPU count; 1 validates in this process) with at most two chunks per worker in
+    flight, so memory stays bounded however large the file is. If ``out`` is given,
+    one JSON line per row is written to it in input order:
+    ``{"row": n, "ok": ..., "errors": {...}}``.
+    Raises ValueError before reading anything if a custom validation_regex is super-linear.
+    """
+    check_validation_regexes(config.fields)
+    specs = tuple(_FieldSpec(f.name, f.type, f.validation_regex, f.required) for f in config.fields)
+    max_length = config.validation_max_length
+    workers = workers or os.cpu_count() or 1
+    stats = ImportStats()
+    start = time.perf_counter()
+
+    def emit(rows: int, result: tuple[int, Counter[str], str]) -> None:
+        valid, errors, text = result
+        stats.rows += rows
+        stats.valid += valid
+        stats.errors.update(errors)
+        if out is not None:
+            out.write(text)
+
+    chunks = _raw_chunks(Path(path), chunk_rows)
+    if workers <= 1:
+        for kind, header, chunk in chunks:
+            emit(len(chunk), _validate_chunk(specs, kind, header, chunk, stats.rows, max_length, out is not None))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending: deque[tuple[int, Future[tuple[int, Counter[str], str]]]] = deque()
+            submitted = 0
+            for kind, header, chunk in chunks:
+                future = pool.submit(
+                    _validate_chunk, specs, kind, header, chunk, submitted, max_length, out is not None
+                )
+                pending.append((len(chunk), future))
+                submitted += len(chunk)
+                if len(pending) >= 2 * workers:
+                    rows, future = pending.popleft()
+                    emit(rows, future.result())
+            while pending:
+                rows, future = pending.popleft()
+                emit(rows, future.result())
+    stats.seconds = time.perf_counter() - start
+    return stats
@@ -0,0 +1,188 @@
+"""Caching LLMClient wrapper: bounded LRU + TTL over turn analyses, with single-flight dedup."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from konko_agent.domain.escalation import normalize_text
+from konko_agent.domain.intent import Intent, try_parse_turn_analysis
+
+# Only replies that carry no user data are safe to share across sessions.
+DEFAULT_CACHEABLE_INTENTS = frozenset({Intent.OFF_TOPIC})
+
+# Set by the caller around LLM calls whose prompts are unique per session (see cache_bypass).
+_bypass: ContextVar[bool] = ContextVar("konko_llm_cache_bypass", default=False)
+
+
+@contextmanager
+def cache_bypass() -> Iterator[None]:
+    """Send LLM calls made inside this block straight to the inner client, uncached."""
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+@dataclass
+class CacheStats:
+    """Cache counters. ``coalesced`` counts calls that joined an identical in-flight call."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    coalesced: int = 0
+    uncacheable: int = 0
+    bypassed: int = 0  # calls made under cache_bypass
+
+
+class CachingLLMClient:
+    """
+    Wrap an LLMClient and cache replies keyed on (model, system prompt, normalized user message).
+
+    A reply is cached only if it parses as a TurnAnalysis whose intent is in
+    ``cacheable_intents`` and that carries no extracted value, so PII never lands
+    in the shared cache. Concurrent identical requests share one in-flight call.
+    Calls made under ``cache_bypass`` skip the cache entirely.
+    """
+
+    def __init__(
+        self,
+        inner: object,  # LLMClient protocol
+        model: str = "",
+        *,
+        max_entries: int = 1024,
+        ttl_seconds: float = 300.0,
+        cacheable_intents: Iterable[Intent] = DEFAULT_CACHEABLE_INTENTS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._inner = inner
+        self._model = model
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._cacheable_intents = frozenset(cacheable_intents)
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task[str]] = {}
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _key(self, system_prompt: str, user_message: str) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        for part in (self._model, system_prompt, normalize_text(user_message)):
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def _lookup(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if self._clock() >= expires_at:
+            del self._entries[key]
+            self.stats.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _is_cacheable(self, raw: str) -> bool:
+        analysis = try_parse_turn_analysis(raw)
+        return (
+            analysis is not None
+            and analysis.intent in self._cacheable_intents
+            and analysis.extracted_value is None
+            and not analysis.extractions
+        )
+
+    def _store(self, key: str, raw: str) -> None:
+        if not self._is_cacheable(raw):
+            self.stats.uncacheable += 1
+            return
+        self._entries[key] = (self._clock() + self._ttl, raw)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    async def _fetch(self, key: str, system_prompt: str, user_message: str) -> str:
+        try:
+            raw = await self._inner.complete(system_prompt, user_message)
+        finally:
+            self._inflight.pop(key, None)
+        self._store(key, raw)
+        return raw
+
+    async def complete(self, system_prompt: str, user_message: str) -> str:
+        if _bypass.get():
+            self.stats.bypassed += 1
+            return await self._inner.complete(system_prompt, user_message)
+        key = self._key(system_prompt, user_message)
+        cached = self._lookup(key)
+        if cached is not None:
+            self.stats.hits += 1
+            return cached
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats.coalesced += 1
+        else:
+            self.stats.misses += 1
+            task = asyncio.ensure_future(self._fetch(key, system_prompt, user_message))
+            # Retrieve the exception even if every caller was cancelled meanwhile.
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[key] = task
+        # shield: one caller being cancelled must not cancel the call others wait on.
+        return await asyncio.shield(task)
+
+    async def complete_stream(self, system_prompt: str, user_message: str) -> AsyncIterator[str]:
+        """Serve hits whole; on a miss, stream from the inner client and cache the result."""
+        inner_stream = getattr(self._inner, "complete_stream", None)
+        if _bypass.get():
+            self.stats.bypassed += 1
+            if inner_stream is None:
+                yield await self._inner.complete(system_prompt, user_message)
+            else:
+                async for chunk in inner_stream(system_prompt, user_message):
+                    yield chunk
+            return
+        key = self._key(system_prompt, user_message)
+        cached = self._lookup(key)
+        if cached is not None:
+            self.stats.hits += 1
+            yield cached
+            return
+        self.stats.misses += 1
+        if inner_stream is None:
+            raw = await self._inner.complete(system_prompt, user_message)
+            self._store(key, raw)
+            yield raw
+            return
+        chunks: list[str] = []
+        async for chunk in inner_stream(system_prompt, user_message):
+            chunks.append(chunk)
+            yield chunk
+        self._store(key, "".join(chunks))
+
+    def clear(self) -> None:
+        """Drop all cached entries (in-flight calls are unaffected)."""
+        self._entries.clear()
+
+    async def warmup(self, connections: int = 1) -> None:
+        warmup = getattr(self._inner, "warmup", None)
+        if warmup is not None:
+            await warmup(connections)
+
+    async def aclose(self) -> None:
+        aclose = getattr(self._inner, "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -0,0 +1,188 @@
+"""Model cascade LLMClient: a small model answers first, a larger one only when its reply is not trusted."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import AsyncIterator, Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+
+from konko_agent.config.models import AgentConfig
+from konko_agent.domain.intent import Intent, ParseStats, parse_turn_analysis
+
+DEFAULT_ESCALATE_INTENTS = frozenset({Intent.CORRECTION, Intent.ESCALATION_REQUEST})
+_CHARS_PER_TOKEN = 4  # cost is estimated from characters; no tokenizer is loaded
+
+
+@dataclass
+class TierStats:
+    """Calls, latency and estimated cost of one cascade tier."""
+
+    name: str
+    calls: int = 0
+    failures: int = 0
+    latency_total: float = 0.0  # seconds, successful calls only
+    tokens: int = 0  # estimated: prompt and reply characters / 4
+    cost: float = 0.0
+
+    @property
+    def mean_latency(self) -> float | None:
+        done = self.calls - self.failures
+        return self.latency_total / done if done else None
+
+
+@dataclass
+class CascadeStats:
+    """Per-tier counters and why turns moved up a tier."""
+
+    tiers: list[TierStats] = field(default_factory=list)
+    turns: int = 0
+    escalated: int = 0  # turns answered by a tier other than the first
+    low_confidence: int = 0
+    parse_failures: int = 0
+    escalate_intents: int = 0
+    errors: int = 0  # a lower tier raised
+
+    @property
+    def escalation_rate(self) -> float:
+        return self.escalated / self.turns if self.turns else 0.0
+
+    @property
+    def cost(self) -> float:
+        return sum(t.cost for t in self.tiers)
+
+
+class CascadeLLMClient:
+    """
+    Send each call to the first (cheapest) tier and move up a tier only when its
+    reply is not trusted: it does not parse as a TurnAnalysis, its confidence is
+    below ``confidence_threshold``, or its intent is in ``escalate_intents``. A
+    lower tier that raises is also skipped. The last tier's reply is returned as is.
+
+    Lower tiers are always called with ``complete``, since a reply can only be
+    judged once it is whole; ``complete_stream`` streams the last tier only.
+    """
+
+    def __init__(
+        self,
+        tiers: Sequence[object],  # LLMClient protocol, cheapest first
+        names: Sequence[str] | None = None,
+        *,
+        confidence_threshold: float = 0.7,
+        escalate_intents: Iterable[Intent] = DEFAULT_ESCALATE_INTENTS,
+        costs_per_1k_tokens: Sequence[float] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if len(tiers) < 2:
+            raise ValueError("CascadeLLMClient needs at least two tiers")
+        names = list(names) if names is not None else [f"tier-{i}" for i in range(len(tiers))]
+        self._tiers = list(tiers)
+        self._threshold = confidence_threshold
+        self._escalate_intents = frozenset(escalate_intents)
+        self._costs = list(costs_per_1k_tokens) if costs_per_1k_tokens is not None else [0.0] * len(tiers)
+        self._clock = clock
+        self.stats = CascadeStats(tiers=[TierStats(name=n) for n in names])
+
+    @classmethod
+    def from_config(cls, config: AgentConfig, small: object, large: object) -> CascadeLLMClient:
+        """Two tiers set up from ``config.cascade``: ``small`` first, then ``large`` (``config.llm_model``)."""
+        policy = config.cascade
+        if policy is None:
+            raise ValueError("config.cascade is not set")
+        return cls(
+            [small, large],
+            names=[policy.model, config.llm_model],
+            confidence_threshold=policy.confidence_threshold,
+            escalate_intents=[Intent(name) for name in policy.escalate_intents],
+            costs_per_1k_tokens=[policy.small_cost_per_1k_tokens, policy.large_cost_per_1k_tokens],
+        )
+
+    def _record(self, i: int, system_prompt: str, user_message: str, reply: str, latency: float) -> None:
+        tier = self.stats.tiers[i]
+        tokens = (len(system_prompt) + len(user_message) + len(reply) + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
+        tier.latency_total += latency
+        tier.tokens += tokens
+        tier.cost += tokens * self._costs[i] / 1000
+
+    def _trusted(self, raw: str) -> bool:
+        """Whether a lower tier's reply can be returned, counting the reason if not."""
+        parse = ParseStats()
+        analysis = parse_turn_analysis(raw, parse)
+        if parse.failed:
+            self.stats.parse_failures += 1
+        elif analysis.intent in self._escalate_intents:
+            self.stats.escalate_intents += 1
+        elif analysis.confidence < self._threshold:  # truncated repairs are capped below most thresholds
+            self.stats.low_confidence += 1
+        else:
+            return True
+        return False
+
+    async def _call(self, i: int, system_prompt: str, user_message: str) -> str:
+        tier = self.stats.tiers[i]
+        tier.calls += 1
+        start = self._clock()
+        try:
+            raw = await self._tiers[i].complete(system_prompt, user_message)
+        except Exception:
+            tier.failures += 1
+            raise
+        self._record(i, system_prompt, user_message, raw, self._clock() - start)
+        return raw
+
+    async def _lower_tiers(self, system_prompt: str, user_message: str) -> str | None:
+        """The first trusted reply from a tier below the last, or None."""
+        self.stats.turns += 1
+        for i in range(len(self._tiers) - 1):
+            try:
+                raw = await self._call(i, system_prompt, user_message)
+            except Exception:
+                self.stats.errors += 1
+                continue
+            if self._trusted(raw):
+                if i:
+                    self.stats.escalated += 1
+                return raw
+        self.stats.escalated += 1
+        return None
+
+    async def complete(self, system_prompt: str, user_message: str) -> str:
+        raw = await self._lower_tiers(system_prompt, user_message)
+        if raw is not None:
+            return raw
+        return await self._call(len(self._tiers) - 1, system_prompt, user_message)
+
+    async def complete_stream(self, system_prompt: str, user_message: str) -> AsyncIterator[str]:
+        """Yield a trusted lower-tier reply whole, or stream the last tier."""
+        raw = await self._lower_tiers(system_prompt, user_message)
+        if raw is not None:
+            yield raw
+            return
+        last = len(self._tiers) - 1
+        stream = getattr(self._tiers[last], "complete_stream", None)
+        if stream is None:
+            yield await self._call(last, system_prompt, user_message)
+            return
+        tier = self.stats.tiers[last]
+        tier.calls += 1
+        start = self._clock()
+        chunks: list[str] = []
+        try:
+            async for chunk in stream(system_prompt, user_message):
+                chunks.append(chunk)
+                yield chunk
+        except Exception:
+            tier.failures += 1
+            raise
+        self._record(last, system_prompt, user_message, "".join(chunks), self._clock() - start)
+
+    async def warmup(self, connections: int = 1) -> None:
+        for client in self._tiers:
+            warmup = getattr(client, "warmup", None)
+            if warmup is not None:
+                await warmup(connections)
+
+    async def aclose(self) -> None:
+        for client in self._tiers:
+            aclose = getattr(client, "aclose", None)
+            if aclose is not None:
+                await aclose()
@@ -2,7 +2,14 @@
 
 from __future__ import annotations
 
-from typing import Protocol, runtime_checkable
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING, Any, Protocol, runtime_checkable
+
+if TYPE_CHECKING:
+    import httpx
+
 
 @runtime_checkable
 class LLMClient(Protocol):
@@ -15,52 +22,158 @@ class LLMClient(Protocol):
         """
         ...
 
+    def complete_stream(self, system_prompt: str, user_message: str) -> AsyncIterator[str]:
+        """
+        Like complete, but yield the response text incrementally as it is generated.
+        Concatenating the chunks gives the same text complete would return.
+        """
+        ...
+
 
 class KonkoLLMClient:
-    """Async httpx-based LLM client. Expects OpenAI-compatible chat API."""
+    """
+    Async httpx-based LLM client. Expects OpenAI-compatible chat API.
+
+    Owns one long-lived pooled ``httpx.AsyncClient`` so turns reuse open
+    TCP/TLS connections instead of paying a handshake per call. Close it with
+    ``aclose()`` or use the client as an async context manager.
+
+    ``response_format`` is sent with every request, e.g.
+    ``domain.intent.turn_response_format()`` for schema-constrained TurnAnalysis replies.
+    """
 
     def __init__(
         self,
         base_url: str,
         model: str = "gpt-4o-mini",
         api_key: str | None = None,
+        *,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 60.0,
+        connect_timeout: float = 10.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+        response_format: dict[str, Any] | None = None,
     ) -> None:
         self._base_url = base_url.rstrip("/")
         self._model = model
+        self._response_format = response_format
         self._api_key = api_key
+        self._max_connections = max_connections
+        self._max_keepalive_connections = max_keepalive_connections
+        self._keepalive_expiry = keepalive_expiry
+        self._timeout = timeout
+        self._connect_timeout = connect_timeout
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
 
-    async def complete(self, system_prompt: str, user_message: str) -> str:
-        import httpx
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared pooled client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            import httpx
+
+            headers = {}
+            if self._api_key:
+                headers["Authorization"] = f"Bearer {self._api_key}"
+            self._client = httpx.AsyncClient(
+                base_url=self._base_url,
+                headers=headers,
+                limits=httpx.Limits(
+                    max_connections=self._max_connections,
+                    max_keepalive_connections=self._max_keepalive_connections,
+                    keepalive_expiry=self._keepalive_expiry,
+                ),
+                timeout=httpx.Timeout(self._timeout, connect=self._connect_timeout),
+                transport=self._transport,
+            )
+        return self._client
 
+    def _payload(self, system_prompt: str, user_message: str) -> dict[str, Any]:
         messages = [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_message},
         ]
-        payload = {"model": self._model, "messages": messages}
-        headers = {}
-        if self._api_key:
-            headers["Authorization"] = f"Bearer {self._api_key}"
-
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            r = await client.post(
-                f"{self._base_url}/v1/chat/completions",
-                json=payload,
-                headers=headers or None,
-            )
-            r.raise_for_status()
-            data = r.json()
+        payload: dict[str, Any] = {"model": self._model, "messages": messages}
+        if self._response_format is not None:
+            payload["response_format"] = self._response_format
+        return payload
+
+    async def complete(self, system_prompt: str, user_message: str) -> str:
+        client = self._get_client()
+        r = await client.post(
+            "/v1/chat/completions",
+            json=self._payload(system_prompt, user_message),
+        )
+        r.raise_for_status()
+        data = r.json()
         choices = data.get("choices", [])
         if not choices:
             return ""
         return (choices[0].get("message") or {}).get("content", "") or ""
 
+    async def complete_stream(self, system_prompt: str, user_message: str) -> AsyncIterator[str]:
+        """Stream content deltas via server-sent events (``"stream": true``)."""
+        client = self._get_client()
+        payload = self._payload(system_prompt, user_message)
+        payload["stream"] = True
+        async with client.stream("POST", "/v1/chat/completions", json=payload) as r:
+            r.raise_for_status()
+            async for line in r.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:") :].strip()
+                if data == "[DONE]":
+                    break
+                choices = json.loads(data).get("choices", [])
+                if not choices:
+                    continue
+                content = (choices[0].get("delta") or {}).get("content")
+                if content:
+                    yield content
+
+    async def warmup(self, connections: int = 1) -> int:
+        """
+        Open up to ``connections`` pooled connections ahead of the first turn.
+        Issues concurrent ``GET /v1/models`` requests; failures are ignored.
+        Returns the number of requests that reached the server.
+        """
+        import httpx
+
+        client = self._get_client()
+        n = max(0, min(connections, self._max_keepalive_connections))
+
+        async def ping() -> bool:
+            try:
+                r = await client.get("/v1/models")
+                await r.aread()
+                return True
+            except httpx.HTTPError:
+                return False
+
+        results = await asyncio.gather(*(ping() for _ in range(n)))
+        return sum(results)
+
+    async def aclose(self) -> None:
+        """Close the pooled client and its connections. Safe to call twice."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> KonkoLLMClient:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
 
 class MockLLMClient:
     """Implements LLMClient with scripted responses for tests. No network."""
 
-    def __init__(self, responses: list[str] | None = None) -> None:
+    def __init__(self, responses: list[str] | None = None, chunk_size: int = 8) -> None:
         self.responses = list(responses) if responses else []
         self.call_count = 0
+        self.chunk_size = chunk_size
 
     async def complete(self, system_prompt: str, user_message: str) -> str:
         if self.call_count < len(self.responses):
@@ -69,3 +182,9 @@ class MockLLMClient:
             out = '{"intent": "off_topic", "response_text": "I didn\'t understand.", "confidence": 0.5}'
         self.call_count += 1
         return out
+
+    async def complete_stream(self, system_prompt: str, user_message: str) -> AsyncIterator[str]:
+        """Yield the next scripted response in chunk_size pieces."""
+        out = await self.complete(system_prompt, user_message)
+        for i in range(0, len(out), self.chunk_size):
+            yield out[i : i + self.chunk_size]
@@ -0,0 +1,248 @@
+"""Multi-endpoint LLMClient: health-scored routing, jittered retries, hedged requests."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from konko_agent.infrastructure.llm_client import KonkoLLMClient
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """429/5xx responses, timeouts and transport failures are worth retrying elsewhere."""
+    import httpx
+
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    return isinstance(exc, (httpx.TransportError, OSError, asyncio.TimeoutError))
+
+
+@dataclass
+class EndpointHealth:
+    """EWMA latency/error score and recent latencies for one endpoint."""
+
+    name: str
+    ewma_latency: float | None = None
+    ewma_error: float = 0.0
+    requests: int = 0
+    failures: int = 0
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=200))
+
+    def p95(self) -> float | None:
+        if len(self.latencies) < 20:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+
+@dataclass
+class RouterStats:
+    """Counters across all endpoints."""
+
+    retries: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+
+
+class MultiEndpointLLMClient:
+    """
+    Route each call to the healthiest of several OpenAI-compatible endpoints.
+
+    Health is an EWMA of latency inflated by an EWMA error rate; endpoints with
+    no samples yet rank first so they get probed. Retryable failures (429, 5xx,
+    timeouts, transport errors) are retried on the next-best endpoint after a
+    full-jitter exponential backoff. With ``hedge=True`` a duplicate request is
+    sent to the runner-up once the primary exceeds its own p95 latency; the
+    first reply wins and the other request is cancelled.
+    """
+
+    def __init__(
+        self,
+        clients: Sequence[object],  # LLMClient protocol
+        names: Sequence[str] | None = None,
+        *,
+        max_attempts: int = 3,
+        backoff_base: float = 0.1,
+        backoff_max: float = 2.0,
+        hedge: bool = False,
+        ewma_alpha: float = 0.2,
+        error_penalty: float = 10.0,
+        rng: random.Random | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not clients:
+            raise ValueError("MultiEndpointLLMClient needs at least one endpoint")
+        names = list(names) if names is not None else [f"endpoint-{i}" for i in range(len(clients))]
+        self._clients = list(clients)
+        self.endpoints = [EndpointHealth(name=n) for n in names]
+        self._max_attempts = max_attempts
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._hedge = hedge
+        self._alpha = ewma_alpha
+        self._error_penalty = error_penalty
+        self._rng = rng or random.Random()
+        self._clock = clock
+        self.stats = RouterStats()
+
+    @classmethod
+    def from_urls(
+        cls,
+        base_urls: Sequence[str],
+        model: str = "gpt-4o-mini",
+        api_key: str | None = None,
+        client_kwargs: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> MultiEndpointLLMClient:
+        """One pooled KonkoLLMClient per base URL; ``client_kwargs`` go to each client."""
+        clients = [KonkoLLMClient(url, model, api_key, **(client_kwargs or {})) for url in base_urls]
+        return cls(clients, names=list(base_urls), **kwargs)
+
+    # --- health ---
+
+    def _score(self, i: int) -> float:
+        h = self.endpoints[i]
+        latency = h.ewma_latency
+        if latency is None:
+            if not h.requests:
+                return -1.0  # unprobed: try it
+            # Only failures so far: as slow as the slowest endpoint that has answered,
+            # so the error penalty ranks it behind every healthy one.
+            latency = max((e.ewma_latency for e in self.endpoints if e.ewma_latency is not None), default=0.0)
+        return latency * (1.0 + self._error_penalty * h.ewma_error)
+
+    def _ranked(self, exclude: set[int]) -> list[int]:
+        candidates = [i for i in range(len(self._clients)) if i not in exclude]
+        if not candidates:  # every endpoint failed this call: start over
+            candidates = list(range(len(self._clients)))
+        return sorted(candidates, key=lambda i: (self._score(i), self.endpoints[i].ewma_error))
+
+    def _record_success(self, i: int, latency: float) -> None:
+        h = self.endpoints[i]
+        h.requests += 1
+        h.latencies.append(latency)
+        a = self._alpha
+        h.ewma_latency = latency if h.ewma_latency is None else a * latency + (1 - a) * h.ewma_latency
+        h.ewma_error = (1 - a) * h.ewma_error
+
+    def _record_failure(self, i: int) -> None:
+        h = self.endpoints[i]
+        h.requests += 1
+        h.failures += 1
+        h.ewma_error = self._alpha + (1 - self._alpha) * h.ewma_error
+
+    async def _backoff(self, attempt: int) -> None:
+        self.stats.retries += 1
+        cap = min(self._backoff_max, self._backoff_base * (2**attempt))
+        await asyncio.sleep(self._rng.uniform(0, cap))
+
+    # --- calls ---
+
+    async def _call(self, i: int, system_prompt: str, user_message: str) -> str:
+        start = self._clock()
+        try:
+            raw = await self._clients[i].complete(system_prompt, user_message)
+        except Exception:
+            self._record_failure(i)
+            raise
+        self._record_success(i, self._clock() - start)
+        return raw
+
+    async def _call_hedged(
+        self, primary: int, backup: int | None, system_prompt: str, user_message: str, failed: set[int]
+    ) -> str:
+        """Call ``primary``, hedging to ``backup`` after its p95; a hedge that fails is added to ``failed``."""
+        delay = self.endpoints[primary].p95() if self._hedge and backup is not None else None
+        first = asyncio.ensure_future(self._call(primary, system_prompt, user_message))
+        if delay is None:
+            return await first
+        tasks = [first]
+        try:
+            done, _ = await asyncio.wait({first}, timeout=delay)
+            if done:
+                return first.result()
+
+            self.stats.hedges += 1
+            second = asyncio.ensure_future(self._call(backup, system_prompt, user_message))
+            tasks.append(second)
+            pending = {first, second}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            self.stats.hedge_wins += 1
+                        return task.result()
+            # Both failed: keep the retry off the backup too, and surface the primary's error.
+            failed.add(backup)
+            return first.result()
+        finally:
+            # Also reached when the caller is cancelled mid-wait: no call is left orphaned.
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def complete(self, system_prompt: str, user_message: str) -> str:
+        failed: set[int] = set()
+        last_exc: BaseException | None = None
+        for attempt in range(self._max_attempts):
+            if attempt:
+                await self._backoff(attempt - 1)
+            ranked = self._ranked(failed)
+            primary = ranked[0]
+            backup = ranked[1] if len(ranked) > 1 else None
+            try:
+                return await self._call_hedged(primary, backup, system_prompt, user_message, failed)
+            except Exception as exc:
+                if not _is_retryable(exc):
+                    raise
+                failed.add(primary)
+                last_exc = exc
+        assert last_exc is not None
+        raise last_exc
+
+    async def complete_stream(self, system_prompt: str, user_message: str) -> AsyncIterator[str]:
+        """Stream from the healthiest endpoint; retry elsewhere only if nothing was yielded yet."""
+        failed: set[int] = set()
+        for attempt in range(self._max_attempts):
+            if attempt:
+                await self._backoff(attempt - 1)
+            i = self._ranked(failed)[0]
+            client = self._clients[i]
+            stream = getattr(client, "complete_stream", None)
+            if stream is None:
+                yield await self._call(i, system_prompt, user_message)
+                return
+            start = self._clock()
+            started = False
+            try:
+                async for chunk in stream(system_prompt, user_message):
+                    started = True
+                    yield chunk
+            except Exception as exc:
+                self._record_failure(i)
+                if started or not _is_retryable(exc) or attempt == self._max_attempts - 1:
+                    raise
+                failed.add(i)
+                continue
+            self._record_success(i, self._clock() - start)
+            return
+
+    async def warmup(self, connections: int = 1) -> None:
+        for client in self._clients:
+            warmup = getattr(client, "warmup", None)
+            if warmup is not None:
+                await warmup(connections)
+
+    async def aclose(self) -> None:
+        for client in self._clients:
+            aclose = getattr(client, "aclose", None)
+            if aclose is not None:
+                await aclose()
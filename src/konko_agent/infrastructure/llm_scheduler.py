@@ -0,0 +1,244 @@
+"""Scheduling LLMClient wrapper: AIMD concurrency limit, priority queue, token-bucket rate limit."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+DEFAULT_PRIORITY = 100
+
+# Lower value = served first. Set by the caller around an LLM call (see request_priority).
+_request_priority: ContextVar[int] = ContextVar("konko_llm_request_priority", default=DEFAULT_PRIORITY)
+
+
+@contextmanager
+def request_priority(priority: int) -> Iterator[None]:
+    """Run LLM calls made inside this block with the given priority (lower is more urgent)."""
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+def _status_code(exc: BaseException) -> int | None:
+    """HTTP status of an error raised by the inner client (e.g. httpx.HTTPStatusError), if any."""
+    response = getattr(exc, "response", None)
+    return getattr(response, "status_code", None)
+
+
+@dataclass
+class SchedulerStats:
+    """Live scheduler gauges and counters. Wait times are in seconds."""
+
+    concurrency_limit: float = 0.0
+    in_flight: int = 0
+    queue_depth: int = 0
+    completed: int = 0
+    throttled: int = 0  # 429 responses
+    server_errors: int = 0  # 5xx responses
+    other_errors: int = 0
+    decreases: int = 0  # multiplicative cuts applied (at most one per congestion event)
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    granted: int = 0
+
+    @property
+    def avg_wait(self) -> float:
+        return self.total_wait / self.granted if self.granted else 0.0
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens per second, at most ``burst`` banked."""
+
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self._rate = rate
+        self._burst = burst
+        self._tokens = burst
+        self._clock = clock
+        self._last = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self._burst, self._tokens + (now - self._last) * self._rate)
+        self._last = now
+
+    async def acquire(self) -> None:
+        """Take one token, sleeping until one is available."""
+        while True:
+            self._refill()
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return
+            await asyncio.sleep((1.0 - self._tokens) / self._rate)
+
+
+class ScheduledLLMClient:
+    """
+    Wrap an LLMClient to bound and shape outbound calls.
+
+    At most ``concurrency_limit`` calls run at once; the limit grows additively
+    while latency stays under ``latency_target`` and is cut multiplicatively on
+    429/5xx/transport errors or slow replies (AIMD). The limit is cut at most once
+    per congestion event: signals from calls started before the last cut are
+    counted but do not cut again. Waiting calls are served
+    lowest priority value first (see ``request_priority``), FIFO within a
+    priority. An optional token bucket caps the request rate.
+    """
+
+    def __init__(
+        self,
+        inner: object,  # LLMClient protocol
+        *,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        latency_target: float = 5.0,
+        decrease_factor: float = 0.5,
+        rate_per_second: float | None = None,
+        burst: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._inner = inner
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._latency_target = latency_target
+        self._decrease_factor = decrease_factor
+        self._clock = clock
+        self._bucket = (
+            TokenBucket(rate_per_second, burst or rate_per_second, clock) if rate_per_second else None
+        )
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._seq = itertools.count()
+        self._generation = 0  # bumped by every cut; calls remember the one they started in
+        self.stats = SchedulerStats(concurrency_limit=float(initial_limit))
+
+    # --- slots ---
+
+    def _has_capacity(self) -> bool:
+        return self.stats.in_flight < max(self._min_limit, int(self.stats.concurrency_limit))
+
+    def _dispatch(self) -> None:
+        """Grant slots to queued waiters while there is capacity."""
+        while self._waiters and self._has_capacity():
+            _, _, fut = heapq.heappop(self._waiters)
+            if fut.done():  # cancelled while queued; already uncounted
+                continue
+            self.stats.in_flight += 1
+            self.stats.queue_depth -= 1
+            fut.set_result(None)
+
+    async def _acquire(self) -> None:
+        start = self._clock()
+        if not self._waiters and self._has_capacity():
+            self.stats.in_flight += 1
+        else:
+            fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (_request_priority.get(), next(self._seq), fut))
+            self.stats.queue_depth += 1
+            self._dispatch()
+            try:
+                await fut
+            except asyncio.CancelledError:
+                if fut.cancelled():
+                    self.stats.queue_depth -= 1
+                else:
+                    # Slot was granted just as we were cancelled: hand it on.
+                    self._release()
+                raise
+        waited = self._clock() - start
+        self.stats.granted += 1
+        self.stats.total_wait += waited
+        self.stats.max_wait = max(self.stats.max_wait, waited)
+
+    def _release(self) -> None:
+        self.stats.in_flight -= 1
+        self._dispatch()
+
+    # --- AIMD ---
+
+    def _on_success(self, latency: float, generation: int) -> None:
+        self.stats.completed += 1
+        if latency > self._latency_target:
+            self._decrease(generation)
+        else:
+            limit = self.stats.concurrency_limit
+            self.stats.concurrency_limit = min(float(self._max_limit), limit + 1.0 / max(limit, 1.0))
+
+    def _on_error(self, exc: BaseException, generation: int) -> None:
+        status = _status_code(exc)
+        if status == 429:
+            self.stats.throttled += 1
+        elif status is not None and status >= 500:
+            self.stats.server_errors += 1
+        elif status is not None:
+            # Other 4xx are request bugs, not overload signals.
+            self.stats.other_errors += 1
+            return
+        else:
+            self.stats.other_errors += 1
+        self._decrease(generation)
+
+    def _decrease(self, generation: int) -> None:
+        if generation != self._generation:
+            return  # started before the last cut: same congestion event
+        self._generation += 1
+        self.stats.decreases += 1
+        self.stats.concurrency_limit = max(
+            float(self._min_limit), self.stats.concurrency_limit * self._decrease_factor
+        )
+
+    # --- LLMClient ---
+
+    async def complete(self, system_prompt: str, user_message: str) -> str:
+        await self._acquire()
+        try:
+            if self._bucket is not None:
+                await self._bucket.acquire()
+            start, generation = self._clock(), self._generation
+            try:
+                raw = await self._inner.complete(system_prompt, user_message)
+            except Exception as exc:
+                self._on_error(exc, generation)
+                raise
+            self._on_success(self._clock() - start, generation)
+            return raw
+        finally:
+            self._release()
+
+    async def complete_stream(self, system_prompt: str, user_message: str) -> AsyncIterator[str]:
+        """Hold a slot for the whole stream; latency is measured to the last chunk."""
+        inner_stream = getattr(self._inner, "complete_stream", None)
+        if inner_stream is None:
+            yield await self.complete(system_prompt, user_message)
+            return
+        await self._acquire()
+        try:
+            if self._bucket is not None:
+                await self._bucket.acquire()
+            start, generation = self._clock(), self._generation
+            try:
+                async for chunk in inner_stream(system_prompt, user_message):
+                    yield chunk
+            except Exception as exc:
+                self._on_error(exc, generation)
+                raise
+            self._on_success(self._clock() - start, generation)
+        finally:
+            self._release()
+
+    async def warmup(self, connections: int = 1) -> None:
+        warmup = getattr(self._inner, "warmup", None)
+        if warmup is not None:
+            await warmup(connections)
+
+    async def aclose(self) -> None:
+        aclose = getattr(self._inner, "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -0,0 +1,204 @@
+"""Cold message archive: messages moved out of the hot state, compressed, read back a page at a time."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import struct
+import zlib
+from bisect import bisect_right
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Protocol, runtime_checkable
+
+from konko_agent.domain.compact_state import MessageRecord, message_model
+from konko_agent.domain.state import Message
+from konko_agent.domain.state_codec import decode_messages, encode_messages
+
+# File record: <start u32><count u32><size u32><crc32 u32> then an encode_messages block.
+_RECORD = struct.Struct("<IIII")
+_SUFFIX = ".archive"
+
+
+class MissingArchiveError(LookupError):
+    """The archive does not hold messages the session's state says were archived."""
+
+
+@runtime_checkable
+class MessageArchive(Protocol):
+    """Append-only store for the messages a session no longer keeps in its hot state."""
+
+    async def append(self, session_id: str, start: int, messages: Sequence[Message | MessageRecord]) -> None:
+        """Store messages at positions start, start + 1, ...; positions already stored are skipped."""
+        ...
+
+    async def read(self, session_id: str, offset: int, limit: int) -> list[Message]:
+        """Up to ``limit`` archived messages from position ``offset`` on."""
+        ...
+
+
+@dataclass
+class TranscriptPage:
+    """One page of a session's whole history, archived and hot messages alike."""
+
+    messages: list[Message]
+    offset: int
+    total: int  # messages in the session so far
+
+    @property
+    def next_offset(self) -> int | None:
+        """Offset of the following page, or None if this is the last one."""
+        end = self.offset + len(self.messages)
+        return end if end < self.total else None
+
+
+@dataclass
+class ArchiveStats:
+    """Write and read counters for a CompressedMessageArchive."""
+
+    blocks_written: int = 0
+    messages_archived: int = 0
+    raw_bytes: int = 0  # UTF-8 size of the archived message contents
+    stored_bytes: int = 0
+    blocks_read: int = 0
+
+
+@dataclass
+class _Block:
+    start: int
+    count: int
+    data: bytes | None = None  # in memory; None when the block lives in a file
+    pos: int = 0  # offset of the block's data in the session file
+    size: int = 0
+
+
+@dataclass
+class _Session:
+    blocks: list[_Block] = field(default_factory=list)
+    starts: list[int] = field(default_factory=list)
+
+    @property
+    def end(self) -> int:
+        last = self.blocks[-1] if self.blocks else None
+        return last.start + last.count if last is not None else 0
+
+
+class CompressedMessageArchive:
+    """
+    MessageArchive that stores each append as one zlib-compressed block
+    (``encode_messages``). Reads decompress only the blocks a page overlaps.
+
+    Blocks are kept in memory by default. With ``directory``, each session's
+    blocks are appended to its own file there (one checksummed record per
+    block, written off the event loop), and memory holds only a small index per
+    session, loaded the first time the session is touched. A torn record at the
+    end of a file, left by a crash, is dropped on load.
+
+    Appends for one session must not run concurrently; AgentRuntime serializes
+    a session's turns, which covers this.
+    """
+
+    def __init__(self, directory: str | Path | None = None, *, fsync: bool = True) -> None:
+        self._dir = Path(directory) if directory is not None else None
+        if self._dir is not None:
+            self._dir.mkdir(parents=True, exist_ok=True)
+        self._fsync = fsync
+        self._sessions: dict[str, _Session] = {}
+        self.stats = ArchiveStats()
+
+    @property
+    def durable(self) -> bool:
+        """True if blocks survive a restart (file-backed)."""
+        return self._dir is not None
+
+    def _path(self, session_id: str) -> Path:  # file-backed archives only
+        return self._dir / (hashlib.blake2b(session_id.encode("utf-8"), digest_size=16).hexdigest() + _SUFFIX)
+
+    def _scan(self, session_id: str) -> _Session:
+        """Rebuild a session's block index from its file, dropping a torn tail."""
+        session = _Session()
+        path = self._path(session_id)
+        if not path.exists():
+            return session
+        with open(path, "rb") as f:
+            data = f.read()
+        pos = 0
+        while pos + _RECORD.size <= len(data):
+            start, count, size, crc = _RECORD.unpack_from(data, pos)
+            body = pos + _RECORD.size
+            if body + size > len(data) or zlib.crc32(data[body : body + size]) != crc:
+                break
+            session.blocks.append(_Block(start, count, pos=body, size=size))
+            session.starts.append(start)
+            pos = body + size
+        if pos < len(data):
+            with open(path, "r+b") as f:
+                f.truncate(pos)
+        return session
+
+    async def _session(self, session_id: str) -> _Session:
+        session = self._sessions.get(session_id)
+        if session is None:
+            if self._dir is None:
+                session = _Session()
+            else:
+                session = await asyncio.to_thread(self._scan, session_id)
+            session = self._sessions.setdefault(session_id, session)
+        return session
+
+    def _write(self, session_id: str, record: bytes) -> int:
+        """Append one record to the session file; returns the position it was written at."""
+        with open(self._path(session_id), "ab") as f:
+            pos = f.tell()
+            f.write(record)
+            f.flush()
+            if self._fsync:
+                os.fsync(f.fileno())
+        return pos
+
+    async def append(self, session_id: str, start: int, messages: Sequence[Message | MessageRecord]) -> None:
+        session = await self._session(session_id)
+        end = session.end
+        if start > end:
+            raise ValueError(f"Archive for {session_id} holds {end} messages; cannot append at {start}")
+        messages = messages[end - start :]
+        if not messages:
+            return
+        data = encode_messages(messages)
+        block = _Block(end, len(messages), size=len(data))
+        if self._dir is None:
+            block.data = data
+        else:
+            record = _RECORD.pack(end, len(messages), len(data), zlib.crc32(data)) + data
+            block.pos = await asyncio.to_thread(self._write, session_id, record) + _RECORD.size
+        session.blocks.append(block)
+        session.starts.append(end)
+        self.stats.blocks_written += 1
+        self.stats.messages_archived += len(messages)
+        self.stats.raw_bytes += sum(len(m.content.encode("utf-8")) for m in messages)
+        self.stats.stored_bytes += len(data)
+
+    def _read_block(self, session_id: str, block: _Block) -> bytes:
+        with open(self._path(session_id), "rb") as f:
+            f.seek(block.pos)
+            return f.read(block.size)
+
+    async def read(self, session_id: str, offset: int, limit: int) -> list[Message]:
+        session = await self._session(session_id)
+        stop = min(offset + limit, session.end)
+        out: list[Message] = []
+        i = max(bisect_right(session.starts, offset) - 1, 0)
+        while offset < stop and i < len(session.blocks):
+            block = session.blocks[i]
+            data = block.data
+            if data is None:
+                data = await asyncio.to_thread(self._read_block, session_id, block)
+            self.stats.blocks_read += 1
+            records = decode_messages(data)[offset - block.start : stop - block.start]
+            out += [message_model(m) for m in records]
+            offset += len(records)
+            i += 1
+        return out
+
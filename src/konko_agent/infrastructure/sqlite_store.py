@@ -0,0 +1,471 @@
+"""SQLite-backed StateStore: WAL journal, off-loop I/O, batched commits, per-turn deltas."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from konko_agent.domain.compact_state import MessageRecord, message_model
+from konko_agent.domain.state import (
+    AttemptsDelta,
+    ConversationState,
+    EscalationState,
+    FieldAttempt,
+    FieldState,
+    Message,
+    StateDelta,
+)
+from konko_agent.domain.state_codec import decode_messages, encode_messages
+
+# Normalized layout: one header row per session plus one row per message and per
+# attempt, so a turn writes only what it appended instead of the whole conversation.
+# Archived messages leave ``messages`` for ``archive_blocks`` (see SQLiteMessageArchive).
+_SCHEMA_VERSION = 3
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS sessions (
+        session_id TEXT PRIMARY KEY,
+        header     TEXT NOT NULL,
+        updated_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS session_fields (
+        session_id TEXT NOT NULL,
+        field_name TEXT NOT NULL,
+        PRIMARY KEY (session_id, field_name)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS messages (
+        session_id TEXT NOT NULL,
+        seq        INTEGER NOT NULL,
+        role       TEXT NOT NULL,
+        content    TEXT NOT NULL,
+        PRIMARY KEY (session_id, seq)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS attempts (
+        session_id TEXT NOT NULL,
+        field_name TEXT NOT NULL,
+        seq        INTEGER NOT NULL,
+        attempt    TEXT NOT NULL,
+        PRIMARY KEY (session_id, field_name, seq)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS archive_blocks (
+        session_id TEXT NOT NULL,
+        start      INTEGER NOT NULL,
+        count      INTEGER NOT NULL,
+        data       BLOB NOT NULL,
+        PRIMARY KEY (session_id, start)
+    ) WITHOUT ROWID
+    """,
+)
+_SELECT_HEADER = "SELECT header FROM sessions WHERE session_id = ?"
+_SELECT_FIELDS = "SELECT field_name FROM session_fields WHERE session_id = ? ORDER BY rowid"
+_SELECT_MESSAGES = "SELECT role, content FROM messages WHERE session_id = ? ORDER BY seq"
+_SELECT_ATTEMPTS = "SELECT field_name, attempt FROM attempts WHERE session_id = ? ORDER BY field_name, seq"
+_UPSERT_HEADER = (
+    "INSERT INTO sessions (session_id, header, updated_at) VALUES (?, ?, ?) "
+    "ON CONFLICT(session_id) DO UPDATE SET header = excluded.header, updated_at = excluded.updated_at"
+)
+_INSERT_FIELD = "INSERT OR IGNORE INTO session_fields (session_id, field_name) VALUES (?, ?)"
+_TRUNCATE_MESSAGES = "DELETE FROM messages WHERE session_id = ? AND seq >= ?"
+_ARCHIVE_MESSAGES = "DELETE FROM messages WHERE session_id = ? AND seq < ?"
+_INSERT_MESSAGE = "INSERT INTO messages (session_id, seq, role, content) VALUES (?, ?, ?, ?)"
+_TRUNCATE_ATTEMPTS = "DELETE FROM attempts WHERE session_id = ? AND field_name = ? AND seq >= ?"
+_INSERT_ATTEMPT = "INSERT INTO attempts (session_id, field_name, seq, attempt) VALUES (?, ?, ?, ?)"
+_SELECT_ARCHIVE_END = "SELECT COALESCE(MAX(start + count), 0) FROM archive_blocks WHERE session_id = ?"
+_SELECT_ARCHIVE_BLOCKS = (
+    "SELECT start, data FROM archive_blocks WHERE session_id = ? AND start + count > ? AND start < ? ORDER BY start"
+)
+_INSERT_ARCHIVE_BLOCK = "INSERT INTO archive_blocks (session_id, start, count, data) VALUES (?, ?, ?, ?)"
+_CLEAR_SESSION = (
+    "DELETE FROM session_fields WHERE session_id = ?",
+    "DELETE FROM messages WHERE session_id = ?",
+    "DELETE FROM attempts WHERE session_id = ?",
+)
+# A replacing snapshot keeps only archive blocks below its own boundary (none for a new session).
+_CLEAR_ARCHIVE = "DELETE FROM archive_blocks WHERE session_id = ? AND start + count > ?"
+
+
+@dataclass
+class _Write:
+    """One serialized write: a full snapshot (``replace``) or a delta, applied positionally."""
+
+    session_id: str
+    header: str
+    replace: bool
+    message_offset: int | None  # None: leave messages untouched
+    messages: list[tuple[str, str]]
+    fields: list[tuple[str, int, list[str]]]  # (field_name, offset, attempt JSON)
+    archived_messages: int = 0  # message rows before this position are deleted
+
+
+def _header_json(
+    phase: str, current_field: str | None, escalation: EscalationState | None, archived_messages: int = 0
+) -> str:
+    return json.dumps(
+        {
+            "phase": phase,
+            "current_field": current_field,
+            "escalation": escalation.model_dump(mode="json") if escalation is not None else None,
+            "archived_messages": archived_messages,
+        }
+    )
+
+
+def _snapshot_write(session_id: str, state: ConversationState) -> _Write:
+    return _Write(
+        session_id=session_id,
+        header=_header_json(state.phase, state.current_field, state.escalation, state.archived_messages),
+        replace=True,
+        message_offset=state.archived_messages,
+        messages=[(m.role, m.content) for m in state.messages],
+        fields=[(name, 0, [a.model_dump_json() for a in fs.attempts]) for name, fs in state.fields.items()],
+        archived_messages=state.archived_messages,
+    )
+
+
+def _delta_write(session_id: str, delta: StateDelta) -> _Write:
+    return _Write(
+        session_id=session_id,
+        header=_header_json(delta.phase, delta.current_field, delta.escalation, delta.archived_messages),
+        replace=False,
+        message_offset=delta.message_offset,
+        messages=[(m.role, m.content) for m in delta.messages],
+        fields=[
+            (name, change.offset, [a.model_dump_json() for a in change.attempts])
+            for name, change in delta.fields.items()
+        ],
+        archived_messages=delta.archived_messages,
+    )
+
+
+@dataclass
+class SQLiteStoreStats:
+    """Write-path counters: one commit may carry many writes (snapshots or deltas)."""
+
+    commits: int = 0
+    writes: int = 0
+    rows_written: int = 0
+    max_batch: int = 0
+
+
+class SQLiteStateStore:
+    """
+    Durable DeltaStateStore on a single SQLite file in WAL mode.
+
+    All blocking sqlite3 calls run on dedicated threads (one writer, a small
+    reader pool with one connection each) so the event loop never stalls.
+    Writes are group-committed: writes that arrive while a commit is running go
+    out together, in arrival order, in the next transaction, and each call
+    returns once its write is committed. A turn's ``apply_delta`` touches only
+    the header row and the rows it appended. Statements are fixed strings, so
+    sqlite3's per-connection prepared-statement cache serves every call.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        readers: int = 4,
+        max_batch: int = 512,
+        batch_delay: float = 0.0,
+        synchronous: str = "NORMAL",
+        statement_cache_size: int = 64,
+    ) -> None:
+        self._path = str(path)
+        self._max_batch = max_batch
+        self._batch_delay = batch_delay
+        self._synchronous = synchronous
+        self._statement_cache_size = statement_cache_size
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="konko-sqlite-w")
+        self._readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="konko-sqlite-r")
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._conn_lock = threading.Lock()
+        self._pending: list[tuple[_Write, asyncio.Future[None]]] = []
+        self._flusher: asyncio.Task[None] | None = None
+        self.stats = SQLiteStoreStats()
+        # Create the schema and switch to WAL up front (WAL is persistent per file).
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        self._migrate(conn)
+
+    def _connect(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self._path,
+                check_same_thread=False,
+                cached_statements=self._statement_cache_size,
+            )
+            conn.execute(f"PRAGMA synchronous={self._synchronous}")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+            with self._conn_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        """Create the schema; convert a version-1 file (one JSON blob per session) in place."""
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= _SCHEMA_VERSION:
+            return
+        with conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(sessions)")}
+            legacy = conn.execute("SELECT session_id, state FROM sessions").fetchall() if "state" in columns else []
+            if "state" in columns:
+                conn.execute("DROP TABLE sessions")
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            for session_id, raw in legacy:
+                state = ConversationState.model_validate_json(raw)
+                self._apply_write(conn, _snapshot_write(session_id, state), time.time())
+            conn.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+
+    # --- blocking helpers (run on the executors) ---
+
+    def _read(self, session_id: str) -> ConversationState | None:
+        conn = self._connect()
+        # One read transaction so the rows form a consistent snapshot under WAL.
+        with conn:
+            conn.execute("BEGIN")
+            row = conn.execute(_SELECT_HEADER, (session_id,)).fetchone()
+            if row is None:
+                return None
+            field_names = [r[0] for r in conn.execute(_SELECT_FIELDS, (session_id,))]
+            messages = conn.execute(_SELECT_MESSAGES, (session_id,)).fetchall()
+            attempts = conn.execute(_SELECT_ATTEMPTS, (session_id,)).fetchall()
+        header = json.loads(row[0])
+        fields = {name: FieldState(field_name=name) for name in field_names}
+        for field_name, raw in attempts:
+            fields.setdefault(field_name, FieldState(field_name=field_name)).attempts.append(
+                FieldAttempt.model_validate_json(raw)
+            )
+        escalation = header["escalation"]
+        return ConversationState(
+            session_id=session_id,
+            phase=header["phase"],
+            messages=[Message(role=role, content=content) for role, content in messages],
+            fields=fields,
+            current_field=header["current_field"],
+            escalation=EscalationState.model_validate(escalation) if escalation is not None else None,
+            archived_messages=header.get("archived_messages", 0),
+        )
+
+    def _read_archived(self, session_id: str) -> int:
+        row = self._connect().execute(_SELECT_HEADER, (session_id,)).fetchone()
+        return json.loads(row[0]).get("archived_messages", 0) if row is not None else 0
+
+    def _archive_append(self, session_id: str, start: int, messages: Sequence[Message | MessageRecord]) -> None:
+        conn = self._connect()
+        with conn:
+            end = conn.execute(_SELECT_ARCHIVE_END, (session_id,)).fetchone()[0]
+            if start > end:
+                raise ValueError(f"Archive for {session_id} holds {end} messages; cannot append at {start}")
+            messages = messages[end - start :]
+            if messages:
+                conn.execute(_INSERT_ARCHIVE_BLOCK, (session_id, end, len(messages), encode_messages(messages)))
+
+    def _archive_read(self, session_id: str, offset: int, limit: int) -> list[Message]:
+        stop = offset + limit
+        rows = self._connect().execute(_SELECT_ARCHIVE_BLOCKS, (session_id, offset, stop)).fetchall()
+        out: list[Message] = []
+        for start, data in rows:
+            if start > offset + len(out):
+                break  # gap: the caller sees a short read
+            records = decode_messages(data)[offset + len(out) - start : stop - start]
+            out += [message_model(m) for m in records]
+        return out
+
+    @staticmethod
+    def _apply_write(conn: sqlite3.Connection, w: _Write, now: float) -> None:
+        sid = w.session_id
+        if w.replace:
+            for statement in _CLEAR_SESSION:
+                conn.execute(statement, (sid,))
+            conn.execute(_CLEAR_ARCHIVE, (sid, w.archived_messages))
+        conn.execute(_UPSERT_HEADER, (sid, w.header, now))
+        if w.message_offset is not None:
+            conn.execute(_TRUNCATE_MESSAGES, (sid, w.message_offset))
+            conn.executemany(
+                _INSERT_MESSAGE,
+                [(sid, w.message_offset + i, role, content) for i, (role, content) in enumerate(w.messages)],
+            )
+        if w.archived_messages:
+            conn.execute(_ARCHIVE_MESSAGES, (sid, w.archived_messages))
+        for field_name, offset, attempts in w.fields:
+            conn.execute(_INSERT_FIELD, (sid, field_name))
+            conn.execute(_TRUNCATE_ATTEMPTS, (sid, field_name, offset))
+            conn.executemany(
+                _INSERT_ATTEMPT,
+                [(sid, field_name, offset + i, raw) for i, raw in enumerate(attempts)],
+            )
+
+    def _write_batch(self, writes: list[_Write]) -> None:
+        conn = self._connect()
+        now = time.time()
+        with conn:
+            for w in writes:
+                self._apply_write(conn, w, now)
+
+    # --- StateStore ---
+
+    async def get(self, session_id: str) -> ConversationState | None:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._readers, self._read, session_id)
+
+    async def set(self, session_id: str, state: ConversationState) -> None:
+        # Serialize on the loop so the snapshot matches the state at call time.
+        await self._submit(_snapshot_write(session_id, state))
+
+    # --- DeltaStateStore ---
+
+    async def apply_delta(self, session_id: str, delta: StateDelta) -> None:
+        await self._submit(_delta_write(session_id, delta))
+
+    async def append_message(self, session_id: str, message: Message) -> None:
+        state = await self.get(session_id)
+        if state is None:
+            raise KeyError(f"Unknown session: {session_id}")
+        await self.apply_delta(
+            session_id,
+            StateDelta(
+                message_offset=state.archived_messages + len(state.messages),
+                messages=[message],
+                phase=state.phase,
+                current_field=state.current_field,
+                escalation=state.escalation,
+                archived_messages=state.archived_messages,
+            ),
+        )
+
+    async def append_attempt(self, session_id: str, field_name: str, attempt: FieldAttempt) -> None:
+        state = await self.get(session_id)
+        if state is None:
+            raise KeyError(f"Unknown session: {session_id}")
+        fs = state.fields.get(field_name)
+        await self.apply_delta(
+            session_id,
+            StateDelta(
+                message_offset=state.archived_messages + len(state.messages),
+                fields={field_name: AttemptsDelta(offset=len(fs.attempts) if fs else 0, attempts=[attempt])},
+                phase=state.phase,
+                current_field=state.current_field,
+                escalation=state.escalation,
+                archived_messages=state.archived_messages,
+            ),
+        )
+
+    async def update_state(
+        self,
+        session_id: str,
+        *,
+        phase: str,
+        current_field: str | None,
+        escalation: EscalationState | None,
+    ) -> None:
+        # The header also holds the archive boundary, which must not move back.
+        loop = asyncio.get_running_loop()
+        archived = await loop.run_in_executor(self._readers, self._read_archived, session_id)
+        await self._submit(
+            _Write(
+                session_id=session_id,
+                header=_header_json(phase, current_field, escalation, archived),
+                replace=False,
+                message_offset=None,
+                messages=[],
+                fields=[],
+            )
+        )
+
+    # --- group commit ---
+
+    async def _submit(self, write: _Write) -> None:
+        fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._pending.append((write, fut))
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+        await fut
+
+    async def _flush_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            if self._batch_delay:
+                await asyncio.sleep(self._batch_delay)
+            batch, self._pending = self._pending[: self._max_batch], self._pending[self._max_batch :]
+            # Order matters (a delta builds on the write before it), so nothing is coalesced.
+            writes = [w for w, _ in batch]
+            try:
+                await loop.run_in_executor(self._writer, self._write_batch, writes)
+            except Exception as exc:
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(exc)
+                continue
+            self.stats.commits += 1
+            self.stats.writes += len(writes)
+            self.stats.rows_written += sum(
+                1 + len(w.messages) + sum(len(a) for _, _, a in w.fields) for w in writes
+            )
+            self.stats.max_batch = max(self.stats.max_batch, len(batch))
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_result(None)
+
+    async def flush(self) -> None:
+        """Wait until every pending write is committed."""
+        while self._flusher is not None and not self._flusher.done():
+            await asyncio.shield(self._flusher)
+
+    def message_archive(self) -> SQLiteMessageArchive:
+        """A MessageArchive kept in this store's database, for the messages it drops."""
+        return SQLiteMessageArchive(self)
+
+    async def aclose(self) -> None:
+        """Commit pending writes, close all connections and stop the I/O threads."""
+        await self.flush()
+        self._writer.shutdown(wait=True)
+        self._readers.shutdown(wait=True)
+        with self._conn_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+
+class SQLiteMessageArchive:
+    """
+    MessageArchive in a SQLiteStateStore's own file: each append is one
+    zlib-compressed ``encode_messages`` block in ``archive_blocks``, written on the
+    store's writer thread. Archived messages therefore live exactly as long as
+    the session rows that no longer hold them.
+    """
+
+    durable = True
+
+    def __init__(self, store: SQLiteStateStore) -> None:
+        self._store = store
+
+    async def append(self, session_id: str, start: int, messages: Sequence[Message | MessageRecord]) -> None:
+        store = self._store
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(store._writer, store._archive_append, session_id, start, list(messages))
+
+    async def read(self, session_id: str, offset: int, limit: int) -> list[Message]:
+        store = self._store
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(store._readers, store._archive_read, session_id, offset, limit)
+
@@ -2,9 +2,25 @@
 
 from __future__ import annotations
 
+import weakref
 from typing import Protocol, runtime_checkable
 
-from konko_agent.domain.state import ConversationState
+from konko_agent.domain.compact_state import (
+    CompactState,
+    MessageRecord,
+    apply_delta_to_compact,
+    attempt_record,
+    compact_from_model,
+    compact_to_model,
+)
+from konko_agent.domain.state import (
+    ConversationState,
+    EscalationState,
+    FieldAttempt,
+    FieldState,
+    Message,
+    StateDelta,
+)
 
 
 @runtime_checkable
@@ -20,14 +36,157 @@ class StateStore(Protocol):
         ...
 
 
+@runtime_checkable
+class DeltaStateStore(StateStore, Protocol):
+    """
+    StateStore that persists changes incrementally instead of rewriting the whole state.
+    ``set`` is still used for a session's first snapshot.
+    """
+
+    async def append_message(self, session_id: str, message: Message) -> None:
+        """Append one message to the session's history."""
+        ...
+
+    async def append_attempt(self, session_id: str, field_name: str, attempt: FieldAttempt) -> None:
+        """Append one attempt to a field's history."""
+        ...
+
+    async def update_state(
+        self,
+        session_id: str,
+        *,
+        phase: str,
+        current_field: str | None,
+        escalation: EscalationState | None,
+    ) -> None:
+        """Overwrite the session's scalar header (phase, current field, escalation)."""
+        ...
+
+    async def apply_delta(self, session_id: str, delta: StateDelta) -> None:
+        """Apply one turn's changes atomically (idempotent, see StateDelta)."""
+        ...
+
+
 class InMemoryStateStore:
-    """In-memory dict store. Suitable for single process; no persistence."""
+    """
+    In-memory dict store. Suitable for single process; no persistence.
+    Sessions are held as CompactState; ``get`` returns a ConversationState copy and
+    ``get_compact`` the live compact state (used by ConversationAgent).
+    """
 
     def __init__(self) -> None:
-        self._store: dict[str, ConversationState] = {}
+        self._store: dict[str, CompactState] = {}
 
     async def get(self, session_id: str) -> ConversationState | None:
+        state = self._store.get(session_id)
+        return compact_to_model(state) if state is not None else None
+
+    async def get_compact(self, session_id: str) -> CompactState | None:
         return self._store.get(session_id)
 
     async def set(self, session_id: str, state: ConversationState) -> None:
-        self._store[session_id] = state
+        self._store[session_id] = compact_from_model(state)
+
+    def _require(self, session_id: str) -> CompactState:
+        state = self._store.get(session_id)
+        if state is None:
+            raise KeyError(f"Unknown session: {session_id}")
+        return state
+
+    async def append_message(self, session_id: str, message: Message) -> None:
+        self._require(session_id).messages.append(MessageRecord(message.role, message.content))
+
+    async def append_attempt(self, session_id: str, field_name: str, attempt: FieldAttempt) -> None:
+        self._require(session_id).add_attempt(field_name, attempt_record(attempt))
+
+    async def update_state(
+        self,
+        session_id: str,
+        *,
+        phase: str,
+        current_field: str | None,
+        escalation: EscalationState | None,
+    ) -> None:
+        state = self._require(session_id)
+        state.phase = phase
+        state.current_field = current_field
+        state.escalation = escalation
+
+    async def apply_delta(self, session_id: str, delta: StateDelta) -> None:
+        # get_compact() hands out the stored object itself, so the agent's delta is usually
+        # already applied. StateDelta is positional, so re-applying it is idempotent (the
+        # slots are still rewritten, in time proportional to the delta).
+        apply_delta_to_compact(self._require(session_id), delta)
+
+
+class SnapshotDeltaAdapter:
+    """
+    Give a plain get/set StateStore the DeltaStateStore API.
+
+    ``apply_delta`` applies the delta to the state most recently returned by
+    ``get`` for that session (loading it if needed) and writes it back with
+    ``set``, so existing stores keep working unchanged.
+    """
+
+    def __init__(self, inner: object) -> None:  # StateStore protocol
+        self._inner = inner
+        self._loaded: weakref.WeakValueDictionary[str, ConversationState] = weakref.WeakValueDictionary()
+
+    async def get(self, session_id: str) -> ConversationState | None:
+        state = await self._inner.get(session_id)
+        if state is not None:
+            self._loaded[session_id] = state
+        return state
+
+    async def set(self, session_id: str, state: ConversationState) -> None:
+        self._loaded[session_id] = state
+        await self._inner.set(session_id, state)
+
+    async def _load(self, session_id: str) -> ConversationState:
+        state = self._loaded.get(session_id)
+        if state is None:
+            state = await self.get(session_id)
+        if state is None:
+            raise KeyError(f"Unknown session: {session_id}")
+        return state
+
+    async def append_message(self, session_id: str, message: Message) -> None:
+        state = await self._load(session_id)
+        state.messages.append(message)
+        await self.set(session_id, state)
+
+    async def append_attempt(self, session_id: str, field_name: str, attempt: FieldAttempt) -> None:
+        state = await self._load(session_id)
+        state.fields.setdefault(field_name, FieldState(field_name=field_name)).attempts.append(attempt)
+        await self.set(session_id, state)
+
+    async def update_state(
+        self,
+        session_id: str,
+        *,
+        phase: str,
+        current_field: str | None,
+        escalation: EscalationState | None,
+    ) -> None:
+        state = await self._load(session_id)
+        state.phase = phase
+        state.current_field = current_field
+        state.escalation = escalation
+        await self.set(session_id, state)
+
+    async def apply_delta(self, session_id: str, delta: StateDelta) -> None:
+        state = await self._load(session_id)
+        delta.apply_to(state)
+        await self.set(session_id, state)
+
+    async def aclose(self) -> None:
+        aclose = getattr(self._inner, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+def as_delta_store(store: object) -> object:
+    """Return store itself if it supports deltas, else wrap it in SnapshotDeltaAdapter."""
+    if isinstance(store, DeltaStateStore):
+        return store
+    return SnapshotDeltaAdapter(store)
@@ -2,95 +2,139 @@
 
 from __future__ import annotations
 
-import json
-from datetime import datetime
+from collections.abc import AsyncIterator
+from contextlib import nullcontext
+from dataclasses import dataclass
 
+from konko_agent.config.compiled import CompiledAgentConfig, compile_config
 from konko_agent.config.models import AgentConfig
-from konko_agent.domain.escalation import evaluate_escalation
-from konko_agent.domain.intent import Intent, TurnAnalysis
-from konko_agent.domain.phases import ConversationPhase, next_phase
-from konko_agent.domain.state import (
-    ConversationState,
-    EscalationState,
-    FieldAttempt,
-    FieldState,
-    Message,
-)
-from konko_agent.domain.validators import validate_field
-from konko_agent.orchestration.prompt_builder import (
-    build_system_prompt,
-    build_user_message_for_turn,
+from konko_agent.domain.compact_state import (
+    CompactState,
+    DerivedIndex,
+    FieldSlot,
+    MessageRecord,
+    compact_delta_since,
+    compact_from_model,
+    compact_to_model,
+    message_model,
+    new_attempt,
+    rollback_compact,
 )
+from konko_agent.domain.escalation import TriggerMatcher, evaluate_escalation
+from konko_agent.domain.intent import Intent, ParseStats, TurnAnalysis, parse_turn_analysis
+from konko_agent.domain.phases import ConversationPhase, next_phase
+from konko_agent.domain.state import ConversationState, StateMark, mark_state
+from konko_agent.infrastructure.llm_cache import cache_bypass
+from konko_agent.infrastructure.llm_scheduler import request_priority
+from konko_agent.infrastructure.message_archive import CompressedMessageArchive, MissingArchiveError, TranscriptPage
+from konko_agent.infrastructure.state_store import as_delta_store
+from konko_agent.orchestration.context import ContextAssembler
+from konko_agent.orchestration.fast_path import FastPathClassifier
+from konko_agent.orchestration.field_validation import FieldValidationStats, FieldValidator
+from konko_agent.orchestration.prompt_builder import compile_prompt_template
+from konko_agent.orchestration.stream_parser import ResponseTextStreamer
 
 
-def _parse_turn_response(raw: str) -> TurnAnalysis:
-    """Parse LLM response into TurnAnalysis. On failure return off_topic."""
-    raw = raw.strip()
-    # Strip markdown code block if present
-    if raw.startswith("```"):
-        lines = raw.split("\n")
-        if lines[0].startswith("```"):
-            lines = lines[1:]
-        if lines and lines[-1].strip() == "```":
-            lines = lines[:-1]
-        raw = "\n".join(lines)
-    try:
-        data = json.loads(raw)
-        return TurnAnalysis.model_validate(data)
-    except (json.JSONDecodeError, Exception):
-        return TurnAnalysis(
-            intent=Intent.OFF_TOPIC,
-            response_text=raw or "I didn't understand. Could you rephrase?",
-            confidence=0.0,
-        )
+def _extracted_values(analysis: TurnAnalysis, state: CompactState) -> list[tuple[str, str, float]]:
+    """
+    (field_name, value, confidence) for every value in the turn: the single
+    extracted_value (defaulting to current_field) plus any further extractions.
+    """
+    items: list[tuple[str, str, float]] = []
+    if analysis.extracted_value is not None:
+        field_name = analysis.field_name or state.current_field
+        if field_name:
+            items.append((field_name, analysis.extracted_value, analysis.confidence))
+    seen = {name for name, _, _ in items}
+    for e in analysis.extractions:
+        if e.field_name not in seen:
+            seen.add(e.field_name)
+            items.append((e.field_name, e.value, e.confidence))
+    return items
 
 
-def _required_field_names(config: AgentConfig) -> list[str]:
-    return [f.name for f in config.fields if f.required]
+def _turn_priority(index: DerivedIndex) -> int:
+    """
+    Scheduling priority for this turn's LLM call (lower is served first): the number
+    of required fields still missing, so sessions about to complete/escalate go first.
+    """
+    return index.missing_required
 
 
-def _next_field_to_collect(state: ConversationState, config: AgentConfig) -> str | None:
-    """First field in config order that is not yet collected."""
-    for f in config.fields:
-        fs = state.fields.get(f.name)
-        if not fs or not fs.is_collected:
-            return f.name
-    return None
+def _ensure_fields_from_config(state: CompactState, compiled: CompiledAgentConfig) -> None:
+    """Ensure state.fields has an entry for each config field (mutation)."""
+    for name in compiled.order:
+        if name not in state.fields:
+            state.fields[name] = FieldSlot(name)
 
 
-def _ensure_fields_from_config(state: ConversationState, config: AgentConfig) -> None:
-    """Ensure state.fields has an entry for each config field (mutation)."""
-    for f in config.fields:
-        if f.name not in state.fields:
-            state.fields[f.name] = FieldState(field_name=f.name)
+@dataclass
+class TurnStats:
+    """Counters for how turns were answered."""
+
+    llm_turns: int = 0
+    fast_path_turns: int = 0
+    trigger_escalations: int = 0
+    coalesced_messages: int = 0  # merged into another message's turn (AgentRuntime)
+    superseded_turns: int = 0  # queued or in-flight turns restarted with a newer burst
 
 
 class ConversationAgent:
-    """One agent instance: config + LLM client + state store. Handles one turn at a time."""
+    """
+    One agent instance: config + LLM client + state store. Handles one turn at a time.
+
+    With ``config.history_window`` set, a session keeps only its latest messages in
+    its state; older ones are moved to ``archive`` and read back through
+    ``get_transcript``. By default the archive is the store's own
+    (``state_store.message_archive()``, offered by the durable stores), else an
+    in-memory CompressedMessageArchive.
+    """
 
     def __init__(
         self,
         config: AgentConfig,
         llm_client: object,  # LLMClient protocol
         state_store: object,  # StateStore protocol
+        *,
+        archive: object | None = None,  # MessageArchive protocol
     ) -> None:
         self.config = config
+        self._compiled = compile_config(config)
         self._llm = llm_client
-        self._store = state_store
+        self._store = as_delta_store(state_store)
+        store_archive = getattr(state_store, "message_archive", None)
+        if archive is None and config.history_window is not None:
+            # Durable stores drop archived messages, so they must land somewhere as durable.
+            archive = store_archive() if store_archive is not None else None
+            archive = archive if archive is not None else CompressedMessageArchive()
+        elif archive is not None and store_archive is not None and not getattr(archive, "durable", True):
+            raise ValueError("A durable state store needs a durable message archive (or none, to use the store's)")
+        self._archive = archive
+        self._prompt = compile_prompt_template(config)
+        self._context = ContextAssembler(config)
+        # With history in the user message no two sessions send the same prompt, so a
+        # CachingLLMClient could only miss: bypass it.
+        self._cache_scope = cache_bypass if config.context_token_budget is not None else nullcontext
+        self._trigger_matcher = TriggerMatcher(self._compiled.trigger_phrases)
+        self._validator = FieldValidator(config)
+        self._fast_path = FastPathClassifier(config, self._validator) if config.fast_path else None
+        self.stats = TurnStats()
+        self.parse_stats = ParseStats()
+        self._awaiting_llm: set[str] = set()
 
     async def start_session(self, session_id: str) -> str:
         """
         Initialize a new session if it does not exist yet, append the greeting,
         persist state, and return the greeting text.
         """
-        state = await self._store.get(session_id)
+        state = await self._load_state(session_id)
         if state is None:
             state = _initial_state(session_id)
-            _ensure_fields_from_config(state, self.config)
-            state.current_field = _next_field_to_collect(state, self.config)
+            _ensure_fields_from_config(state, self._compiled)
+            state.current_field = self._index(state).next_field
             greeting = self.config.personality.greeting
-            state.messages.append(Message(role="assistant", content=greeting))
-            await self._store.set(session_id, state)
+            state.messages.append(MessageRecord("assistant", greeting))
+            await self._store.set(session_id, compact_to_model(state))
             return greeting
 
         # Session already exists; just return configured greeting.
@@ -100,78 +144,237 @@ class ConversationAgent:
         """
         Process one user message: load state, run turn loop, persist, return assistant reply.
         """
+        state, mark = await self._begin_turn(session_id, user_message)
+        try:
+            analysis = self._check_triggers(state, user_message) or await self._try_fast_path(state, user_message)
+            if analysis is None:
+                self.stats.llm_turns += 1
+                system_prompt = self._prompt.render(state)
+                user_text = self._context.user_message(state)
+                self._awaiting_llm.add(session_id)
+                try:
+                    with request_priority(_turn_priority(self._index(state))), self._cache_scope():
+                        raw = await self._llm.complete(system_prompt, user_text)
+                finally:
+                    self._awaiting_llm.discard(session_id)
+                analysis = parse_turn_analysis(raw, self.parse_stats)
+        except BaseException:
+            # Failed or abandoned before anything was persisted: leave no trace in the
+            # state, which in-process stores hand out live.
+            rollback_compact(state, mark)
+            raise
+        return await self._finish_turn(session_id, state, mark, user_message, analysis)
+
+    def awaiting_llm(self, session_id: str) -> bool:
+        """
+        True while handle_message for this session is waiting on the LLM, the only
+        point at which cancelling the turn is clean (the state is rolled back).
+        """
+        return session_id in self._awaiting_llm
+
+    async def handle_message_stream(self, session_id: str, user_message: str) -> AsyncIterator[str]:
+        """
+        Streaming variant of handle_message: yield response_text deltas as the LLM produces them.
+        Intent, extraction, validation and persistence are applied once the stream ends.
+        If the final reply differs from what was streamed (e.g. the closing message on
+        escalation, or an unparseable reply), the difference is yielded last.
+        The turn is only persisted if the generator is consumed to the end; if the LLM
+        call fails, or the generator is closed or cancelled while the LLM is streaming,
+        the state is rolled back.
+        """
+        state, mark = await self._begin_turn(session_id, user_message)
+        streamer = ResponseTextStreamer()
+        try:
+            analysis = self._check_triggers(state, user_message) or await self._try_fast_path(state, user_message)
+            if analysis is None:
+                self.stats.llm_turns += 1
+                system_prompt = self._prompt.render(state)
+                user_text = self._context.user_message(state)
+                chunks: list[str] = []
+                with request_priority(_turn_priority(self._index(state))), self._cache_scope():
+                    async for chunk in self._complete_stream(system_prompt, user_text):
+                        chunks.append(chunk)
+                        delta = streamer.feed(chunk)
+                        if delta:
+                            yield delta
+                analysis = parse_turn_analysis("".join(chunks), self.parse_stats)
+        except BaseException:  # including GeneratorExit when closed mid-stream
+            rollback_compact(state, mark)
+            raise
+        reply = await self._finish_turn(session_id, state, mark, user_message, analysis)
+        streamed = streamer.text
+        if reply != streamed:
+            if streamed and reply.startswith(streamed):
+                yield reply[len(streamed) :]
+            else:
+                yield ("\n" if streamed else "") + reply
+
+    async def _complete_stream(self, system_prompt: str, user_text: str) -> AsyncIterator[str]:
+        """Stream from the LLM client, or yield its full completion if it cannot stream."""
+        complete_stream = getattr(self._llm, "complete_stream", None)
+        if complete_stream is None:
+            yield await self._llm.complete(system_prompt, user_text)
+            return
+        async for chunk in complete_stream(system_prompt, user_text):
+            yield chunk
+
+    async def _load_state(self, session_id: str) -> CompactState | None:
+        """
+        Load the session as a CompactState. In-process stores hand out their live compact
+        state (``get_compact``); for the rest, the stored ConversationState is converted.
+        """
+        get_compact = getattr(self._store, "get_compact", None)
+        if get_compact is not None:
+            return await get_compact(session_id)
         state = await self._store.get(session_id)
+        return compact_from_model(state) if state is not None else None
+
+    async def _begin_turn(self, session_id: str, user_message: str) -> tuple[CompactState, StateMark]:
+        """
+        Load (or create) the session state and append the user message. The returned
+        mark is the persisted state's shape, from which _finish_turn builds the delta.
+        """
+        state = await self._load_state(session_id)
         if state is None:
             state = _initial_state(session_id)
-            _ensure_fields_from_config(state, self.config)
-            state.current_field = _next_field_to_collect(state, self.config)
-            await self._store.set(session_id, state)
-
-        state.messages.append(Message(role="user", content=user_message))
-        _ensure_fields_from_config(state, self.config)
-
-        system_prompt = build_system_prompt(self.config, state)
-        user_text = build_user_message_for_turn(state)
-        raw = await self._llm.complete(system_prompt, user_text)
-        analysis = _parse_turn_response(raw)
-        if analysis.intent == Intent.FIELD_RESPONSE and analysis.extracted_value is not None:
-            field_name = analysis.field_name or state.current_field
-            if field_name and field_name in state.fields:
-                cfg = next((f for f in self.config.fields if f.name == field_name), None)
+            _ensure_fields_from_config(state, self._compiled)
+            state.current_field = self._index(state).next_field
+            await self._store.set(session_id, compact_to_model(state))
+
+        mark = mark_state(state)
+        state.messages.append(MessageRecord("user", user_message))
+        _ensure_fields_from_config(state, self._compiled)
+        self._index(state)
+        return state, mark
+
+    def _index(self, state: CompactState) -> DerivedIndex:
+        """
+        The state's derived index for this config, bound on first use. In-process stores
+        keep handing out the same CompactState, so it is built once per loaded session.
+        """
+        index = state.index_for(self.config.fields)
+        if index is None:
+            compiled = self._compiled
+            # next_phase recognises the index by the identity of compiled.required_names.
+            index = state.bind_index(
+                self.config.fields, compiled.order, compiled.required_names, compiled.position
+            )
+        return index
+
+    def _check_triggers(self, state: CompactState, user_message: str) -> TurnAnalysis | None:
+        """
+        If the message contains an escalation trigger phrase, return an escalation_request
+        analysis answered with the closing message so the LLM call is skipped entirely.
+        """
+        if not self.config.escalation.enabled or state.escalation is not None or not self._trigger_matcher:
+            return None
+        if self._trigger_matcher.search(user_message) is None:
+            return None
+        self.stats.trigger_escalations += 1
+        # The reply is final, so leave GREETING now; _finish_turn then moves COLLECTING -> ESCALATED.
+        if state.phase == ConversationPhase.GREETING.value:
+            state.phase = ConversationPhase.COLLECTING.value
+        return TurnAnalysis(
+            intent=Intent.ESCALATION_REQUEST,
+            response_text=self.config.personality.closing,
+            confidence=1.0,
+        )
+
+    async def _try_fast_path(self, state: CompactState, user_message: str) -> TurnAnalysis | None:
+        """
+        If fast_path is enabled and the message is a confident local match for
+        current_field, return a field_response analysis whose reply is the next
+        field's prompt (or the closing message when nothing is left). Else None.
+        """
+        if self._fast_path is None or state.current_field is None:
+            return None
+        if state.phase not in (ConversationPhase.GREETING.value, ConversationPhase.COLLECTING.value):
+            return None
+        cfg = self._compiled.field(state.current_field)
+        if cfg is None:
+            return None
+        value = await self._fast_path.match(user_message, cfg)
+        if value is None:
+            return None
+
+        self.stats.fast_path_turns += 1
+        index = self._index(state)
+        next_cfg = next(
+            (
+                f
+                for f in self._compiled.fields[index.next_pos :]
+                if f.name != cfg.name and not index.is_collected(f.name)
+            ),
+            None,
+        )
+        return TurnAnalysis(
+            intent=Intent.FIELD_RESPONSE,
+            response_text=next_cfg.prompt if next_cfg else self.config.personality.closing,
+            extracted_value=value,
+            confidence=1.0,
+            field_name=cfg.name,
+        )
+
+    @property
+    def validation_stats(self) -> dict[str, FieldValidationStats]:
+        """Per-field validation latency and off-loop counters."""
+        return self._validator.stats
+
+    async def aclose(self) -> None:
+        """Stop the validation worker process, if one was started."""
+        await self._validator.aclose()
+
+    async def _apply_analysis(self, state: CompactState, analysis: TurnAnalysis) -> None:
+        """
+        Record field attempts for field_response / correction intents (mutation).
+        Every extracted value in the turn is validated and recorded in one pass.
+        """
+        if analysis.intent == Intent.FIELD_RESPONSE:
+            for field_name, value, confidence in _extracted_values(analysis, state):
+                if field_name not in state.fields:
+                    continue
+                cfg = self._compiled.field(field_name)
                 if cfg:
                     field_state = state.fields[field_name]
                     if field_state.is_collected:
-                       
-                        next_field = _next_field_to_collect(state, self.config)
+                        next_field = self._index(state).next_field
                         if next_field and next_field != field_name:
-                            next_cfg = next(
-                                (f for f in self.config.fields if f.name == next_field),
-                                None,
-                            )
+                            next_cfg = self._compiled.field(next_field)
                             if next_cfg:
                                 analysis.response_text = (
                                     analysis.response_text
                                     or f"I already have your {field_name}. {next_cfg.prompt}"
-                                )      
+                                )
                     else:
-                        ok, _ = validate_field(
-                            analysis.extracted_value,
-                            cfg.type,
-                            cfg.validation_regex,
-                        )
+                        ok, _ = await self._validator.validate(cfg, value)
                         status = "valid" if ok else "invalid"
-                        field_state.attempts.append(
-                            FieldAttempt(
-                                value=analysis.extracted_value,
-                                timestamp=datetime.utcnow(),
-                                confidence=analysis.confidence,
-                                validation_status=status,
-                                source="user_provided",
-                            )
-                        )
-
-        elif analysis.intent == Intent.CORRECTION and analysis.extracted_value is not None:
-            field_name = analysis.field_name or state.current_field
-            if field_name and field_name in state.fields:
-                cfg = next((f for f in self.config.fields if f.name == field_name), None)
+                        state.add_attempt(field_name, new_attempt(value, confidence, status))
+
+        elif analysis.intent == Intent.CORRECTION:
+            for field_name, value, confidence in _extracted_values(analysis, state):
+                if field_name not in state.fields:
+                    continue
+                cfg = self._compiled.field(field_name)
                 if cfg:
-                    ok, _ = validate_field(
-                        analysis.extracted_value,
-                        cfg.type,
-                        cfg.validation_regex,
-                    )
-                    state.fields[field_name].attempts.append(
-                        FieldAttempt(
-                            value=analysis.extracted_value,
-                            timestamp=datetime.utcnow(),
-                            confidence=analysis.confidence,
-                            validation_status="valid" if ok else "invalid",
-                            source="corrected",
-                        )
+                    ok, _ = await self._validator.validate(cfg, value)
+                    state.add_attempt(
+                        field_name,
+                        new_attempt(value, confidence, "valid" if ok else "invalid", source="corrected"),
                     )
 
         elif analysis.intent == Intent.ESCALATION_REQUEST:
-            pass  # escalation evaluated below
+            pass  # escalation evaluated in _finish_turn
+
+    async def _finish_turn(
+        self,
+        session_id: str,
+        state: CompactState,
+        mark: StateMark,
+        user_message: str,
+        analysis: TurnAnalysis,
+    ) -> str:
+        """Apply the analysis, evaluate escalation and phase, append the reply, persist the delta."""
+        await self._apply_analysis(state, analysis)
 
         # Evaluate escalation (may set state.escalation)
         if state.escalation is None:
@@ -179,35 +382,71 @@ class ConversationAgent:
                 state,
                 self.config,
                 user_message.lower(),
+                self._trigger_matcher,
             )
 
-        required = _required_field_names(self.config)
+        index = self._index(state)
         phase = ConversationPhase(state.phase)
-        next_p = next_phase(phase, state, required)
+        next_p = next_phase(phase, state, self._compiled.required_names)
         state.phase = next_p.value
 
         # If we have escalated, prefer a deterministic closing over the model's reply.
         if state.escalation is not None and state.phase == ConversationPhase.ESCALATED.value:
             analysis.response_text = self.config.personality.closing
 
-        state.current_field = _next_field_to_collect(state, self.config)
+        state.current_field = index.next_field
 
-        state.messages.append(Message(role="assistant", content=analysis.response_text))
-        await self._store.set(session_id, state)
+        state.messages.append(MessageRecord("assistant", analysis.response_text))
+        await self._store.apply_delta(session_id, compact_delta_since(state, mark))
+        await self._archive_overflow(session_id, state)
 
         return analysis.response_text
 
+    async def _archive_overflow(self, session_id: str, state: CompactState) -> None:
+        """
+        Once the hot history exceeds history_window by history_archive_batch messages,
+        move everything but the last history_window messages to the archive. The
+        archive is written first, so a crash in between only re-archives (a no-op).
+        """
+        window = self.config.history_window
+        if window is None or len(state.messages) < window + self.config.history_archive_batch:
+            return
+        mark = mark_state(state)
+        count = len(state.messages) - window
+        await self._archive.append(session_id, state.archived_messages, state.messages[:count])
+        state.archive_messages(count)
+        await self._store.apply_delta(session_id, compact_delta_since(state, mark))
+
     async def get_state(self, session_id: str) -> ConversationState | None:
         """Return current state for session (e.g. for CLI display)."""
         return await self._store.get(session_id)
 
+    async def get_transcript(self, session_id: str, offset: int = 0, limit: int = 50) -> TranscriptPage | None:
+        """
+        One page of the session's whole history, oldest first: archived messages
+        from the archive, the rest from the state. None if the session is unknown.
+        Raises MissingArchiveError if the archive lost messages the state says it holds.
+        """
+        state = await self._load_state(session_id)
+        if state is None:
+            return None
+        base = state.archived_messages
+        total = base + len(state.messages)
+        offset = max(offset, 0)
+        end = min(offset + max(limit, 0), total)
+        messages = []
+        if offset < min(end, base):
+            if self._archive is None:
+                raise RuntimeError(f"Session {session_id} has archived messages but no archive is configured")
+            want = min(end, base) - offset
+            messages = await self._archive.read(session_id, offset, want)
+            if len(messages) < want:
+                raise MissingArchiveError(
+                    f"Archive for {session_id} lacks messages {offset + len(messages)}-{offset + want - 1}"
+                )
+        messages += [message_model(m) for m in state.messages[max(offset - base, 0) : max(end - base, 0)]]
+        return TranscriptPage(messages, offset, total)
+
 
-def _initial_state(session_id: str) -> ConversationState:
-    return ConversationState(
-        session_id=session_id,
-        phase=ConversationPhase.GREETING.value,
-        messages=[],
-        fields={},
-        current_field=None,
-        escalation=None,
-    )
+def _initial_state(session_id: str) -> CompactState:
+    return CompactState(session_id=session_id, phase=ConversationPhase.GREETING.value)
@@ -0,0 +1,132 @@
+"""Multi-turn LLM context under a token budget: recent messages verbatim, older ones in a rolling summary."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+
+from konko_agent.config.models import AgentConfig
+from konko_agent.domain.compact_state import CompactState
+
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD = 2  # tokens for a message's role label and line break
+SUMMARY_SHARE = 4  # the summary gets at most 1/SUMMARY_SHARE of the budget
+_CLIP = {"user": 160}  # characters kept per summarized message (others: _CLIP_DEFAULT)
+_CLIP_DEFAULT = 80
+
+
+def estimate_tokens(text: str) -> int:
+    """Fast local token estimate (about four characters per token); no tokenizer is loaded."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _digest(role: str, content: str) -> str:
+    """One summary line: the message with whitespace collapsed, clipped by role."""
+    text = " ".join(content.split())
+    clip = _CLIP.get(role, _CLIP_DEFAULT)
+    if len(text) > clip:
+        text = text[: clip - 1].rstrip() + "…"
+    return f"- {role}: {text}"
+
+
+@dataclass(slots=True)
+class RollingSummary:
+    """
+    Digest of every message before position ``upto`` (archived messages counted),
+    cached on the CompactState. Messages are folded in once, as they leave the
+    verbatim window; the oldest lines are dropped to stay within ``budget`` tokens.
+    """
+
+    budget: int
+    upto: int = 0
+    lines: deque[tuple[str, int]] = field(default_factory=deque)
+    tokens: int = 0
+    omitted: int = 0  # messages folded in but no longer shown
+
+    def fold(self, role: str, content: str) -> None:
+        line = _digest(role, content)
+        cost = estimate_tokens(line) + 1
+        self.lines.append((line, cost))
+        self.tokens += cost
+        self.upto += 1
+        while self.tokens > self.budget and self.lines:
+            _, dropped = self.lines.popleft()
+            self.tokens -= dropped
+            self.omitted += 1
+
+    def skip_to(self, position: int) -> None:
+        """Count messages that left the state unseen (e.g. archived before a reload) as omitted."""
+        if position > self.upto:
+            self.omitted += position - self.upto
+            self.upto = position
+
+    def render(self) -> list[str]:
+        if not self.lines and not self.omitted:
+            return []
+        out = ["Earlier in the conversation (summary):"]
+        if self.omitted:
+            out.append(f"- ({self.omitted} earlier messages omitted)")
+        out.extend(line for line, _ in self.lines)
+        return out
+
+
+class ContextAssembler:
+    """
+    Builds the user message for a turn's LLM call from the session's history.
+
+    With ``config.context_token_budget`` unset, this is only the latest user message.
+    Otherwise the latest message comes last, preceded by as many of the messages
+    before it as fit verbatim within the budget (newest first), and by a rolling
+    summary of everything older, capped at 1/SUMMARY_SHARE of the budget. The
+    summary is kept on ``state.context_summary`` and only extended each turn.
+    Token counts are estimate_tokens estimates.
+    """
+
+    def __init__(self, config: AgentConfig) -> None:
+        self.budget = config.context_token_budget
+        self.summary_budget = self.budget // SUMMARY_SHARE if self.budget is not None else 0
+
+    def _summary(self, state: CompactState, latest: int) -> RollingSummary:
+        summary = state.context_summary
+        stale = not isinstance(summary, RollingSummary) or summary.budget != self.summary_budget
+        if stale or summary.upto > latest:  # another budget, or messages were rolled back
+            summary = state.context_summary = RollingSummary(self.summary_budget)
+        summary.skip_to(state.archived_messages)
+        return summary
+
+    def user_message(self, state: CompactState) -> str:
+        """The text sent as the user message for this turn."""
+        messages = state.messages
+        i = len(messages) - 1
+        while i >= 0 and messages[i].role != "user":
+            i -= 1
+        if i < 0:
+            return ""
+        latest = messages[i].content
+        if self.budget is None:
+            return latest
+
+        base = state.archived_messages
+        summary = self._summary(state, base + i)
+        room = self.budget - estimate_tokens(latest) - MESSAGE_OVERHEAD - self.summary_budget
+        start = i
+        floor = summary.upto - base
+        while start > floor:
+            cost = estimate_tokens(messages[start - 1].content) + MESSAGE_OVERHEAD
+            if cost > room:
+                break
+            room -= cost
+            start -= 1
+        for m in messages[floor:start]:
+            summary.fold(m.role, m.content)
+
+        parts = summary.render()
+        if start < i:
+            if parts:
+                parts.append("")
+            parts.append("Recent messages:")
+            parts.extend(f"{m.role}: {m.content}" for m in messages[start:i])
+        if not parts:
+            return latest
+        parts += ["", "Latest user message:", latest]
+        return "\n".join(parts)
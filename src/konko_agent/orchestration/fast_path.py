@@ -0,0 +1,81 @@
+"""Deterministic pre-classifier: answer plain field replies without an LLM round trip."""
+
+from __future__ import annotations
+
+import re
+
+from konko_agent.config.compiled import compile_config
+from konko_agent.config.models import AgentConfig, FieldConfig
+from konko_agent.orchestration.field_validation import FieldValidator
+
+# Extra ways users refer to a field of a given type ("my phone number is ...").
+_TYPE_ALIASES: dict[str, tuple[str, ...]] = {
+    "email": ("email", "email address", "e-mail", "mail"),
+    "phone": ("phone", "phone number", "number", "mobile", "cell"),
+    "name": ("name", "full name"),
+    "address": ("address", "home address", "street address"),
+    "custom": (),
+}
+
+# "it's X" / "it is X" / "sure, X": only trusted for strictly validated types.
+_GENERIC_CUE_RE = re.compile(
+    r"^(?:(?:sure|ok|okay|yes)[,!.]?\s+)?(?:it'?s|it is|that'?s|that is|here it is:?)\s+(.+)$",
+    re.IGNORECASE,
+)
+
+_TRAILING_PUNCT = ".!,;"
+
+
+def _is_strict(field: FieldConfig) -> bool:
+    """Types whose validator is selective enough to trust a bare reply."""
+    return field.type in ("email", "phone") or (field.type == "custom" and bool(field.validation_regex))
+
+
+class FastPathClassifier:
+    """
+    Match a user message against the field currently being collected.
+
+    A reply counts as a confident match when it validates for the field and is
+    either a bare value for a strictly validated type (email, phone, custom with
+    regex), an "it's X" reply for such a type, or names the field explicitly
+    ("my name is X") for any type. Anything else goes to the LLM.
+
+    Values are checked by ``validator`` (the agent passes its own), so the fast
+    path applies the same length limit, latency budget and off-loop matching as
+    the attempt that is recorded afterwards.
+    """
+
+    def __init__(self, config: AgentConfig, validator: FieldValidator | None = None) -> None:
+        self._compiled = compile_config(config)
+        self._validator = validator if validator is not None else FieldValidator(config)
+        self._named_cues: dict[str, re.Pattern[str]] = {}
+        for f in self._compiled.fields:
+            labels = {f.name.replace("_", " ").lower(), *_TYPE_ALIASES.get(f.type, ())}
+            alternatives = "|".join(re.escape(label) for label in sorted(labels, key=len, reverse=True))
+            self._named_cues[f.name] = re.compile(
+                rf"^(?:(?:my|the|our)\s+)?(?:{alternatives})\s*(?:is|=|:)\s*(.+)$",
+                re.IGNORECASE,
+            )
+
+    def candidate(self, user_message: str, field: FieldConfig) -> str | None:
+        """The value the message would give for ``field`` if it is a fast-path reply (not yet validated)."""
+        text = user_message.strip()
+        named = self._named_cues.get(field.name)
+        m = named.match(text) if named is not None else None
+        if m is not None:
+            candidate = m.group(1)
+        elif not _is_strict(field):
+            return None
+        else:
+            generic = _GENERIC_CUE_RE.match(text)
+            candidate = generic.group(1) if generic else text
+        candidate = candidate.strip().rstrip(_TRAILING_PUNCT).strip()
+        return candidate or None
+
+    async def match(self, user_message: str, field: FieldConfig) -> str | None:
+        """Return the extracted value if the message confidently answers ``field``, else None."""
+        candidate = self.candidate(user_message, field)
+        if candidate is None:
+            return None
+        ok, _ = await self._validator.validate(field, candidate)
+        return candidate if ok else None
@@ -0,0 +1,168 @@
+"""Field validation for the turn loop: per-field latency metrics and off-loop custom regexes."""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import re
+import time
+from dataclasses import dataclass
+from multiprocessing.pool import Pool
+
+from konko_agent.config.compiled import compile_config
+from konko_agent.config.models import AgentConfig, FieldConfig
+from konko_agent.domain.validators import check_validation_regexes, validate_custom, validate_field
+
+# Off-loop matches within budget a field needs before its matches run inline.
+TRIAL_MATCHES = 3
+
+
+def _timed_validate_custom(
+    value: str, pattern: re.Pattern[str] | str, max_length: int
+) -> tuple[tuple[bool, str], float]:
+    """validate_custom plus its duration in seconds; runs in the worker process."""
+    start = time.perf_counter()
+    result = validate_custom(value, pattern, max_length)
+    return result, time.perf_counter() - start
+
+
+def _start_pool() -> Pool:
+    """A one-process pool whose worker is up and has imported this module, so start-up is not timed."""
+    pool = multiprocessing.get_context("spawn").Pool(1)
+    pool.apply(_timed_validate_custom, ("", None, 0))
+    return pool
+
+
+@dataclass
+class FieldValidationStats:
+    """Per-field validation counters. Times are in seconds, measured on the event loop."""
+
+    calls: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    over_budget: int = 0  # matches slower than validation_budget_ms
+    off_loop: int = 0  # matches run in the worker process
+    timeouts: int = 0  # off-loop matches abandoned after validation_timeout_ms
+
+    @property
+    def avg_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+
+
+class FieldValidator:
+    """
+    Validate extracted values against their FieldConfig.
+
+    Custom regexes are checked for super-linear constructs on construction, and values
+    longer than ``validation_max_length`` never reach them. As a last line of defence,
+    a custom field's matches run in a worker process until ``TRIAL_MATCHES`` of them
+    in a row have finished within ``validation_budget_ms``; only then do they run on
+    the event loop. ``re`` holds the GIL, so a thread would not keep the loop
+    responsive, while a process can be killed once ``validation_timeout_ms`` has
+    passed (the value then counts as invalid). A match over budget, in the worker or
+    inline, keeps the field in the worker for good.
+    """
+
+    def __init__(self, config: AgentConfig) -> None:
+        check_validation_regexes(config.fields)  # ValueError for super-linear patterns
+        self._compiled = compile_config(config)
+        self._max_length = config.validation_max_length
+        self._budget = config.validation_budget_ms / 1000
+        self._timeout = config.validation_timeout_ms / 1000
+        self._custom = {f.name for f in config.fields if f.type == "custom" and f.validation_regex}
+        self._proven: dict[str, int] = {}  # field -> off-loop matches within budget in a row
+        self._slow: set[str] = set()  # fields that went over budget
+        self._pool: Pool | None = None
+        self._pool_lock = asyncio.Lock()
+        self._last: tuple[str, str, tuple[bool, str]] | None = None  # (field, value, result)
+        self.stats: dict[str, FieldValidationStats] = {}
+
+    def is_off_loop(self, field_name: str) -> bool:
+        """True while ``field_name``'s custom regex is matched in the worker process."""
+        if field_name not in self._custom:
+            return False
+        return field_name in self._slow or self._proven.get(field_name, 0) < TRIAL_MATCHES
+
+    async def validate(self, field: FieldConfig, value: str) -> tuple[bool, str]:
+        """
+        Return (is_valid, error_message) for ``value``, recording latency for ``field``.
+        Asking again for the value just validated (the fast path's match, then the
+        attempt it records) reuses the result.
+        """
+        last = self._last
+        if last is not None and last[0] == field.name and last[1] == value:
+            return last[2]
+        stats = self.stats.get(field.name)
+        if stats is None:
+            stats = self.stats[field.name] = FieldValidationStats()
+        pattern = self._compiled.pattern(field)
+        start = time.perf_counter()
+        if field.type == "custom" and pattern and self.is_off_loop(field.name):
+            result = await self._validate_off_loop(field.name, stats, value, pattern)
+        else:
+            result = validate_field(value, field.type, pattern, self._max_length)
+            if field.type == "custom" and pattern and time.perf_counter() - start > self._budget:
+                stats.over_budget += 1
+                self._slow.add(field.name)
+        elapsed = time.perf_counter() - start
+        stats.calls += 1
+        stats.total_time += elapsed
+        stats.max_time = max(stats.max_time, elapsed)
+        self._last = (field.name, value, result)
+        return result
+
+    async def _validate_off_loop(
+        self, name: str, stats: FieldValidationStats, value: str, pattern: re.Pattern[str] | str
+    ) -> tuple[bool, str]:
+        if len(value.strip()) > self._max_length:
+            # Rejected before the regex runs; not worth a round trip (nor a trial).
+            return validate_custom(value, pattern, self._max_length)
+        stats.off_loop += 1
+        async with self._pool_lock:
+            pool = self._pool
+            if pool is None:
+                pool = self._pool = await asyncio.to_thread(_start_pool)
+        loop = asyncio.get_running_loop()
+        done: asyncio.Future[tuple[tuple[bool, str], float]] = loop.create_future()
+
+        def _resolve(result: object) -> None:
+            if not done.done():
+                done.set_result(result)
+
+        def _fail(exc: BaseException) -> None:
+            if not done.done():
+                done.set_exception(exc)
+
+        def _post(fn: object, arg: object) -> None:  # runs on the pool's result thread
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(fn, arg)
+
+        pool.apply_async(
+            _timed_validate_custom,
+            (value, pattern, self._max_length),
+            callback=lambda r: _post(_resolve, r),
+            error_callback=lambda e: _post(_fail, e),
+        )
+        try:
+            result, elapsed = await asyncio.wait_for(done, self._timeout)
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            self._slow.add(name)
+            # The worker is stuck in the match; kill it (a fresh one starts on next use).
+            # Other matches queued on it time out too.
+            if self._pool is pool:
+                self._pool = None
+            await asyncio.to_thread(pool.terminate)
+            return False, "Validation timed out."
+        if elapsed > self._budget:
+            stats.over_budget += 1
+            self._slow.add(name)
+        else:
+            self._proven[name] = self._proven.get(name, 0) + 1
+        return result
+
+    async def aclose(self) -> None:
+        """Stop the worker process, if one was started."""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            await asyncio.to_thread(pool.terminate)
@@ -1,9 +1,10 @@
-"""Build system prompt from config and current state."""
+"""Build system prompt from config and current state: static prefix first, state last."""
 
 from __future__ import annotations
 
 import json
 
+from konko_agent.config.compiled import compile_config
 from konko_agent.config.models import AgentConfig
 from konko_agent.domain.state import ConversationState
 
@@ -16,13 +17,12 @@ You must reply with a single JSON object (no markdown, no extra text) with exact
 - "extracted_value": string or null (for field_response/correction: the value the user provided)
 - "confidence": number 0.0-1.0
 - "field_name": string or null (which field this value is for, e.g. "email")
+- "extractions": list of {"field_name": string, "value": string, "confidence": number} for every field value the user gave in this message (use [] if none); include the value above too
 """
 
 
-def build_system_prompt(config: AgentConfig, state: ConversationState) -> str:
-    """
-    Assemble system prompt: personality, current field, collected fields, and JSON format.
-    """
+def _render_static(config: AgentConfig) -> str:
+    """Everything that depends only on config: personality, field list, rules, JSON format."""
     personality = config.personality
     parts = [
         f"You are {config.name}. Tone: {personality.tone}.",
@@ -47,28 +47,21 @@ def build_system_prompt(config: AgentConfig, state: ConversationState) -> str:
             "Fields to collect (in order):",
         ]
     )
-    for f in config.fields:
-        parts.append(f"  - {f.name} ({f.type}): {f.prompt}")
-    parts.append("")
-
-    if state.current_field:
-        parts.append(f"Current field you are collecting: {state.current_field}")
-        parts.append("")
-    parts.append("Already collected (do not ask again unless the user clearly corrects them):")
-    for name, fs in state.fields.items():
-        if fs.current_value:
-            parts.append(f"  - {name}: {fs.current_value}")
+    parts.extend(compile_config(config).field_lines)
     parts.append("")
 
     parts.append(
         "Conversation rules (follow these strictly):"
     )
     parts.append(
-        "- Always work on exactly one field at a time: the current_field shown above."
+        "- Always work on exactly one field at a time: the current_field shown at the end of this prompt."
     )
     parts.append(
         "- When you have a valid value for current_field, move on to the next field and do not ask for the old one again unless the user clearly corrects it."
     )
+    parts.append(
+        "- If the user gives values for several fields in one message, put each of them in extractions and do not ask for those fields again."
+    )
     parts.append(
         "- If the user replies with a short confirmation like 'yes', 'ok', 'that is right', or 'correct' just after you proposed a value, treat it as confirming that value for the current field. Do not re-ask; advance to the next field."
     )
@@ -85,10 +78,54 @@ def build_system_prompt(config: AgentConfig, state: ConversationState) -> str:
     )
     parts.append("")
     parts.append(TURN_JSON_SCHEMA.strip())
+    return "\n".join(parts)
 
+
+def _render_state(state: ConversationState) -> str:
+    """Per-turn suffix: current field and already collected values."""
+    parts = []
+    if state.current_field:
+        parts.append(f"Current field you are collecting: {state.current_field}")
+        parts.append("")
+    parts.append("Already collected (do not ask again unless the user clearly corrects them):")
+    for name, fs in state.fields.items():
+        value = fs.current_value
+        if value:
+            parts.append(f"  - {name}: {value}")
     return "\n".join(parts)
 
 
+class PromptTemplate:
+    """
+    System prompt compiled once per AgentConfig.
+
+    The static part is rendered at construction and kept byte-identical across
+    turns and sessions, so providers can reuse their prompt prefix cache; only
+    the short state suffix after it changes from turn to turn.
+    """
+
+    def __init__(self, config: AgentConfig) -> None:
+        self.static_prefix = _render_static(config) + "\n\n"
+
+    def render(self, state: ConversationState) -> str:
+        """Full system prompt for this turn: static prefix + current state."""
+        return self.static_prefix + _render_state(state)
+
+
+def compile_prompt_template(config: AgentConfig) -> PromptTemplate:
+    """Render the static part of the system prompt for config once."""
+    return PromptTemplate(config)
+
+
+def build_system_prompt(config: AgentConfig, state: ConversationState) -> str:
+    """
+    Assemble system prompt: personality, fields, rules and JSON format, then current field
+    and collected fields. Compiles the template each call; hot paths should keep a
+    PromptTemplate instead.
+    """
+    return compile_prompt_template(config).render(state)
+
+
 def build_user_message_for_turn(state: ConversationState) -> str:
     """Last user message for this turn (for LLM call)."""
     for m in reversed(state.messages):
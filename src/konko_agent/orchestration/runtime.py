@@ -2,37 +2,177 @@
 
 from __future__ import annotations
 
+import asyncio
+import weakref
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+
 from konko_agent.config.models import AgentConfig
-from konko_agent.orchestration.agent import ConversationAgent
+from konko_agent.domain.intent import ParseStats
+from konko_agent.infrastructure.message_archive import TranscriptPage
+from konko_agent.orchestration.agent import ConversationAgent, TurnStats
+from konko_agent.orchestration.field_validation import FieldValidationStats
+
+
+@dataclass
+class _Burst:
+    """User messages for one session that will be answered by a single merged turn."""
+
+    messages: list[str] = field(default_factory=list)
+    waiters: list[asyncio.Future[str]] = field(default_factory=list)
+    task: asyncio.Task[None] | None = None
+    started: bool = False  # the merged turn has entered the agent
 
 
 class AgentRuntime:
-    """Holds config + LLM client + state store; creates one ConversationAgent; routes by session_id."""
+    """
+    Holds config + LLM client + state store; creates one ConversationAgent; routes by session_id.
+    Turns for one session run one at a time, in arrival order; different sessions run in parallel.
+
+    With ``coalesce_window`` > 0, handle_message waits that long for more messages
+    on the same session and answers them all with one turn (messages joined by
+    newlines); every caller gets the merged turn's reply. A message arriving while
+    that turn is still queued or waiting on the LLM cancels it and restarts the
+    window with the larger burst.
+    """
 
     def __init__(
         self,
         config: AgentConfig,
         llm_client: object,
         state_store: object,
+        *,
+        coalesce_window: float = 0.0,
+        archive: object | None = None,  # MessageArchive protocol
     ) -> None:
         self.config = config
-        self._agent = ConversationAgent(config, llm_client, state_store)
+        self._coalesce_window = coalesce_window
+        self._bursts: dict[str, _Burst] = {}
+        self._llm = llm_client
+        self._store = state_store
+        self._agent = ConversationAgent(config, llm_client, state_store, archive=archive)
+        # One lock per session with a turn queued or running; dropped once nobody holds it.
+        self._session_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
+
+    def _session_lock(self, session_id: str) -> asyncio.Lock:
+        lock = self._session_locks.get(session_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._session_locks[session_id] = lock
+        return lock
 
     async def start_session(self, session_id: str) -> str:
         """
         Start a new session and return the greeting message.
         If the session already exists, returns the configured greeting.
         """
-        return await self._agent.start_session(session_id)
+        async with self._session_lock(session_id):
+            return await self._agent.start_session(session_id)
 
     async def handle_message(self, session_id: str, user_message: str) -> str:
         """Route message to agent; return assistant reply. Sessions are isolated by session_id."""
-        return await self._agent.handle_message(session_id, user_message)
+        if self._coalesce_window <= 0:
+            async with self._session_lock(session_id):
+                return await self._agent.handle_message(session_id, user_message)
+
+        burst = self._bursts.get(session_id)
+        if burst is not None and burst.started and not self._agent.awaiting_llm(session_id):
+            burst = None  # too late to merge: that turn is being persisted
+        if burst is None:
+            burst = self._bursts[session_id] = _Burst()
+        else:
+            self._agent.stats.coalesced_messages += 1
+            self._agent.stats.superseded_turns += 1
+            burst.task.cancel()
+            burst.started = False
+        burst.messages.append(user_message)
+        waiter: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        burst.waiters.append(waiter)
+        burst.task = asyncio.create_task(self._run_burst(session_id, burst))
+        return await waiter
+
+    async def _run_burst(self, session_id: str, burst: _Burst) -> None:
+        """Debounce, then answer the whole burst with one turn (cancelled if superseded)."""
+        await asyncio.sleep(self._coalesce_window)
+        try:
+            async with self._session_lock(session_id):
+                burst.started = True
+                reply = await self._agent.handle_message(session_id, "\n".join(burst.messages))
+        except Exception as exc:
+            self._end_burst(session_id, burst)
+            for waiter in burst.waiters:
+                if not waiter.done():
+                    waiter.set_exception(exc)
+            return
+        self._end_burst(session_id, burst)
+        for waiter in burst.waiters:
+            if not waiter.done():
+                waiter.set_result(reply)
+
+    def _end_burst(self, session_id: str, burst: _Burst) -> None:
+        if self._bursts.get(session_id) is burst:
+            del self._bursts[session_id]
+
+    async def handle_message_stream(self, session_id: str, user_message: str) -> AsyncIterator[str]:
+        """
+        Route message to agent and yield the reply incrementally as it streams.
+        The session stays locked until the stream is consumed or closed.
+        """
+        async with self._session_lock(session_id):
+            async for delta in self._agent.handle_message_stream(session_id, user_message):
+                yield delta
 
     async def get_state(self, session_id: str):
         """Get current conversation state for session (or None)."""
         return await self._agent.get_state(session_id)
 
+    async def get_transcript(self, session_id: str, offset: int = 0, limit: int = 50) -> TranscriptPage | None:
+        """A page of the session's full message history, including archived messages (or None)."""
+        async with self._session_lock(session_id):
+            return await self._agent.get_transcript(session_id, offset, limit)
+
+    @property
+    def stats(self) -> TurnStats:
+        """Turn counters (LLM vs fast-path turns) for this runtime's agent."""
+        return self._agent.stats
+
+    @property
+    def parse_stats(self) -> ParseStats:
+        """LLM replies parsed as received, repaired locally, or unusable."""
+        return self._agent.parse_stats
+
+    @property
+    def validation_stats(self) -> dict[str, FieldValidationStats]:
+        """Per-field validation latency, off-loop and timeout counters."""
+        return self._agent.validation_stats
+
     def get_greeting(self) -> str:
         """Initial greeting for new sessions (from config)."""
         return self.config.personality.greeting
+
+    async def warmup(self, connections: int = 1) -> None:
+        """Pre-open LLM connections if the client supports it (e.g. KonkoLLMClient)."""
+        warmup = getattr(self._llm, "warmup", None)
+        if warmup is not None:
+            await warmup(connections)
+
+    async def aclose(self) -> None:
+        """Release pooled resources held by the agent, LLM client and state store."""
+        for burst in list(self._bursts.values()):
+            if burst.task is not None:
+                burst.task.cancel()
+            for waiter in burst.waiters:
+                waiter.cancel()
+        self._bursts.clear()
+        await self._agent.aclose()
+        for resource in (self._llm, self._store):
+            aclose = getattr(resource, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    async def __aenter__(self) -> AgentRuntime:
+        await self.warmup()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
@@ -0,0 +1,109 @@
+"""Incremental extraction of ``response_text`` from a streaming TurnAnalysis JSON reply."""
+
+from __future__ import annotations
+
+import re
+
+_KEY_RE = re.compile(r'"response_text"\s*:\s*"')
+
+_HEX = frozenset("0123456789abcdefABCDEF")
+
+_SIMPLE_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+
+
+class ResponseTextStreamer:
+    """
+    Feed raw completion chunks; get back newly decoded ``response_text`` characters.
+
+    Scans for the ``"response_text": "`` key, then decodes the JSON string value
+    as it arrives (escapes and surrogate pairs included), holding back any
+    escape sequence that is split across chunks. The full reply is still parsed
+    normally once the stream ends; this only drives live display.
+    """
+
+    def __init__(self) -> None:
+        self._buf = ""
+        self._pos = 0  # next unread index in _buf
+        self._in_value = False
+        self.done = False
+        self.text = ""
+
+    def feed(self, chunk: str) -> str:
+        """Append a raw chunk and return the response_text delta it completed (may be empty)."""
+        if self.done:
+            return ""
+        self._buf += chunk
+        if not self._in_value:
+            m = _KEY_RE.search(self._buf, max(0, self._pos - 32))
+            if m is None:
+                # Keep a tail in case the key is split across chunks.
+                self._pos = len(self._buf)
+                return ""
+            self._in_value = True
+            self._pos = m.end()
+        out = self._decode()
+        self.text += out
+        return out
+
+    def _decode(self) -> str:
+        buf, i, n = self._buf, self._pos, len(self._buf)
+        out: list[str] = []
+        while i < n:
+            c = buf[i]
+            if c == '"':
+                self.done = True
+                i += 1
+                break
+            if c != "\\":
+                j = i
+                while j < n and buf[j] not in '"\\':
+                    j += 1
+                out.append(buf[i:j])
+                i = j
+                continue
+            if i + 1 >= n:
+                break
+            esc = buf[i + 1]
+            if esc in _SIMPLE_ESCAPES:
+                out.append(_SIMPLE_ESCAPES[esc])
+                i += 2
+                continue
+            if esc != "u":
+                # Invalid escape: pass it through rather than stall the stream.
+                out.append(esc)
+                i += 2
+                continue
+            if i + 6 > n:
+                break
+            if not _is_hex(buf[i + 2 : i + 6]):
+                out.append(buf[i + 2 : i + 6])
+                i += 6
+                continue
+            code = int(buf[i + 2 : i + 6], 16)
+            if 0xD800 <= code < 0xDC00:
+                # High surrogate: wait for the low half before emitting.
+                if i + 12 > n:
+                    break
+                if buf[i + 6 : i + 8] == "\\u":
+                    low = int(buf[i + 8 : i + 12], 16) if _is_hex(buf[i + 8 : i + 12]) else 0
+                    if 0xDC00 <= low < 0xE000:
+                        out.append(chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)))
+                        i += 12
+                        continue
+            out.append(chr(code))
+            i += 6
+        self._pos = i
+        return "".join(out)
+
+
+def _is_hex(s: str) -> bool:
+    return len(s) == 4 and all(c in _HEX for c in s)
@@ -0,0 +1,50 @@
+"""Compiled config: indexed lookups, precompiled patterns, caching."""
+
+from __future__ import annotations
+
+import re
+
+from konko_agent.config.compiled import CompiledAgentConfig, compile_config
+from konko_agent.config.models import AgentConfig, EscalationPolicy, FieldConfig, PersonalityConfig
+from konko_agent.domain.validators import validate_field
+
+
+def _config() -> AgentConfig:
+    return AgentConfig(
+        fields=[
+            FieldConfig(name="email", type="email", prompt="Your email?"),
+            FieldConfig(name="code", type="custom", prompt="Code?", validation_regex=r"[A-Z]{3}\d+$"),
+            FieldConfig(name="notes", type="custom", prompt="Notes?", required=False, validation_regex=r"\w+"),
+        ],
+        personality=PersonalityConfig(greeting="Hi"),
+        escalation=EscalationPolicy(trigger_phrases=["Speak  to a HUMAN", " "]),
+    )
+
+
+def test_compiled_lookups() -> None:
+    config = _config()
+    compiled = CompiledAgentConfig(config)
+    assert compiled.config is config
+    assert compiled.order == ("email", "code", "notes")
+    assert compiled.position["notes"] == 2
+    assert compiled.field("code") is config.fields[1]
+    assert compiled.field("missing") is None and compiled.field(None) is None
+    assert compiled.required_names == ("email", "code")
+    assert compiled.trigger_phrases == ("speak to a human",)
+    assert compiled.field_lines[0] == "  - email (email): Your email?"
+
+
+def test_compiled_patterns_validate_like_source() -> None:
+    config = _config()
+    compiled = compile_config(config)
+    code = config.fields[1]
+    assert isinstance(compiled.pattern(code), re.Pattern)
+    assert compiled.pattern(config.fields[0]) is None
+    assert validate_field("ABC123", "custom", compiled.pattern(code)) == (True, "")
+    assert validate_field("abc", "custom", compiled.pattern(code)) == validate_field("abc", "custom", code.validation_regex)
+
+
+def test_compile_config_is_cached_per_config() -> None:
+    config = _config()
+    assert compile_config(config) is compile_config(config)
+    assert compile_config(_config()) is not compile_config(config)
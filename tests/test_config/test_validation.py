@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import subprocess
+import sys
 import tempfile
 from pathlib import Path
 
@@ -77,6 +79,15 @@ def test_load_invalid_field_type_raises() -> None:
         Path(path).unlink(missing_ok=True)
 
 
+def test_config_models_do_not_import_the_domain() -> None:
+    """The domain builds on the config models, never the other way round."""
+    code = (
+        "import sys, konko_agent.config.models; "
+        "sys.exit(any(m.startswith('konko_agent.domain') for m in sys.modules))"
+    )
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
+
+
 def test_agent_config_static_models() -> None:
     """Static Pydantic models validate correctly."""
     config = AgentConfig(
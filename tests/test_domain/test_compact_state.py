@@ -0,0 +1,94 @@
+"""Compact state: lossless conversion to/from the pydantic models, compact deltas."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from konko_agent.domain.compact_state import (
+    MessageRecord,
+    apply_delta_to_compact,
+    compact_delta_since,
+    compact_from_model,
+    compact_to_model,
+    new_attempt,
+    rollback_compact,
+)
+from konko_agent.domain.state import (
+    ConversationState,
+    EscalationState,
+    FieldAttempt,
+    delta_since,
+    mark_state,
+)
+
+
+def test_round_trip_is_lossless(sample_state: ConversationState) -> None:
+    sample_state.fields["email"].attempts.append(
+        FieldAttempt(
+            value="alice@example.com",
+            timestamp=datetime(2024, 5, 1, 12, 30, 15, 123456),
+            confidence=0.8,
+            validation_status="valid",
+            source="corrected",
+        )
+    )
+    sample_state.escalation = EscalationState(reason="user_request")
+    compact = compact_from_model(sample_state)
+    assert compact.fields["email"].current_value == "alice@example.com"
+    assert compact.fields["name"].is_collected is False
+    back = compact_to_model(compact)
+    assert back == sample_state
+    assert ConversationState.model_validate_json(back.model_dump_json()) == sample_state
+
+
+def test_compact_delta_matches_model_delta(sample_state: ConversationState) -> None:
+    compact = compact_from_model(sample_state)
+    mark = mark_state(compact)
+    compact.messages.append(MessageRecord("user", "Alice"))
+    compact.add_attempt("name", new_attempt("Alice", 0.9, "valid"))
+    compact.phase = "completed"
+    delta = compact_delta_since(compact, mark)
+
+    expected = compact_to_model(compact)
+    assert delta == delta_since(expected, mark_state(sample_state))
+
+    delta.apply_to(sample_state)
+    assert sample_state == expected
+
+    stale = compact_from_model(compact_to_model(compact))
+    apply_delta_to_compact(stale, delta)  # already contains the delta: no-op
+    assert compact_to_model(stale) == expected
+
+    rollback_compact(compact, mark)
+    assert len(compact.messages) == 2
+    assert compact.fields["name"].attempts == []
+
+
+def test_derived_index_tracks_attempts(sample_state: ConversationState) -> None:
+    compact = compact_from_model(sample_state)
+    order = ("name", "email", "phone")
+    required = ("name", "email")
+    index = compact.bind_index(order, order, required)
+    assert compact.index_for(order) is index
+    assert (index.next_field, index.missing_required) == ("name", 2)
+
+    mark = mark_state(compact)
+    compact.add_attempt("email", new_attempt("a@b.co", 0.9, "valid"))
+    assert (index.next_field, index.missing_required) == ("name", 1)
+    compact.add_attempt("name", new_attempt("x", 0.4, "invalid"))
+    assert index.next_field == "name" and not compact.fields["name"].is_collected
+    compact.add_attempt("name", new_attempt("Alice", 0.9, "valid"))
+    compact.add_attempt("name", new_attempt("Al", 0.2, "invalid"))
+    assert compact.fields["name"].current_value == "Alice"
+    assert (index.next_field, index.missing_required) == ("phone", 0)
+
+    rollback_compact(compact, mark)
+    assert (index.next_field, index.missing_required) == ("name", 2)
+    assert index.collected == 0
+
+    compact.add_attempt("name", new_attempt("Bob", 0.9, "valid"))
+    delta = compact_delta_since(compact, mark)
+    stale = compact_from_model(sample_state)
+    stale_index = stale.bind_index(order, order, required)
+    apply_delta_to_compact(stale, delta)
+    assert (stale_index.next_field, stale_index.missing_required) == ("email", 1)
@@ -7,7 +7,11 @@ from datetime import datetime
 import pytest
 
 from konko_agent.config.models import AgentConfig, EscalationPolicy, FieldConfig, PersonalityConfig
-from konko_agent.domain.escalation import evaluate_escalation
+from konko_agent.domain.escalation import (
+    TriggerMatcher,
+    compile_trigger_matcher,
+    evaluate_escalation,
+)
 from konko_agent.domain.state import ConversationState, FieldState, FieldAttempt
 
 
@@ -94,3 +98,30 @@ def test_escalation_uses_configured_reason() -> None:
     result = evaluate_escalation(state, config, "ok")
     assert result is not None
     assert result.reason == custom_reason
+
+
+def test_trigger_matcher_normalizes_unicode_and_whitespace() -> None:
+    matcher = TriggerMatcher(["Speak to  a Human", "agent"])
+    assert matcher.search("I want to SPEAK to a\n human now") == "speak to a human"
+    assert matcher.search("ｓｐｅａｋ ｔｏ ａ ｈｕｍａｎ") == "speak to a human"  # fullwidth (NFKC)
+    assert matcher.search("reagents") == "agent"  # substring semantics, as before
+    assert matcher.search("no thanks") is None
+
+
+def test_trigger_matcher_handles_overlapping_and_many_phrases() -> None:
+    phrases = [f"code {i:04d}" for i in range(5000)] + ["she", "he", "hers"]
+    matcher = TriggerMatcher(phrases)
+    assert matcher.search("ushers") == "she"
+    assert matcher.search("this is code 4999!") == "code 4999"
+    assert matcher.search("code 5000") is None
+    assert not TriggerMatcher(["", "   "])
+
+
+def test_evaluate_escalation_uses_precompiled_matcher() -> None:
+    config = _config(trigger_phrases=["speak to human"])
+    state = _state_with_collected()
+    state.fields["name"].attempts.clear()
+    matcher = compile_trigger_matcher(config.escalation)
+    result = evaluate_escalation(state, config, "let me speak to   human", matcher)
+    assert result is not None
+    assert result.reason == "user_request"
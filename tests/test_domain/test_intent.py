@@ -0,0 +1,105 @@
+"""TurnAnalysis parsing: strict schema, local repair of fenced/wrapped/truncated replies, stats."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from konko_agent.domain.intent import (
+    TRUNCATED_CONFIDENCE,
+    Intent,
+    ParseStats,
+    parse_turn_analysis,
+    repair_json,
+    turn_response_format,
+)
+
+REPLY = {
+    "intent": "field_response",
+    "response_text": "Thanks! And your name?",
+    "extracted_value": "alice@example.com",
+    "confidence": 0.9,
+    "field_name": "email",
+    "extractions": [{"field_name": "email", "value": "alice@example.com", "confidence": 0.9}],
+}
+
+
+def test_response_format_is_a_strict_schema() -> None:
+    fmt = turn_response_format()
+    assert fmt["type"] == "json_schema" and fmt["json_schema"]["strict"] is True
+    schema = fmt["json_schema"]["schema"]
+    objects = [schema, *schema["$defs"].values()]
+    for obj in (o for o in objects if "properties" in o):
+        assert obj["additionalProperties"] is False
+        assert obj["required"] == list(obj["properties"])
+    assert "default" not in json.dumps(fmt)
+    # A reply shaped by the schema (every key present) parses as is.
+    stats = ParseStats()
+    assert parse_turn_analysis(json.dumps(REPLY), stats).extracted_value == "alice@example.com"
+    assert stats == ParseStats(parsed=1)
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "```json\n" + json.dumps(REPLY) + "\n```",
+        "Here you go: " + json.dumps(REPLY) + " Let me know!",
+        "```\n" + json.dumps(REPLY),  # unterminated fence
+    ],
+)
+def test_wrapped_replies_are_used_as_is(raw: str) -> None:
+    stats = ParseStats()
+    analysis = parse_turn_analysis(raw, stats)
+    assert analysis.intent == Intent.FIELD_RESPONSE and analysis.confidence == 0.9
+    assert stats.failed == 0
+
+
+def test_truncated_replies_keep_only_whole_values() -> None:
+    text = json.dumps(REPLY)
+    outcomes = ParseStats()
+    for cut in range(1, len(text) - 1):
+        stats = ParseStats()
+        analysis = parse_turn_analysis(text[:cut], stats)
+        outcomes.repaired += stats.repaired
+        outcomes.failed += stats.failed
+        if stats.failed:
+            assert analysis.intent == Intent.OFF_TOPIC and "{" not in analysis.response_text
+            continue
+        # Never a partial string taken as data or shown to the user.
+        assert analysis.response_text == REPLY["response_text"]
+        assert analysis.extracted_value in (None, REPLY["extracted_value"])
+        assert all(e.value == "alice@example.com" for e in analysis.extractions)
+        assert analysis.confidence <= TRUNCATED_CONFIDENCE
+    assert outcomes.repaired > 100 and outcomes.failed > 0
+
+
+@pytest.mark.parametrize(
+    ("raw", "response_text"),
+    [
+        (
+            '{"intent":"field_response","field_name":"name","response_text":"Thanks!",'
+            '"extracted_value":"Jonathan Smi',
+            "Thanks!",
+        ),
+        ('{"intent":"field_response","response_text":"Thanks Jonathan, what is y', None),
+    ],
+)
+def test_strings_cut_off_midway_are_dropped(raw: str, response_text: str | None) -> None:
+    stats = ParseStats()
+    analysis = parse_turn_analysis(raw, stats)
+    if response_text is None:
+        assert stats.failed == 1 and analysis.response_text == "I didn't understand. Could you rephrase?"
+    else:
+        assert stats.repaired == 1 and analysis.response_text == response_text
+    assert analysis.extracted_value is None
+
+
+def test_unusable_replies_never_show_json_to_the_user() -> None:
+    stats = ParseStats()
+    assert parse_turn_analysis('{"intent": "field_re', stats).response_text == "I didn't understand. Could you rephrase?"
+    assert parse_turn_analysis("Sorry, could you say that again?", stats).response_text == (
+        "Sorry, could you say that again?"
+    )
+    assert stats == ParseStats(failed=2)
+    assert repair_json("no json here").candidates == []
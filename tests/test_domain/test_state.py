@@ -1,4 +1,4 @@
-"""Domain state: FieldState current_value, is_collected."""
+"""Domain state: FieldState current_value, is_collected; per-turn deltas."""
 
 from __future__ import annotations
 
@@ -6,7 +6,14 @@ from datetime import datetime
 
 import pytest
 
-from konko_agent.domain.state import FieldAttempt, FieldState
+from konko_agent.domain.state import (
+    ConversationState,
+    FieldAttempt,
+    FieldState,
+    Message,
+    delta_since,
+    mark_state,
+)
 
 
 def test_field_state_empty_not_collected() -> None:
@@ -43,3 +50,53 @@ def test_field_state_last_valid_is_current_value() -> None:
     )
     assert fs.current_value == "new@y.com"
     assert fs.is_collected is True
+
+
+def test_delta_since_mark_carries_only_appended_items(sample_state: ConversationState) -> None:
+    before = sample_state.model_copy(deep=True)
+    mark = mark_state(sample_state)
+    sample_state.messages.append(Message(role="user", content="Alice"))
+    sample_state.fields["name"].attempts.append(
+        FieldAttempt(value="Alice", confidence=0.9, validation_status="valid")
+    )
+    sample_state.phase = "escalated"
+    sample_state.current_field = None
+
+    delta = delta_since(sample_state, mark)
+    assert delta.message_offset == 2
+    assert [m.content for m in delta.messages] == ["Alice"]
+    assert list(delta.fields) == ["name"]
+
+    delta.apply_to(before)
+    assert before == sample_state
+
+
+def test_delta_apply_is_idempotent(sample_state: ConversationState) -> None:
+    mark = mark_state(sample_state)
+    sample_state.messages.append(Message(role="user", content="hi"))
+    sample_state.fields["phone"] = FieldState(field_name="phone")
+    delta = delta_since(sample_state, mark)
+    assert delta.fields["phone"].offset == 0
+
+    expected = sample_state.model_copy(deep=True)
+    delta.apply_to(sample_state)
+    delta.apply_to(sample_state)
+    assert sample_state == expected
+
+
+def test_deltas_use_absolute_positions_across_the_archive_boundary(sample_state: ConversationState) -> None:
+    sample_state.archived_messages = 10  # messages[0] is message number 10
+    stale = sample_state.model_copy(deep=True)
+    mark = mark_state(sample_state)
+    assert mark.messages == 12
+    sample_state.messages.append(Message(role="user", content="hi"))
+    # Archive everything but the newest message.
+    del sample_state.messages[:2]
+    sample_state.archived_messages = 12
+
+    delta = delta_since(sample_state, mark)
+    assert (delta.message_offset, delta.archived_messages) == (12, 12)
+    delta.apply_to(stale)
+    assert stale == sample_state
+    delta.apply_to(stale)  # replay is a no-op
+    assert stale == sample_state
@@ -0,0 +1,132 @@
+"""Binary state codec: lossless round trips, both state forms, compression, versioning."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from konko_agent.domain.compact_state import compact_from_model, compact_to_model
+from konko_agent.domain.state import ConversationState, EscalationState, FieldAttempt, FieldState, Message
+from konko_agent.domain.state_codec import (
+    CodecError,
+    decode_compact,
+    decode_state,
+    encode_state,
+)
+
+
+@pytest.fixture
+def state(sample_state: ConversationState) -> ConversationState:
+    sample_state.messages.append(Message(role="system", content="ünïcödé ✓"))
+    sample_state.messages.append(Message(role="moderator", content=""))  # not an interned role
+    sample_state.fields["email"].attempts += [
+        FieldAttempt(
+            value="alice@example",
+            timestamp=datetime(2024, 5, 1, 12, 30, 15, 123456),
+            confidence=0.25,
+            validation_status="invalid",
+        ),
+        FieldAttempt(
+            value="alice@example.com",
+            timestamp=datetime(1969, 12, 31, 23, 59, 59, 999999),
+            confidence=1.0,
+            validation_status="valid",
+            source="imported",
+        ),
+    ]
+    sample_state.current_field = None
+    sample_state.archived_messages = 40
+    sample_state.escalation = EscalationState(reason="user_request", fields={"email": "alice@example.com"})
+    return sample_state
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_round_trip_is_lossless(state: ConversationState, compress: bool) -> None:
+    data = encode_state(state, compress=compress)
+    assert decode_state(data) == state
+    assert decode_state(memoryview(bytearray(data))) == state
+    assert compact_to_model(decode_compact(data)) == state
+    # Encoding the compact form gives the same bytes.
+    assert encode_state(compact_from_model(state), compress=compress) == data
+
+
+def test_compact_decode_keeps_derived_facts(state: ConversationState) -> None:
+    compact = decode_compact(encode_state(state))
+    assert compact.fields["email"].current_value == "alice@example.com"
+    assert not compact.fields["name"].is_collected
+
+
+def test_long_histories_are_compressed(state: ConversationState) -> None:
+    state.messages += [Message(role="user", content="hello there, my email is below")] * 200
+    plain = encode_state(state, compress=False)
+    auto = encode_state(state)
+    assert len(auto) < len(plain) // 5
+    assert decode_state(auto) == state
+    assert len(plain) < len(state.model_dump_json())
+
+
+def test_rejects_foreign_truncated_and_future_payloads(state: ConversationState) -> None:
+    data = encode_state(state)
+    with pytest.raises(CodecError, match="not a state"):
+        decode_state(b"{}" + data[2:])
+    with pytest.raises(CodecError, match="version"):
+        decode_state(data[:2] + bytes([99]) + data[3:])
+    with pytest.raises(CodecError):
+        decode_state(data[: len(data) // 2])
+    with pytest.raises(CodecError):
+        decode_state(b"K")
+
+
+def _v1_fixture_state() -> ConversationState:
+    """The state encoded into data/state_v1*.bin by the version-1 encoder."""
+    return ConversationState(
+        session_id="v1-fixture",
+        phase="escalated",
+        messages=[
+            Message(role="assistant", content="Hi! What's your email?"),
+            Message(role="user", content="alice@example.com ✓"),
+            Message(role="moderator", content=""),
+        ]
+        + [Message(role="user", content=f"padding message {i} " * 8) for i in range(12)],
+        fields={
+            "email": FieldState(
+                field_name="email",
+                attempts=[
+                    FieldAttempt(
+                        value="alice@example",
+                        timestamp=datetime(2024, 5, 1, 12, 30, 15, 123456),
+                        confidence=0.25,
+                        validation_status="invalid",
+                    ),
+                    FieldAttempt(
+                        value="alice@example.com",
+                        timestamp=datetime(2024, 5, 1, 12, 31, 0),
+                        confidence=1.0,
+                        validation_status="valid",
+                        source="corrected",
+                    ),
+                ],
+            ),
+            "name": FieldState(field_name="name"),
+        },
+        current_field=None,
+        escalation=EscalationState(reason="user_request", fields={"email": "alice@example.com"}),
+    )
+
+
+@pytest.mark.parametrize("name", ["state_v1.bin", "state_v1_zlib.bin"])
+def test_version_1_payloads_still_decode(name: str) -> None:
+    data = (Path(__file__).parent / "data" / name).read_bytes()
+    assert data[2] == 1  # written by the version-1 encoder
+    expected = _v1_fixture_state()
+    state = decode_state(data)
+    assert state == expected and state.archived_messages == 0
+    compact = decode_compact(data)
+    assert compact_to_model(compact) == expected
+    assert compact.archived_messages == 0
+    assert compact.fields["email"].current_value == "alice@example.com"
+    # Re-encoding migrates to the current version.
+    assert decode_state(encode_state(state)) == expected
+
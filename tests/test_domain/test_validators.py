@@ -4,7 +4,14 @@ from __future__ import annotations
 
 import pytest
 
+from konko_agent.config.models import AgentConfig
 from konko_agent.domain.validators import (
+    MAX_CUSTOM_VALUE_LENGTH,
+    error_message,
+    validate_batch,
+    validate_columns,
+    check_regex_safety,
+    compile_validation_regex,
     validate_email,
     validate_phone,
     validate_name,
@@ -64,3 +71,90 @@ def test_validate_field_dispatches() -> None:
     assert ok is True
     ok2, _ = validate_field("alice@example.com", "phone")
     assert ok2 is False
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        r"(a+)+$",
+        r"^(\w+\s?)*$",
+        r"((ab)*)*",
+        r"(a|a)*b",
+        r"^([a-z]x?|[a-c])*$",
+        r"^(\d{3}|\d)+$",
+        r"(ab|a)*c",
+        # Adjacent repeats over overlapping characters, within or across iterations.
+        r"^(x+x+)+y$",
+        r"^(\w+\d+)+$",
+        r"^(\d+\w+)+$",
+        r"^([a-z0-9]+[0-9]+)+$",
+        r"^((x+)(?:x+))+y$",
+        r"^(x+z*x+)+y$",
+        r"^(x+yx+)+$",
+        r"(?i)^([a-z]+[A-Z]+)+$",
+    ],
+)
+def test_superlinear_regex_is_rejected(pattern: str) -> None:
+    assert check_regex_safety(pattern) is not None
+    with pytest.raises(ValueError, match="Unsafe"):
+        compile_validation_regex(pattern)
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        r"^[A-Z]{3}\d+$",
+        r"^([a-z]+\.)+[a-z]+$",
+        r"^\d{5}(-\d{4})?$",
+        r"(?:a+)++",
+        r"^(ab|cd)+$",
+        r"^([a-z]|[a-c])*$",
+        r"^([a-z]+[0-9]+)+$",
+        r"^(\w+\s+)+$",
+        r"^x*x*y$",  # polynomial only: no enclosing repeat
+    ],
+)
+def test_linear_regex_is_accepted(pattern: str) -> None:
+    assert check_regex_safety(pattern) is None
+    assert compile_validation_regex(pattern).pattern == pattern
+
+
+def test_invalid_regex_is_rejected() -> None:
+    with pytest.raises(ValueError, match="Invalid"):
+        compile_validation_regex("([")
+
+
+def test_validate_custom_caps_input_length() -> None:
+    assert validate_custom("A" * 20, r"^A+$", max_length=20) == (True, "")
+    assert validate_custom("A" * 21, r"^A+$", max_length=20) == (False, "Value is too long.")
+    # The config repeats the default rather than importing the domain.
+    assert AgentConfig.model_fields["validation_max_length"].default == MAX_CUSTOM_VALUE_LENGTH
+    assert validate_custom("A" * 500, None)[0] is True  # no regex, nothing to bound
+
+
+@pytest.mark.parametrize(
+    ("field_type", "regex", "values"),
+    [
+        ("email", None, ["a@b.co", " a@b.co ", "", "nope", "a@b.co"]),
+        ("phone", None, ["+1 (555) 123-4567", "555", "5551234567x", "   ", "5551234567"]),
+        ("name", None, ["Alice", "R2-D2!", "", "O'Brien"]),
+        ("address", None, ["1 Main St", "abc", ""]),
+        ("custom", r"^[A-Z]+\d+$", ["ABC123", "abc", "", "X" * 300]),
+        ("custom", "([", ["x"]),
+        ("custom", None, ["anything", ""]),
+    ],
+)
+def test_validate_batch_matches_validate_field(field_type: str, regex: str | None, values: list[str]) -> None:
+    result = validate_batch(values, field_type, regex)
+    for value, ok, code in zip(values, result.ok, result.codes):
+        assert (ok, error_message(field_type, code)) == validate_field(value, field_type, regex)
+
+
+def test_validate_columns_fills_missing_columns() -> None:
+    class Spec:
+        def __init__(self, name: str, type: str) -> None:
+            self.name, self.type, self.validation_regex = name, type, None
+
+    results = validate_columns({"email": ["a@b.co", "x"]}, [Spec("email", "email"), Spec("name", "name")])
+    assert results["email"].ok == [True, False]
+    assert results["name"].codes == ["required", "required"]
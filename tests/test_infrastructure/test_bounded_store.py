@@ -0,0 +1,96 @@
+"""BoundedInMemoryStateStore: LRU/idle/byte eviction, finished-session spill, fault-in."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from konko_agent.config.models import AgentConfig
+from konko_agent.domain.state import ConversationState, Message
+from konko_agent.infrastructure.bounded_store import BoundedInMemoryStateStore
+from konko_agent.infrastructure.llm_client import MockLLMClient
+from konko_agent.infrastructure.sqlite_store import SQLiteStateStore
+from konko_agent.infrastructure.state_store import InMemoryStateStore
+from konko_agent.orchestration.runtime import AgentRuntime
+
+
+def _copy(state: ConversationState, session_id: str, phase: str = "collecting") -> ConversationState:
+    return state.model_copy(deep=True, update={"session_id": session_id, "phase": phase})
+
+
+def test_lru_eviction_and_fault_in(sample_state: ConversationState) -> None:
+    async def run() -> None:
+        spill = InMemoryStateStore()
+        store = BoundedInMemoryStateStore(spill, max_sessions=2)
+        for sid in ("a", "b", "c"):
+            await store.set(sid, _copy(sample_state, sid))
+        assert len(store) == 2
+        assert store.stats.evictions == 1
+        assert await spill.get("a") is not None
+
+        assert (await store.get("a")).session_id == "a"
+        assert store.stats.fault_ins == 1
+        assert await store.get("missing") is None
+        # "b" was least recently used when "a" came back.
+        assert set(store._resident) == {"c", "a"}
+
+        # A faulted-in, unmodified session ("a") is dropped without rewriting it.
+        await store.get("b")  # evicts "c", never spilled before
+        writes = store.stats.spill_writes
+        await store.get("c")  # evicts "a"
+        assert store.stats.spill_writes == writes
+
+    asyncio.run(run())
+
+
+def test_idle_ttl_and_byte_cap(sample_state: ConversationState) -> None:
+    async def run() -> None:
+        now = [0.0]
+        store = BoundedInMemoryStateStore(InMemoryStateStore(), idle_ttl=60, clock=lambda: now[0])
+        await store.set("a", _copy(sample_state, "a"))
+        now[0] = 30.0
+        await store.set("b", _copy(sample_state, "b"))
+        now[0] = 61.0
+        await store.get("b")
+        assert store.stats.idle_evictions == 1
+        assert list(store._resident) == ["b"]
+
+        store = BoundedInMemoryStateStore(InMemoryStateStore(), max_bytes=5000)
+        big = _copy(sample_state, "big")
+        big.messages.append(Message(role="user", content="x" * 4000))
+        await store.set("big", big)
+        await store.set("small", _copy(sample_state, "small"))
+        assert list(store._resident) == ["small"]
+        assert store.stats.resident_bytes <= 5000
+
+    asyncio.run(run())
+
+
+def test_finished_sessions_are_released(sample_state: ConversationState) -> None:
+    async def run() -> None:
+        spill = InMemoryStateStore()
+        store = BoundedInMemoryStateStore(spill)
+        await store.set("done", _copy(sample_state, "done", phase="completed"))
+        assert len(store) == 0
+        assert store.stats.finished_spills == 1
+        assert (await store.get("done")).phase == "completed"
+
+    asyncio.run(run())
+
+
+def test_turns_survive_eviction_through_runtime(tmp_path: Path, minimal_config: AgentConfig) -> None:
+    async def run() -> None:
+        reply = '{"intent": "off_topic", "response_text": "Sure.", "confidence": 0.5}'
+        store = BoundedInMemoryStateStore(SQLiteStateStore(tmp_path / "spill.db"), max_sessions=1)
+        async with AgentRuntime(minimal_config, MockLLMClient([reply] * 6), store) as rt:
+            for sid in ("a", "b"):
+                await rt.start_session(sid)
+            for i in range(3):
+                await asyncio.gather(rt.handle_message("a", f"a{i}"), rt.handle_message("b", f"b{i}"))
+            for sid in ("a", "b"):
+                state = await rt.get_state(sid)
+                assert [m.content for m in state.messages if m.role == "user"] == [f"{sid}{i}" for i in range(3)]
+            assert store.stats.evictions > 0
+            assert store.stats.fault_ins > 0
+
+    asyncio.run(run())
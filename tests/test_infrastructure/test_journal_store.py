@@ -0,0 +1,160 @@
+"""JournalStateStore: replay on reopen, torn tails, group commit, snapshots and compaction."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from konko_agent.config.models import AgentConfig
+from konko_agent.domain.state import ConversationState, Message
+from konko_agent.infrastructure.journal_store import _SNAPSHOT, JournalCorruptionError, JournalStateStore, _encode
+from konko_agent.infrastructure.llm_client import MockLLMClient
+from konko_agent.orchestration.agent import ConversationAgent
+
+_OFF_TOPIC = '{"intent": "off_topic", "response_text": "Sure.", "confidence": 0.5}'
+
+
+async def _converse(store: JournalStateStore, config: AgentConfig, session_id: str, turns: int) -> None:
+    agent = ConversationAgent(config, MockLLMClient([_OFF_TOPIC] * turns), store)
+    await agent.start_session(session_id)
+    for i in range(turns):
+        await agent.handle_message(session_id, f"message {i}")
+
+
+def test_state_is_rebuilt_on_reopen(tmp_path: Path, minimal_config: AgentConfig) -> None:
+    async def run() -> None:
+        store = JournalStateStore(tmp_path, snapshot_every=4)
+        await _converse(store, minimal_config, "s", 10)
+        expected = (await store.get("s")).model_copy(deep=True)
+        assert store.stats.snapshots == 2
+        await store.aclose()
+
+        reopened = JournalStateStore(tmp_path)
+        assert await reopened.get("s") == expected
+        assert len(expected.messages) == 21
+        # Only records from the last snapshot on were replayed.
+        assert reopened.stats.replayed_records < reopened.stats.recovered_records
+        await reopened.aclose()
+
+    asyncio.run(run())
+
+
+class _FailingLLM:
+    """Raises on the first ``failures`` calls (an upstream error), then answers."""
+
+    def __init__(self, failures: int) -> None:
+        self.failures = failures
+
+    async def complete(self, system_prompt: str, user_message: str) -> str:
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("upstream returned 503")
+        return _OFF_TOPIC
+
+
+def test_failed_llm_call_leaves_no_trace(tmp_path: Path, minimal_config: AgentConfig) -> None:
+    async def run() -> None:
+        store = JournalStateStore(tmp_path)
+        agent = ConversationAgent(minimal_config, _FailingLLM(2), store)
+        await agent.start_session("s")
+        with pytest.raises(RuntimeError):
+            await agent.handle_message("s", "first")
+        with pytest.raises(RuntimeError):
+            async for _ in agent.handle_message_stream("s", "second"):
+                pass
+        await agent.handle_message("s", "third")
+        live = (await store.get("s")).model_copy(deep=True)
+        assert [m.content for m in live.messages][1:] == ["third", "Sure."]
+        await store.aclose()
+
+        reopened = JournalStateStore(tmp_path)
+        assert await reopened.get("s") == live
+        await reopened.aclose()
+
+    asyncio.run(run())
+
+
+def test_torn_tail_is_truncated(tmp_path: Path, sample_state: ConversationState) -> None:
+    async def run() -> None:
+        store = JournalStateStore(tmp_path)
+        await store.set("s", sample_state)
+        before_last = sample_state.model_copy(deep=True)
+        await store.append_message("s", Message(role="user", content="last"))
+        await store.aclose()
+
+        segment = next(tmp_path.glob("*.journal"))
+        segment.write_bytes(segment.read_bytes()[:-5])
+        reopened = JournalStateStore(tmp_path)
+        assert await reopened.get("s") == before_last
+        assert reopened.stats.truncated_bytes > 0
+        await reopened.append_message("s", Message(role="user", content="again"))
+        await reopened.aclose()
+
+        assert (await JournalStateStore(tmp_path).get("s")).messages[-1].content == "again"
+
+    asyncio.run(run())
+
+
+def test_json_snapshots_from_older_journals_are_read(tmp_path: Path, sample_state: ConversationState) -> None:
+    async def run() -> None:
+        (tmp_path / f"{0:010d}.journal").write_bytes(_encode(_SNAPSHOT, "s", sample_state.model_dump_json()))
+        store = JournalStateStore(tmp_path)
+        assert await store.get("s") == sample_state
+        await store.append_message("s", Message(role="user", content="next"))
+        await store.set("t", sample_state)  # written as a binary snapshot
+        await store.aclose()
+
+        reopened = JournalStateStore(tmp_path)
+        assert (await reopened.get("s")).messages[-1].content == "next"
+        assert await reopened.get("t") == sample_state
+        await reopened.aclose()
+
+    asyncio.run(run())
+
+
+def test_corrupt_sealed_segment_raises(tmp_path: Path, sample_state: ConversationState) -> None:
+    async def run() -> None:
+        store = JournalStateStore(tmp_path, segment_bytes=1)
+        await store.set("a", sample_state)
+        await store.set("b", sample_state)
+        await store.aclose()
+
+    asyncio.run(run())
+    first = sorted(tmp_path.glob("*.journal"))[0]
+    data = bytearray(first.read_bytes())
+    data[-1] ^= 0xFF
+    first.write_bytes(bytes(data))
+    with pytest.raises(JournalCorruptionError):
+        JournalStateStore(tmp_path)
+
+
+def test_concurrent_writes_share_one_fsync(tmp_path: Path, sample_state: ConversationState) -> None:
+    async def run() -> None:
+        store = JournalStateStore(tmp_path)
+        states = [sample_state.model_copy(update={"session_id": f"s{i}"}) for i in range(200)]
+        await asyncio.gather(*(store.set(s.session_id, s) for s in states))
+        assert store.stats.records == 200
+        assert store.stats.fsyncs < 200
+        await store.aclose()
+
+    asyncio.run(run())
+
+
+def test_compaction_bounds_segments(tmp_path: Path, minimal_config: AgentConfig) -> None:
+    async def run() -> None:
+        store = JournalStateStore(tmp_path, segment_bytes=2048, max_segments=2, snapshot_every=1000)
+        await _converse(store, minimal_config, "old", 3)
+        await _converse(store, minimal_config, "busy", 40)
+        expected = {sid: (await store.get(sid)).model_copy(deep=True) for sid in ("old", "busy")}
+        assert store.stats.compactions > 0
+        assert len(list(tmp_path.glob("*.journal"))) <= 3
+        await store.aclose()
+
+        reopened = JournalStateStore(tmp_path)
+        for sid, state in expected.items():
+            assert await reopened.get(sid) == state
+        await reopened.aclose()
+
+    asyncio.run(run())
@@ -0,0 +1,67 @@
+"""Lead file import: CSV/JSONL chunks validated in-process and on a process pool."""
+
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from konko_agent.config.models import AgentConfig, FieldConfig, PersonalityConfig
+from konko_agent.infrastructure.lead_import import iter_lead_chunks, validate_lead_file
+
+
+@pytest.fixture
+def config() -> AgentConfig:
+    return AgentConfig(
+        fields=[
+            FieldConfig(name="email", type="email", prompt="Email?"),
+            FieldConfig(name="phone", type="phone", prompt="Phone?", required=False),
+        ],
+        personality=PersonalityConfig(greeting="Hi"),
+    )
+
+
+ROWS = [
+    {"email": "a@b.co", "phone": "5551234567"},
+    {"email": "a@b.co", "phone": ""},  # optional field left empty
+    {"email": "bad", "phone": "123"},
+    {"email": "", "phone": None},
+]
+
+
+def test_iter_lead_chunks_reads_csv_and_jsonl(tmp_path: Path) -> None:
+    csv_path = tmp_path / "leads.csv"
+    csv_path.write_text("email,phone\n" + "".join(f"{r['email']},{r['phone'] or ''}\n" for r in ROWS))
+    jsonl_path = tmp_path / "leads.jsonl"
+    jsonl_path.write_text("".join(json.dumps(r) + "\n" for r in ROWS))
+    for path in (csv_path, jsonl_path):
+        chunks = list(iter_lead_chunks(path, chunk_rows=3))
+        assert [len(c) for c in chunks] == [3, 1]
+        assert chunks[1][0] == {"email": "", "phone": ""}
+    with pytest.raises(ValueError, match="Unsupported"):
+        list(iter_lead_chunks(tmp_path / "leads.xlsx"))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_validate_lead_file(tmp_path: Path, config: AgentConfig, workers: int) -> None:
+    path = tmp_path / "leads.jsonl"
+    path.write_text("".join(json.dumps(r) + "\n" for r in ROWS * 5))
+    out = io.StringIO()
+    stats = validate_lead_file(path, config, out, workers=workers, chunk_rows=3)
+    assert (stats.rows, stats.valid, stats.invalid) == (20, 10, 10)
+    assert stats.errors == {"email:invalid_format": 5, "phone:too_short": 5, "email:required": 5}
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [line["row"] for line in lines] == list(range(20))
+    assert lines[2] == {"row": 2, "ok": False, "errors": {"email": "invalid_format", "phone": "too_short"}}
+    assert lines[5] == {"row": 5, "ok": True, "errors": {}}
+
+
+def test_unsafe_regex_is_rejected_before_reading(tmp_path: Path) -> None:
+    config = AgentConfig(
+        fields=[FieldConfig(name="code", type="custom", prompt="?", validation_regex=r"^(x+x+)+y$")],
+        personality=PersonalityConfig(greeting="Hi"),
+    )
+    with pytest.raises(ValueError, match="Unsafe validation_regex"):
+        validate_lead_file(tmp_path / "missing.jsonl", config)
@@ -0,0 +1,121 @@
+"""CachingLLMClient: LRU/TTL eviction, cacheability rules, single-flight."""
+
+from __future__ import annotations
+
+import asyncio
+
+from konko_agent.config.models import AgentConfig, FieldConfig, PersonalityConfig
+from konko_agent.infrastructure.llm_cache import CachingLLMClient
+from konko_agent.infrastructure.llm_client import MockLLMClient
+from konko_agent.infrastructure.state_store import InMemoryStateStore
+from konko_agent.orchestration.agent import ConversationAgent
+
+OFF_TOPIC = '{"intent": "off_topic", "response_text": "Let\'s focus: your email?", "confidence": 0.9}'
+FIELD = (
+    '{"intent": "field_response", "response_text": "Thanks.", '
+    '"extracted_value": "a@b.com", "confidence": 0.9, "field_name": "email"}'
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_hit_on_normalized_user_message() -> None:
+    async def run() -> None:
+        inner = MockLLMClient(responses=[OFF_TOPIC])
+        llm = CachingLLMClient(inner, "m")
+        assert await llm.complete("sys", "What is this?") == OFF_TOPIC
+        assert await llm.complete("sys", "  what IS   this? ") == OFF_TOPIC
+        assert inner.call_count == 1
+        assert (llm.stats.hits, llm.stats.misses) == (1, 1)
+
+        await llm.complete("other system prompt", "what is this?")
+        assert inner.call_count == 2
+
+    asyncio.run(run())
+
+
+def test_replies_with_extracted_values_are_not_cached() -> None:
+    async def run() -> None:
+        inner = MockLLMClient(responses=[FIELD, FIELD, "not json", "not json"])
+        llm = CachingLLMClient(inner, "m")
+        await llm.complete("sys", "a@b.com")
+        await llm.complete("sys", "a@b.com")
+        await llm.complete("sys", "hmm")
+        await llm.complete("sys", "hmm")
+        assert inner.call_count == 4
+        assert llm.stats.uncacheable == 4
+        assert len(llm) == 0
+
+    asyncio.run(run())
+
+
+def test_lru_and_ttl_eviction() -> None:
+    async def run() -> None:
+        clock = FakeClock()
+        inner = MockLLMClient(responses=[OFF_TOPIC] * 10)
+        llm = CachingLLMClient(inner, "m", max_entries=2, ttl_seconds=10.0, clock=clock)
+        for msg in ("a", "b", "a", "c"):  # "b" is least recently used when "c" arrives
+            await llm.complete("sys", msg)
+        assert llm.stats.evictions == 1
+        await llm.complete("sys", "b")
+        assert inner.call_count == 4
+
+        clock.now = 11.0
+        await llm.complete("sys", "c")
+        assert llm.stats.expirations == 1
+        assert inner.call_count == 5
+
+    asyncio.run(run())
+
+
+def test_single_flight_shares_one_inner_call() -> None:
+    async def run() -> None:
+        release = asyncio.Event()
+
+        class SlowLLM:
+            calls = 0
+
+            async def complete(self, system_prompt: str, user_message: str) -> str:
+                SlowLLM.calls += 1
+                await release.wait()
+                return FIELD
+
+        llm = CachingLLMClient(SlowLLM(), "m")
+        tasks = [asyncio.create_task(llm.complete("sys", "hi")) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks)
+        assert results == [FIELD] * 5
+        assert SlowLLM.calls == 1
+        assert llm.stats.coalesced == 4
+
+    asyncio.run(run())
+
+
+def test_agent_bypasses_the_cache_when_history_is_sent() -> None:
+    config = AgentConfig(
+        name="C",
+        fields=[FieldConfig(name="email", type="email", prompt="Email?")],
+        personality=PersonalityConfig(greeting="Hi"),
+    )
+
+    async def turns(config: AgentConfig) -> tuple[MockLLMClient, CachingLLMClient]:
+        inner = MockLLMClient(responses=[OFF_TOPIC] * 4)
+        llm = CachingLLMClient(inner, "m")
+        agent = ConversationAgent(config, llm, InMemoryStateStore())
+        for session in ("s1", "s2"):
+            await agent.start_session(session)
+            await agent.handle_message(session, "what is this?")
+        return inner, llm
+
+    inner, llm = asyncio.run(turns(config))
+    assert (inner.call_count, llm.stats.hits) == (1, 1)  # same prompts in both sessions
+
+    inner, llm = asyncio.run(turns(config.model_copy(update={"context_token_budget": 200})))
+    assert (inner.call_count, llm.stats.hits, llm.stats.bypassed) == (2, 0, 2)
@@ -0,0 +1,119 @@
+"""CascadeLLMClient: tier selection on confidence, parse failures and intents; per-tier counters."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import get_args
+
+import pytest
+from pydantic import ValidationError
+
+from konko_agent.config.models import AgentConfig, CascadePolicy, IntentName
+from konko_agent.domain.intent import Intent
+from konko_agent.infrastructure.llm_cascade import CascadeLLMClient
+from konko_agent.infrastructure.llm_client import MockLLMClient
+from konko_agent.infrastructure.state_store import InMemoryStateStore
+from konko_agent.orchestration.runtime import AgentRuntime
+
+
+def _reply(intent: str, confidence: float, value: str | None = None) -> str:
+    extracted = f'"{value}"' if value is not None else "null"
+    return (
+        f'{{"intent": "{intent}", "response_text": "{intent} at {confidence}", '
+        f'"extracted_value": {extracted}, "confidence": {confidence}}}'
+    )
+
+
+class FakeClock:
+    def __init__(self, step: float) -> None:
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self) -> float:
+        self.now += self.step
+        return self.now
+
+
+def test_confident_small_replies_never_reach_the_large_tier() -> None:
+    async def run() -> None:
+        small = MockLLMClient(responses=[_reply("field_response", 0.95)] * 3)
+        large = MockLLMClient()
+        llm = CascadeLLMClient([small, large], ["small", "large"], costs_per_1k_tokens=[0.1, 2.0])
+        for _ in range(3):
+            assert "0.95" in await llm.complete("sys" * 100, "a@b.com")
+        assert (small.call_count, large.call_count) == (3, 0)
+        assert llm.stats.escalation_rate == 0.0
+        tier_small, tier_large = llm.stats.tiers
+        assert tier_small.calls == 3 and tier_small.tokens > 0 and tier_large.calls == 0
+        assert llm.stats.cost == pytest.approx(tier_small.tokens * 0.1 / 1000)
+
+    asyncio.run(run())
+
+
+def test_untrusted_small_replies_are_rerun_on_the_large_tier() -> None:
+    async def run() -> None:
+        small = MockLLMClient(
+            responses=[
+                _reply("field_response", 0.4),  # below the threshold
+                '{"intent": "field_resp',  # does not parse
+                _reply("correction", 0.99),  # always re-run
+                _reply("field_response", 0.8),  # trusted
+            ]
+        )
+        large = MockLLMClient(responses=[_reply("field_response", 0.9, "L1"), "L2", "L3"])
+        llm = CascadeLLMClient([small, large], clock=FakeClock(0.01))
+        replies = [await llm.complete("sys", f"m{i}") for i in range(4)]
+        assert '"L1"' in replies[0] and replies[1:3] == ["L2", "L3"]
+        assert "0.8" in replies[3]
+        stats = llm.stats
+        assert (stats.low_confidence, stats.parse_failures, stats.escalate_intents) == (1, 1, 1)
+        assert (stats.turns, stats.escalated, stats.escalation_rate) == (4, 3, 0.75)
+        assert (stats.tiers[0].calls, stats.tiers[1].calls) == (4, 3)
+        assert stats.tiers[1].mean_latency == pytest.approx(0.01)
+
+    asyncio.run(run())
+
+
+def test_failing_small_tier_falls_through() -> None:
+    class Down:
+        async def complete(self, system_prompt: str, user_message: str) -> str:
+            raise ConnectionError("small model unavailable")
+
+    async def run() -> None:
+        large = MockLLMClient(responses=["large"])
+        llm = CascadeLLMClient([Down(), large])
+        assert await llm.complete("sys", "hi") == "large"
+        assert (llm.stats.errors, llm.stats.tiers[0].failures, llm.stats.escalated) == (1, 1, 1)
+
+    asyncio.run(run())
+
+
+def test_runtime_with_cascade_from_config(minimal_config: AgentConfig) -> None:
+    config = minimal_config.model_copy(
+        update={"cascade": CascadePolicy(model="small-model", confidence_threshold=0.8)}
+    )
+    with pytest.raises(ValidationError):
+        CascadePolicy(model="small-model", confidence_threshold=1.5)
+    with pytest.raises(ValidationError):
+        CascadePolicy(model="small-model", escalate_intents=["chitchat"])
+    # The config spells intents without importing the domain; the names must stay in step.
+    assert set(get_args(IntentName)) == {i.value for i in Intent}
+
+    async def run() -> None:
+        small = MockLLMClient(
+            responses=[_reply("field_response", 0.5, "alice@example.com"), _reply("field_response", 0.9, "Alice")]
+        )
+        large = MockLLMClient(responses=[_reply("field_response", 0.95, "alice@example.com")])
+        llm = CascadeLLMClient.from_config(config, small, large)
+        assert [t.name for t in llm.stats.tiers] == ["small-model", config.llm_model]
+        rt = AgentRuntime(config, llm, InMemoryStateStore())
+        await rt.start_session("s1")
+        await rt.handle_message("s1", "alice@example.com")
+        chunks = [c async for c in rt.handle_message_stream("s1", "I'm Alice")]
+        assert chunks
+        state = await rt.get_state("s1")
+        assert state.fields["email"].current_value == "alice@example.com"
+        assert state.fields["name"].current_value == "Alice"
+        assert (small.call_count, large.call_count) == (2, 1)
+
+    asyncio.run(run())
@@ -0,0 +1,110 @@
+"""KonkoLLMClient: pooled client reuse, warmup, clean shutdown."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+
+from konko_agent.config.models import AgentConfig, FieldConfig, PersonalityConfig
+from konko_agent.domain.intent import turn_response_format
+from konko_agent.infrastructure.llm_client import KonkoLLMClient
+from konko_agent.infrastructure.state_store import InMemoryStateStore
+from konko_agent.orchestration.runtime import AgentRuntime
+
+
+def _completion(content: str) -> dict:
+    return {"choices": [{"message": {"role": "assistant", "content": content}}]}
+
+
+def _transport(seen: list[httpx.Request]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        if request.url.path == "/v1/models":
+            return httpx.Response(200, json={"data": []})
+        body = json.loads(request.content)
+        return httpx.Response(200, json=_completion(body["messages"][1]["content"]))
+
+    return httpx.MockTransport(handler)
+
+
+def test_complete_reuses_one_pooled_client() -> None:
+    async def run() -> None:
+        seen: list[httpx.Request] = []
+        llm = KonkoLLMClient("http://llm.local/", api_key="k", transport=_transport(seen))
+
+        assert await llm.complete("sys", "hello") == "hello"
+        first = llm._client
+        assert await llm.complete("sys", "again") == "again"
+        assert llm._client is first
+
+        assert [r.url.path for r in seen] == ["/v1/chat/completions"] * 2
+        assert seen[0].headers["Authorization"] == "Bearer k"
+        await llm.aclose()
+
+    asyncio.run(run())
+
+
+def test_complete_stream_parses_sse() -> None:
+    async def run() -> None:
+        events = [
+            {"choices": [{"delta": {"role": "assistant"}}]},
+            {"choices": [{"delta": {"content": "Hel"}}]},
+            {"choices": [{"delta": {"content": "lo"}}]},
+        ]
+        body = "".join(f"data: {json.dumps(e)}\n\n" for e in events) + "data: [DONE]\n\n"
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert json.loads(request.content)["stream"] is True
+            return httpx.Response(200, text=body, headers={"Content-Type": "text/event-stream"})
+
+        async with KonkoLLMClient("http://llm.local", transport=httpx.MockTransport(handler)) as llm:
+            chunks = [c async for c in llm.complete_stream("sys", "hi")]
+        assert chunks == ["Hel", "lo"]
+
+    asyncio.run(run())
+
+
+def test_warmup_and_aclose() -> None:
+    async def run() -> None:
+        seen: list[httpx.Request] = []
+        async with KonkoLLMClient("http://llm.local", transport=_transport(seen)) as llm:
+            assert await llm.warmup(3) == 3
+            pooled = llm._client
+            assert pooled is not None
+        assert pooled.is_closed
+        assert llm._client is None
+        assert [r.url.path for r in seen] == ["/v1/models"] * 3
+
+    asyncio.run(run())
+
+
+def test_runtime_context_manager_closes_llm_client() -> None:
+    async def run() -> None:
+        seen: list[httpx.Request] = []
+        config = AgentConfig(
+            name="R",
+            fields=[FieldConfig(name="email", type="email", prompt="Email?")],
+            personality=PersonalityConfig(greeting="Hi", closing="Bye"),
+        )
+        llm = KonkoLLMClient("http://llm.local", transport=_transport(seen))
+        async with AgentRuntime(config, llm, InMemoryStateStore()) as rt:
+            assert await rt.start_session("s") == "Hi"
+            assert llm._client is not None
+        assert llm._client is None
+        assert seen[0].url.path == "/v1/models"
+
+    asyncio.run(run())
+
+
+def test_response_format_is_sent_with_each_request() -> None:
+    async def run() -> None:
+        seen: list[httpx.Request] = []
+        fmt = turn_response_format()
+        async with KonkoLLMClient("http://llm.local", transport=_transport(seen), response_format=fmt) as llm:
+            await llm.complete("sys", "hello")
+        assert json.loads(seen[0].content)["response_format"] == fmt
+
+    asyncio.run(run())
+
@@ -0,0 +1,167 @@
+"""MultiEndpointLLMClient: health routing, retries, hedging against stand-in endpoints."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+
+import httpx
+
+from konko_agent.infrastructure.llm_router import MultiEndpointLLMClient
+
+
+class StandInEndpoint:
+    """In-process stand-in with injected latency and a scripted failure count."""
+
+    def __init__(self, name: str, latency: float = 0.0, failures: int = 0, status: int = 503) -> None:
+        self.name = name
+        self.latency = latency
+        self.failures = failures
+        self.status = status
+        self.calls = 0
+        self.cancelled = 0
+
+    async def complete(self, system_prompt: str, user_message: str) -> str:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.latency)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.failures:
+            self.failures -= 1
+            request = httpx.Request("POST", f"http://{self.name}/v1/chat/completions")
+            raise httpx.HTTPStatusError(
+                "injected", request=request, response=httpx.Response(self.status, request=request)
+            )
+        return self.name
+
+
+def _router(endpoints: list[StandInEndpoint], **kwargs) -> MultiEndpointLLMClient:
+    kwargs.setdefault("backoff_base", 0.0)
+    return MultiEndpointLLMClient(endpoints, names=[e.name for e in endpoints], rng=random.Random(0), **kwargs)
+
+
+def test_routes_to_lower_latency_endpoint() -> None:
+    async def run() -> None:
+        slow, fast = StandInEndpoint("slow", latency=0.02), StandInEndpoint("fast", latency=0.0)
+        llm = _router([slow, fast])
+        results = [await llm.complete("sys", "hi") for _ in range(10)]
+        assert results[-5:] == ["fast"] * 5
+        assert slow.calls == 1  # probed once, then avoided
+
+    asyncio.run(run())
+
+
+def test_retries_retryable_errors_on_another_endpoint() -> None:
+    async def run() -> None:
+        bad, good = StandInEndpoint("bad", failures=1, status=429), StandInEndpoint("good", latency=0.001)
+        llm = _router([bad, good])
+        assert await llm.complete("sys", "hi") == "good"
+        assert llm.stats.retries == 1
+        assert llm.endpoints[0].failures == 1
+        assert llm.endpoints[0].ewma_error > 0
+
+    asyncio.run(run())
+
+
+def test_dead_endpoint_stops_being_tried_first() -> None:
+    async def run() -> None:
+        dead, good = StandInEndpoint("dead", failures=10**6), StandInEndpoint("good", latency=0.001)
+        llm = _router([dead, good])
+        assert [await llm.complete("sys", "hi") for _ in range(20)] == ["good"] * 20
+        assert dead.calls == 1  # probed once, then ranked behind the healthy endpoint
+        assert llm.stats.retries == 1
+
+    asyncio.run(run())
+
+
+def test_non_retryable_error_is_raised() -> None:
+    async def run() -> None:
+        llm = _router([StandInEndpoint("a", failures=1, status=400), StandInEndpoint("b")])
+        try:
+            await llm.complete("sys", "hi")
+        except httpx.HTTPStatusError as exc:
+            assert exc.response.status_code == 400
+        else:
+            raise AssertionError("expected HTTPStatusError")
+        assert llm.stats.retries == 0
+
+    asyncio.run(run())
+
+
+def test_hedges_to_backup_after_primary_p95_and_cancels_loser() -> None:
+    async def run() -> None:
+        primary, backup = StandInEndpoint("primary", latency=0.001), StandInEndpoint("backup", latency=0.001)
+        llm = _router([primary, backup], hedge=True)
+        # Build up a latency history for the primary so it has a p95.
+        for _ in range(25):
+            llm._record_success(0, 0.001)
+        llm._record_success(1, 0.002)
+
+        primary.latency = 0.5  # sudden tail latency on the primary
+        assert await llm.complete("sys", "hi") == "backup"
+        assert llm.stats.hedges == 1
+        assert llm.stats.hedge_wins == 1
+        await asyncio.sleep(0)
+        assert primary.cancelled == 1
+
+    asyncio.run(run())
+
+
+def test_from_urls_against_stand_in_transports() -> None:
+    async def run() -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host == "down.local":
+                return httpx.Response(502)
+            content = json.loads(request.content)["messages"][1]["content"]
+            return httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
+
+        llm = MultiEndpointLLMClient.from_urls(
+            ["http://down.local", "http://up.local"],
+            client_kwargs={"transport": httpx.MockTransport(handler)},
+            backoff_base=0.0,
+        )
+        assert await llm.complete("sys", "hello") == "hello"
+        assert [h.failures for h in llm.endpoints] == [1, 0]
+        await llm.aclose()
+
+    asyncio.run(run())
+
+
+def test_cancelling_the_caller_before_the_hedge_cancels_the_primary() -> None:
+    async def run() -> None:
+        primary, backup = StandInEndpoint("primary", latency=1.0), StandInEndpoint("backup")
+        llm = _router([primary, backup], hedge=True)
+        for _ in range(25):
+            llm._record_success(0, 0.5)  # p95 of 0.5s: the caller is still waiting on the primary alone
+        llm._record_success(1, 0.6)
+
+        call = asyncio.ensure_future(llm.complete("sys", "hi"))
+        await asyncio.sleep(0.01)
+        call.cancel()
+        await asyncio.gather(call, return_exceptions=True)
+        await asyncio.sleep(0)
+        assert primary.cancelled == 1
+        assert llm.stats.hedges == 0 and backup.calls == 0
+
+    asyncio.run(run())
+
+
+def test_retry_after_failed_hedge_skips_both_endpoints() -> None:
+    async def run() -> None:
+        primary = StandInEndpoint("primary", latency=0.02, failures=1)
+        backup = StandInEndpoint("backup", failures=1)
+        spare = StandInEndpoint("spare")
+        llm = _router([primary, backup, spare], hedge=True)
+        for _ in range(25):
+            llm._record_success(0, 0.001)
+        llm._record_success(1, 0.002)
+        llm._record_success(2, 0.2)
+
+        assert await llm.complete("sys", "hi") == "spare"
+        assert (primary.calls, backup.calls, spare.calls) == (1, 1, 1)
+        assert llm.stats.hedges == 1 and llm.stats.retries == 1
+
+    asyncio.run(run())
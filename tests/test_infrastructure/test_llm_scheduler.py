@@ -0,0 +1,137 @@
+"""ScheduledLLMClient: concurrency cap, priority order, AIMD adaptation, rate limit."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+
+from konko_agent.infrastructure.llm_scheduler import ScheduledLLMClient, TokenBucket, request_priority
+
+
+class GatedLLM:
+    """Blocks every call until released; records concurrency and call order."""
+
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+        self.active = 0
+        self.max_active = 0
+        self.order: list[str] = []
+
+    async def complete(self, system_prompt: str, user_message: str) -> str:
+        self.order.append(user_message)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await self.release.wait()
+        self.active -= 1
+        return user_message
+
+
+class FailingLLM:
+    def __init__(self, status: int) -> None:
+        self.status = status
+
+    async def complete(self, system_prompt: str, user_message: str) -> str:
+        request = httpx.Request("POST", "http://llm.local/v1/chat/completions")
+        response = httpx.Response(self.status, request=request)
+        raise httpx.HTTPStatusError("error", request=request, response=response)
+
+
+def test_caps_in_flight_and_reports_queue_depth() -> None:
+    async def run() -> None:
+        inner = GatedLLM()
+        llm = ScheduledLLMClient(inner, initial_limit=2, max_limit=2)
+        tasks = [asyncio.create_task(llm.complete("sys", str(i))) for i in range(6)]
+        await asyncio.sleep(0.01)
+        assert llm.stats.in_flight == 2
+        assert llm.stats.queue_depth == 4
+        inner.release.set()
+        assert await asyncio.gather(*tasks) == [str(i) for i in range(6)]
+        assert inner.max_active == 2
+        assert llm.stats.queue_depth == 0
+        assert llm.stats.in_flight == 0
+        assert llm.stats.max_wait > 0
+
+    asyncio.run(run())
+
+
+def test_waiters_served_by_priority() -> None:
+    async def run() -> None:
+        inner = GatedLLM()
+        llm = ScheduledLLMClient(inner, initial_limit=1, max_limit=1)
+
+        async def call(name: str, priority: int) -> str:
+            with request_priority(priority):
+                return await llm.complete("sys", name)
+
+        first = asyncio.create_task(call("first", 50))
+        await asyncio.sleep(0)
+        queued = [asyncio.create_task(call(n, p)) for n, p in (("low", 9), ("urgent", 0), ("mid", 3))]
+        await asyncio.sleep(0.01)
+        inner.release.set()
+        await asyncio.gather(first, *queued)
+        assert inner.order == ["first", "urgent", "mid", "low"]
+
+    asyncio.run(run())
+
+
+def test_aimd_backs_off_on_429_and_grows_on_fast_success() -> None:
+    async def run() -> None:
+        llm = ScheduledLLMClient(FailingLLM(429), initial_limit=8)
+        try:
+            await llm.complete("sys", "hi")
+        except httpx.HTTPStatusError:
+            pass
+        assert llm.stats.throttled == 1
+        assert llm.stats.concurrency_limit == 4.0
+
+        inner = GatedLLM()
+        inner.release.set()
+        llm = ScheduledLLMClient(inner, initial_limit=4, max_limit=5)
+        for _ in range(20):
+            await llm.complete("sys", "hi")
+        assert llm.stats.concurrency_limit == 5.0
+
+    asyncio.run(run())
+
+
+def test_burst_of_errors_from_one_overload_cuts_the_limit_once() -> None:
+    class GatedFailingLLM(FailingLLM):
+        def __init__(self) -> None:
+            super().__init__(429)
+            self.release = asyncio.Event()
+
+        async def complete(self, system_prompt: str, user_message: str) -> str:
+            await self.release.wait()
+            return await super().complete(system_prompt, user_message)
+
+    async def run() -> None:
+        inner = GatedFailingLLM()
+        llm = ScheduledLLMClient(inner, initial_limit=8)
+        tasks = [asyncio.create_task(llm.complete("sys", str(i))) for i in range(8)]
+        await asyncio.sleep(0.01)
+        inner.release.set()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        assert llm.stats.throttled == 8
+        assert (llm.stats.decreases, llm.stats.concurrency_limit) == (1, 4.0)
+
+        # A call started after the cut reports a new congestion event.
+        try:
+            await llm.complete("sys", "again")
+        except httpx.HTTPStatusError:
+            pass
+        assert (llm.stats.decreases, llm.stats.concurrency_limit) == (2, 2.0)
+
+    asyncio.run(run())
+
+
+def test_token_bucket_waits_for_refill() -> None:
+    async def run() -> None:
+        bucket = TokenBucket(rate=200.0, burst=1.0)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(3):
+            await bucket.acquire()
+        assert loop.time() - start >= 0.009
+
+    asyncio.run(run())
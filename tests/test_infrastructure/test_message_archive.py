@@ -0,0 +1,162 @@
+"""Message archive: paging across blocks, idempotent appends, files, bounded agent history."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from konko_agent.config.models import AgentConfig
+from konko_agent.domain.state import ConversationState, Message
+from konko_agent.infrastructure.journal_store import JournalStateStore
+from konko_agent.infrastructure.llm_client import MockLLMClient
+from konko_agent.infrastructure.message_archive import CompressedMessageArchive, MissingArchiveError
+from konko_agent.infrastructure.sqlite_store import SQLiteStateStore
+from konko_agent.infrastructure.state_store import InMemoryStateStore
+from konko_agent.orchestration.runtime import AgentRuntime
+
+
+def _messages(start: int, n: int) -> list[Message]:
+    return [Message(role="user" if i % 2 else "assistant", content=f"message {i}") for i in range(start, start + n)]
+
+
+def test_pages_span_blocks_and_appends_are_idempotent() -> None:
+    async def run() -> None:
+        archive = CompressedMessageArchive()
+        await archive.append("s1", 0, _messages(0, 5))
+        await archive.append("s1", 3, _messages(3, 6))  # 3 and 4 already stored
+        await archive.append("s1", 9, [])
+        assert archive.stats.messages_archived == 9
+
+        page = await archive.read("s1", 3, 4)
+        assert [m.content for m in page] == [f"message {i}" for i in range(3, 7)]
+        assert [m.content for m in await archive.read("s1", 7, 10)] == ["message 7", "message 8"]
+        assert await archive.read("other", 0, 10) == []
+        with pytest.raises(ValueError):
+            await archive.append("s1", 12, _messages(12, 1))
+
+    asyncio.run(run())
+
+
+def test_file_archive_reloads_and_drops_a_torn_tail(tmp_path: Path) -> None:
+    async def run() -> None:
+        archive = CompressedMessageArchive(tmp_path, fsync=False)
+        await archive.append("s1", 0, _messages(0, 4))
+        await archive.append("s1", 4, _messages(4, 4))
+        (path,) = tmp_path.iterdir()
+        with open(path, "ab") as f:
+            f.write(b"\x08\x00\x00\x00torn")
+
+        reopened = CompressedMessageArchive(tmp_path)
+        assert [m.content for m in await reopened.read("s1", 2, 4)] == [f"message {i}" for i in range(2, 6)]
+        await reopened.append("s1", 8, _messages(8, 1))
+        assert len(await CompressedMessageArchive(tmp_path).read("s1", 0, 100)) == 9
+
+    asyncio.run(run())
+
+
+def test_agent_keeps_a_bounded_window_and_pages_the_full_transcript(
+    tmp_path: Path, minimal_config: AgentConfig
+) -> None:
+    config = minimal_config.model_copy(update={"history_window": 4, "history_archive_batch": 6})
+
+    async def run() -> None:
+        store = SQLiteStateStore(tmp_path / "state.db")
+        archive = CompressedMessageArchive(tmp_path / "archive", fsync=False)
+        runtime = AgentRuntime(config, MockLLMClient(), store, archive=archive)
+        await runtime.start_session("s1")
+        for i in range(20):
+            await runtime.handle_message("s1", f"question {i}")
+            state = await runtime.get_state("s1")
+            assert len(state.messages) < 4 + 6
+
+        assert state.archived_messages + len(state.messages) == 41
+        assert state.messages[-2].content == "question 19"
+        await runtime.aclose()
+
+        # Reopen both tiers: the transcript is whole and in order.
+        store = SQLiteStateStore(tmp_path / "state.db")
+        runtime = AgentRuntime(config, MockLLMClient(), store, archive=CompressedMessageArchive(tmp_path / "archive"))
+        pages, offset = [], 0
+        while offset is not None:
+            page = await runtime.get_transcript("s1", offset, limit=7)
+            pages += page.messages
+            offset = page.next_offset
+        assert len(pages) == 41
+        assert pages[0].content == config.personality.greeting
+        assert [m.content for m in pages[1::2]] == [f"question {i}" for i in range(20)]
+        assert await runtime.get_transcript("missing") is None
+        await runtime.aclose()
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("kind", ["sqlite", "journal"])
+def test_durable_stores_archive_into_themselves(tmp_path: Path, minimal_config: AgentConfig, kind: str) -> None:
+    config = minimal_config.model_copy(update={"history_window": 4, "history_archive_batch": 4})
+
+    def open_store() -> object:
+        if kind == "sqlite":
+            return SQLiteStateStore(tmp_path / "state.db")
+        return JournalStateStore(tmp_path / "journal", fsync=False)
+
+    async def run() -> None:
+        runtime = AgentRuntime(config, MockLLMClient(), open_store())  # no archive given
+        await runtime.start_session("s1")
+        for i in range(10):
+            await runtime.handle_message("s1", f"question {i}")
+        assert (await runtime.get_state("s1")).archived_messages > 0
+        await runtime.aclose()
+
+        runtime = AgentRuntime(config, MockLLMClient(), open_store())  # after a restart
+        page = await runtime.get_transcript("s1", 0, limit=100)
+        assert len(page.messages) == page.total == 21
+        assert [m.content for m in page.messages[1::2]] == [f"question {i}" for i in range(10)]
+        await runtime.aclose()
+
+        store = open_store()
+        with pytest.raises(ValueError, match="durable"):
+            AgentRuntime(config, MockLLMClient(), store, archive=CompressedMessageArchive())
+        await store.aclose()
+
+    asyncio.run(run())
+
+
+def test_missing_archive_ranges_raise(minimal_config: AgentConfig) -> None:
+    config = minimal_config.model_copy(update={"history_window": 4, "history_archive_batch": 4})
+
+    async def run() -> None:
+        store = InMemoryStateStore()
+        runtime = AgentRuntime(config, MockLLMClient(), store)
+        await runtime.start_session("s1")
+        for i in range(10):
+            await runtime.handle_message("s1", f"question {i}")
+        # The same state with an archive that never saw the session's old messages.
+        runtime = AgentRuntime(config, MockLLMClient(), store, archive=CompressedMessageArchive())
+        assert len((await runtime.get_transcript("s1", 18, limit=10)).messages) == 3  # hot messages only
+        with pytest.raises(MissingArchiveError):
+            await runtime.get_transcript("s1", 0, limit=10)
+
+    asyncio.run(run())
+
+
+
+def test_sqlite_set_drops_archive_blocks_past_its_boundary(tmp_path: Path, sample_state: ConversationState) -> None:
+    async def run() -> None:
+        store = SQLiteStateStore(tmp_path / "state.db")
+        archive = store.message_archive()
+        await store.set("s1", sample_state)
+        await archive.append("s1", 0, _messages(0, 4))
+        # Re-stating the same session with its boundary keeps the archive below it.
+        await store.set("s1", sample_state.model_copy(update={"archived_messages": 4}))
+        assert await archive.read("s1", 0, 10) == _messages(0, 4)
+
+        # A session re-created under the same id starts with an empty archive.
+        await store.set("s1", sample_state)
+        assert await archive.read("s1", 0, 10) == []
+        await archive.append("s1", 0, _messages(100, 3))
+        assert await archive.read("s1", 0, 10) == _messages(100, 3)
+        await store.aclose()
+
+    asyncio.run(run())
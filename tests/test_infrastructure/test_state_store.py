@@ -0,0 +1,76 @@
+"""State stores: delta protocol on the in-memory store and the get/set fallback adapter."""
+
+from __future__ import annotations
+
+import asyncio
+
+from konko_agent.config.models import AgentConfig
+from konko_agent.domain.state import ConversationState, FieldAttempt, Message
+from konko_agent.infrastructure.llm_client import MockLLMClient
+from konko_agent.infrastructure.state_store import (
+    DeltaStateStore,
+    InMemoryStateStore,
+    SnapshotDeltaAdapter,
+    as_delta_store,
+)
+from konko_agent.orchestration.agent import ConversationAgent
+
+
+class SnapshotOnlyStore:
+    """A get/set store that round-trips through JSON, like most durable backends."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, str] = {}
+        self.sets = 0
+
+    async def get(self, session_id: str) -> ConversationState | None:
+        raw = self.data.get(session_id)
+        return ConversationState.model_validate_json(raw) if raw is not None else None
+
+    async def set(self, session_id: str, state: ConversationState) -> None:
+        self.sets += 1
+        self.data[session_id] = state.model_dump_json()
+
+
+def test_in_memory_store_supports_deltas(sample_state: ConversationState) -> None:
+    async def run() -> None:
+        store = InMemoryStateStore()
+        assert isinstance(store, DeltaStateStore)
+        assert as_delta_store(store) is store
+        await store.set("s", sample_state)
+        await store.append_message("s", Message(role="user", content="Alice"))
+        await store.append_attempt(
+            "s", "name", FieldAttempt(value="Alice", confidence=1.0, validation_status="valid")
+        )
+        await store.update_state("s", phase="escalated", current_field=None, escalation=None)
+        state = await store.get("s")
+        assert state.messages[-1].content == "Alice"
+        assert state.fields["name"].current_value == "Alice"
+        assert state.phase == "escalated"
+
+    asyncio.run(run())
+
+
+def test_adapter_keeps_snapshot_stores_working(minimal_config: AgentConfig) -> None:
+    async def run() -> None:
+        inner = SnapshotOnlyStore()
+        assert not isinstance(inner, DeltaStateStore)
+        assert isinstance(as_delta_store(inner), SnapshotDeltaAdapter)
+        responses = [
+            '{"intent": "field_response", "response_text": "Name?", '
+            '"extracted_value": "a@b.com", "confidence": 1.0, "field_name": "email"}',
+            '{"intent": "field_response", "response_text": "Thanks!", '
+            '"extracted_value": "Alice", "confidence": 1.0, "field_name": "name"}',
+        ]
+        agent = ConversationAgent(minimal_config, MockLLMClient(responses), inner)
+        await agent.start_session("s")
+        await agent.handle_message("s", "a@b.com")
+        await agent.handle_message("s", "Alice")
+
+        state = await inner.get("s")
+        assert [m.role for m in state.messages] == ["assistant", "user", "assistant", "user", "assistant"]
+        assert state.fields["email"].current_value == "a@b.com"
+        assert state.fields["name"].current_value == "Alice"
+        assert inner.sets == 3
+
+    asyncio.run(run())
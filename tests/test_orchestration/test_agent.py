@@ -6,7 +6,7 @@ import asyncio
 
 import pytest
 
-from konko_agent.config.models import AgentConfig, FieldConfig, PersonalityConfig
+from konko_agent.config.models import AgentConfig, EscalationPolicy, FieldConfig, PersonalityConfig
 from konko_agent.infrastructure.llm_client import MockLLMClient
 from konko_agent.infrastructure.state_store import InMemoryStateStore
 from konko_agent.orchestration.agent import ConversationAgent
@@ -70,3 +70,56 @@ def test_correction_adds_field_attempt_with_source_corrected(four_field_config:
         assert state.fields["email"].current_value == "right@new.com"
 
     asyncio.run(run())
+
+
+def test_trigger_phrase_escalates_without_llm_call(four_field_config: AgentConfig) -> None:
+    """A trigger phrase is answered with the closing message and no LLM round trip."""
+    async def run() -> None:
+        config = four_field_config.model_copy(
+            update={"escalation": EscalationPolicy(trigger_phrases=["speak to a human"])}
+        )
+        mock_llm = MockLLMClient()
+        agent = ConversationAgent(config, mock_llm, InMemoryStateStore())
+        await agent.start_session("s3")
+
+        reply = await agent.handle_message("s3", "Can I  SPEAK to a human?")
+        assert reply == "Bye"
+        assert mock_llm.call_count == 0
+
+        state = await agent.get_state("s3")
+        assert state is not None
+        assert state.escalation is not None
+        assert state.escalation.reason == "user_request"
+        assert state.phase == "escalated"
+        assert state.messages[-1].content == "Bye"
+
+    asyncio.run(run())
+
+
+def test_multiple_extractions_recorded_in_one_turn(four_field_config: AgentConfig) -> None:
+    """Several values in one message are validated and recorded from a single LLM call."""
+    async def run() -> None:
+        responses = [
+            '{"intent": "field_response", "response_text": "Thanks Alice! What is your address?", '
+            '"extracted_value": "alice@example.com", "confidence": 0.9, "field_name": "email", '
+            '"extractions": ['
+            '{"field_name": "email", "value": "alice@example.com", "confidence": 0.9}, '
+            '{"field_name": "name", "value": "Alice Smith", "confidence": 0.95}, '
+            '{"field_name": "phone", "value": "555", "confidence": 0.6}, '
+            '{"field_name": "unknown", "value": "x"}]}',
+        ]
+        mock_llm = MockLLMClient(responses=responses)
+        agent = ConversationAgent(four_field_config, mock_llm, InMemoryStateStore())
+
+        await agent.handle_message("s4", "I'm Alice Smith, alice@example.com, 555")
+
+        state = await agent.get_state("s4")
+        assert state is not None
+        assert mock_llm.call_count == 1
+        assert state.fields["email"].current_value == "alice@example.com"
+        assert len(state.fields["email"].attempts) == 1
+        assert state.fields["name"].current_value == "Alice Smith"
+        assert state.fields["phone"].attempts[0].validation_status == "invalid"
+        assert state.current_field == "phone"
+
+    asyncio.run(run())
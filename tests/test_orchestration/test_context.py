@@ -0,0 +1,91 @@
+"""Context assembler: budgeted recent history, incremental rolling summary, agent wiring."""
+
+from __future__ import annotations
+
+import asyncio
+
+from konko_agent.config.models import AgentConfig
+from konko_agent.domain.compact_state import CompactState, MessageRecord
+from konko_agent.infrastructure.llm_client import MockLLMClient
+from konko_agent.infrastructure.state_store import InMemoryStateStore
+from konko_agent.orchestration.agent import ConversationAgent
+from konko_agent.orchestration.context import ContextAssembler, RollingSummary, estimate_tokens
+
+
+def _state(turns: int) -> CompactState:
+    state = CompactState(session_id="s1", phase="collecting", messages=[MessageRecord("assistant", "Hi! Your email?")])
+    for i in range(turns):
+        state.messages.append(MessageRecord("user", f"this is my answer number {i}, with a few more words"))
+        state.messages.append(MessageRecord("assistant", f"Thanks for answer {i}. Could you tell me more?"))
+    state.messages.append(MessageRecord("user", "yes that's right"))
+    return state
+
+
+def test_without_a_budget_only_the_latest_message_is_sent(minimal_config: AgentConfig) -> None:
+    assert ContextAssembler(minimal_config).user_message(_state(3)) == "yes that's right"
+
+
+def test_recent_messages_are_sent_verbatim_within_the_budget(minimal_config: AgentConfig) -> None:
+    config = minimal_config.model_copy(update={"context_token_budget": 400})
+    text = ContextAssembler(config).user_message(_state(2))
+    assert "summary" not in text
+    assert "assistant: Thanks for answer 1. Could you tell me more?" in text
+    assert text.endswith("Latest user message:\nyes that's right")
+
+
+def test_long_histories_stay_within_budget_and_fold_each_message_once(minimal_config: AgentConfig) -> None:
+    config = minimal_config.model_copy(update={"context_token_budget": 200})
+    assembler = ContextAssembler(config)
+    state = _state(0)
+    for i in range(60):
+        text = assembler.user_message(state)
+        assert estimate_tokens(text) <= 200 + 20  # section headers are not budgeted
+        summary = state.context_summary
+        assert isinstance(summary, RollingSummary)
+        upto = summary.upto
+        assert assembler.user_message(state) == text  # cached: nothing folded twice
+        assert summary.upto == upto and state.context_summary is summary
+        state.messages.append(MessageRecord("assistant", f"Reply {i}, could you confirm your details?"))
+        state.messages.append(MessageRecord("user", f"my answer is number {i}"))
+
+    assert "Earlier in the conversation (summary):" in text
+    assert "earlier messages omitted" in text
+    assert summary.tokens <= 200 // 4
+    assert text.endswith("my answer is number 58")  # the latest user message
+    assert "user: my answer is number 57" in text  # previous turn verbatim
+
+
+def test_summary_skips_archived_messages_after_a_reload(minimal_config: AgentConfig) -> None:
+    config = minimal_config.model_copy(update={"context_token_budget": 100})
+    state = _state(20)
+    del state.messages[:30]
+    state.archived_messages = 30
+    ContextAssembler(config).user_message(state)
+    assert state.context_summary.omitted >= 30
+
+
+class RecordingLLM(MockLLMClient):
+    def __init__(self) -> None:
+        super().__init__()
+        self.user_messages: list[str] = []
+
+    async def complete(self, system_prompt: str, user_message: str) -> str:
+        self.user_messages.append(user_message)
+        return await super().complete(system_prompt, user_message)
+
+
+def test_agent_sends_the_assembled_context(minimal_config: AgentConfig) -> None:
+    config = minimal_config.model_copy(update={"context_token_budget": 500})
+
+    async def run() -> None:
+        llm = RecordingLLM()
+        agent = ConversationAgent(config, llm, InMemoryStateStore())
+        await agent.start_session("s1")
+        await agent.handle_message("s1", "is it alice@example.com you have?")
+        await agent.handle_message("s1", "yes that's right")
+        first, second = llm.user_messages
+        assert f"assistant: {config.personality.greeting}" in first
+        assert "user: is it alice@example.com you have?" in second
+        assert second.endswith("yes that's right")
+
+    asyncio.run(run())
@@ -0,0 +1,112 @@
+"""Fast path: confident local matches skip the LLM; ambiguous replies do not."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from konko_agent.config.models import AgentConfig, FieldConfig, PersonalityConfig
+from konko_agent.infrastructure.llm_client import MockLLMClient
+from konko_agent.infrastructure.state_store import InMemoryStateStore
+from konko_agent.orchestration.agent import ConversationAgent
+from konko_agent.orchestration.fast_path import FastPathClassifier
+
+
+@pytest.fixture
+def config() -> AgentConfig:
+    return AgentConfig(
+        name="F",
+        fields=[
+            FieldConfig(name="email", type="email", prompt="Email?"),
+            FieldConfig(name="name", type="name", prompt="Name?"),
+            FieldConfig(name="phone", type="phone", prompt="Phone?"),
+        ],
+        personality=PersonalityConfig(greeting="Hi", closing="Bye"),
+        fast_path=True,
+    )
+
+
+@pytest.mark.parametrize(
+    ("message", "field_index", "expected"),
+    [
+        ("alice@example.com", 0, "alice@example.com"),
+        ("It's alice@example.com.", 0, "alice@example.com"),
+        ("my email address is alice@example.com", 0, "alice@example.com"),
+        ("+1 555 123 4567", 2, "+1 555 123 4567"),
+        ("My name is Alice Smith", 1, "Alice Smith"),
+        ("Alice Smith", 1, None),  # bare names are too ambiguous ("ok", "hello")
+        ("what is this?", 0, None),
+        ("my phone is 555", 2, None),
+    ],
+)
+def test_classifier_matches(config: AgentConfig, message: str, field_index: int, expected: str | None) -> None:
+    classifier = FastPathClassifier(config)
+    assert asyncio.run(classifier.match(message, config.fields[field_index])) == expected
+
+
+def test_fast_path_skips_llm_and_asks_next_prompt(config: AgentConfig) -> None:
+    async def run() -> None:
+        mock = MockLLMClient()
+        agent = ConversationAgent(config, mock, InMemoryStateStore())
+        await agent.start_session("s")
+
+        reply = await agent.handle_message("s", "alice@example.com")
+        assert reply == "Name?"
+        assert mock.call_count == 0
+
+        state = await agent.get_state("s")
+        assert state is not None
+        assert state.fields["email"].current_value == "alice@example.com"
+        assert state.fields["email"].attempts[0].source == "user_provided"
+        assert state.current_field == "name"
+        assert state.phase == "collecting"
+
+        await agent.handle_message("s", "hello there")  # ambiguous: goes to the LLM
+        assert mock.call_count == 1
+        assert agent.stats.fast_path_turns == 1
+        assert agent.stats.llm_turns == 1
+
+    asyncio.run(run())
+
+
+def test_fast_path_disabled_by_default(config: AgentConfig) -> None:
+    async def run() -> None:
+        mock = MockLLMClient()
+        agent = ConversationAgent(config.model_copy(update={"fast_path": False}), mock, InMemoryStateStore())
+        await agent.handle_message("s", "alice@example.com")
+        assert mock.call_count == 1
+        assert agent.stats.fast_path_turns == 0
+
+    asyncio.run(run())
+
+
+def test_fast_path_applies_the_agent_validation_limits() -> None:
+    # The value passes the regex but exceeds validation_max_length: the agent would
+    # record it as invalid, so the fast path must not answer it either.
+    config = AgentConfig(
+        name="F",
+        fields=[FieldConfig(name="code", type="custom", prompt="Code?", validation_regex="^[A-Z0-9]+$")],
+        personality=PersonalityConfig(greeting="Hi", closing="Bye"),
+        fast_path=True,
+        validation_max_length=8,
+    )
+
+    async def run() -> None:
+        mock = MockLLMClient(
+            responses=['{"intent": "field_response", "response_text": "Too long.", "extracted_value": null}']
+        )
+        agent = ConversationAgent(config, mock, InMemoryStateStore())
+        await agent.start_session("s")
+        assert await agent.handle_message("s", "ABCDEFGHIJKLMNOPQRSTUVWXYZ") == "Too long."
+        assert (agent.stats.fast_path_turns, mock.call_count) == (0, 1)
+
+        assert await agent.handle_message("s", "AB12") == "Bye"
+        assert agent.stats.fast_path_turns == 1
+        state = await agent.get_state("s")
+        assert [a.validation_status for a in state.fields["code"].attempts] == ["valid"]
+        # One check per message: the recorded attempt reused the fast path's result.
+        assert agent.validation_stats["code"].calls == 2
+        await agent.aclose()
+
+    asyncio.run(run())
@@ -0,0 +1,109 @@
+"""Field validation: latency metrics, off-loop matching and timeouts for custom regexes."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from konko_agent.config.models import AgentConfig, FieldConfig, PersonalityConfig
+from konko_agent.orchestration.field_validation import TRIAL_MATCHES, FieldValidator
+
+
+def _config(**limits: float) -> AgentConfig:
+    return AgentConfig(
+        fields=[
+            FieldConfig(name="email", type="email", prompt="Email?"),
+            # Polynomial backtracking the static check does not catch (no enclosing repeat).
+            FieldConfig(name="code", type="custom", prompt="Code?", validation_regex=r"^x*x*x*x*x*x*y$"),
+        ],
+        personality=PersonalityConfig(greeting="Hi"),
+        **limits,
+    )
+
+
+def test_custom_field_runs_off_loop_until_proven_fast() -> None:
+    async def run() -> None:
+        config = _config()
+        validator = FieldValidator(config)
+        email, code = config.fields
+        try:
+            assert await validator.validate(email, "a@b.co") == (True, "")
+            assert not validator.is_off_loop("email")  # only custom regexes move
+            assert validator.is_off_loop("code")
+            for n in range(TRIAL_MATCHES):
+                assert await validator.validate(code, "x" * n + "y") == (True, "")
+            assert not validator.is_off_loop("code")
+            assert await validator.validate(code, "xxxz") == (False, "Invalid format.")
+            assert await validator.validate(code, "x" * 300) == (False, "Value is too long.")
+            stats = validator.stats["code"]
+            assert stats.calls == TRIAL_MATCHES + 2 and stats.max_time >= stats.avg_time > 0
+            assert (stats.off_loop, stats.over_budget, stats.timeouts) == (TRIAL_MATCHES, 0, 0)
+        finally:
+            await validator.aclose()
+
+    asyncio.run(run())
+
+
+def test_first_pathological_value_never_runs_on_the_loop() -> None:
+    async def run() -> None:
+        config = _config(validation_timeout_ms=200)
+        validator = FieldValidator(config)
+        code = config.fields[1]
+        try:
+            loop = asyncio.get_running_loop()
+            gaps: list[float] = []
+
+            async def tick() -> None:
+                last = loop.time()
+                while True:
+                    await asyncio.sleep(0.01)
+                    gaps.append(loop.time() - last)
+                    last = loop.time()
+
+            ticker = asyncio.create_task(tick())
+            # About a second of backtracking if matched inline; abandoned instead.
+            assert await validator.validate(code, "x" * 70) == (False, "Validation timed out.")
+            ticker.cancel()
+            assert gaps and max(gaps) < 0.15  # the event loop kept running
+            assert validator.is_off_loop("code")
+            # A fresh worker replaces the killed one.
+            assert await validator.validate(code, "xxxxz") == (False, "Invalid format.")
+            stats = validator.stats["code"]
+            assert (stats.calls, stats.off_loop, stats.timeouts) == (2, 2, 1)
+        finally:
+            await validator.aclose()
+
+    asyncio.run(run())
+
+
+def test_field_over_budget_stays_off_loop() -> None:
+    async def run() -> None:
+        config = _config(validation_budget_ms=5, validation_timeout_ms=5000)
+        validator = FieldValidator(config)
+        code = config.fields[1]
+        try:
+            for n in range(TRIAL_MATCHES):
+                assert await validator.validate(code, "x" * n + "y") == (True, "")
+            assert not validator.is_off_loop("code")
+            # Tens of milliseconds inline: over budget, so the field moves back for good.
+            assert await validator.validate(code, "x" * 45) == (False, "Invalid format.")
+            assert validator.is_off_loop("code")
+            for n in range(TRIAL_MATCHES + 1):
+                assert await validator.validate(code, "x" * n + "y") == (True, "")
+            assert validator.is_off_loop("code")
+            stats = validator.stats["code"]
+            assert (stats.over_budget, stats.off_loop, stats.timeouts) == (1, 2 * TRIAL_MATCHES + 1, 0)
+        finally:
+            await validator.aclose()
+
+    asyncio.run(run())
+
+
+def test_unsafe_regex_is_rejected_before_anything_is_matched() -> None:
+    config = AgentConfig(
+        fields=[FieldConfig(name="x", type="custom", prompt="?", validation_regex=r"^(\w+\d+)+$")],
+        personality=PersonalityConfig(greeting="Hi"),
+    )  # loads: the config models only check that the pattern compiles
+    with pytest.raises(ValueError, match="Unsafe validation_regex"):
+        FieldValidator(config)
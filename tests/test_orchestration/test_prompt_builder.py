@@ -0,0 +1,37 @@
+"""Prompt builder: static prefix is stable across turns; state goes at the end."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from konko_agent.config.models import AgentConfig
+from konko_agent.domain.state import ConversationState, FieldAttempt
+from konko_agent.orchestration.prompt_builder import (
+    TURN_JSON_SCHEMA,
+    build_system_prompt,
+    compile_prompt_template,
+)
+
+
+def test_static_prefix_identical_across_turns(minimal_config: AgentConfig, sample_state: ConversationState) -> None:
+    template = compile_prompt_template(minimal_config)
+    before = template.render(sample_state)
+
+    sample_state.fields["name"].attempts.append(
+        FieldAttempt(value="Alice", timestamp=datetime.utcnow(), confidence=1.0, validation_status="valid")
+    )
+    sample_state.current_field = None
+    after = template.render(sample_state)
+
+    assert before.startswith(template.static_prefix)
+    assert after.startswith(template.static_prefix)
+    assert before != after
+    # A fresh compile (new session / process) yields the byte-identical prefix.
+    assert compile_prompt_template(minimal_config).static_prefix == template.static_prefix
+
+
+def test_dynamic_state_follows_static_rules(minimal_config: AgentConfig, sample_state: ConversationState) -> None:
+    prompt = build_system_prompt(minimal_config, sample_state)
+    assert TURN_JSON_SCHEMA.strip() in compile_prompt_template(minimal_config).static_prefix
+    assert prompt.index(TURN_JSON_SCHEMA.strip()) < prompt.index("Current field you are collecting: name")
+    assert prompt.endswith("Already collected (do not ask again unless the user clearly corrects them):")
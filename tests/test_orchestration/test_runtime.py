@@ -1,13 +1,16 @@
-"""Runtime: session isolation (N concurrent sessions, no state leakage)."""
+"""Runtime: session isolation (N concurrent sessions, no state leakage), per-session turn ordering."""
 
 from __future__ import annotations
 
 import asyncio
+import gc
+from pathlib import Path
 
 import pytest
 
 from konko_agent.config.models import AgentConfig, FieldConfig, PersonalityConfig
 from konko_agent.infrastructure.llm_client import MockLLMClient
+from konko_agent.infrastructure.sqlite_store import SQLiteStateStore
 from konko_agent.infrastructure.state_store import InMemoryStateStore
 from konko_agent.orchestration.runtime import AgentRuntime
 
@@ -75,3 +78,99 @@ def test_start_session_adds_greeting_message() -> None:
         assert state.messages[0].content == greeting
 
     asyncio.run(run())
+
+
+class SlowLLMClient:
+    """Off-topic replies after a short await, tracking how many calls overlap."""
+
+    def __init__(self, delay: float = 0.002) -> None:
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.calls = 0
+
+    async def complete(self, system_prompt: str, user_message: str) -> str:
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        return '{"intent": "off_topic", "response_text": "Noted.", "confidence": 0.5}'
+
+
+def test_concurrent_turns_on_one_session_are_serialized(tmp_path: Path) -> None:
+    async def run() -> None:
+        config = AgentConfig(
+            name="R",
+            fields=[FieldConfig(name="email", type="email", prompt="Email?")],
+            personality=PersonalityConfig(greeting="Hi", closing="Bye"),
+        )
+        llm = SlowLLMClient()
+        async with AgentRuntime(config, llm, SQLiteStateStore(tmp_path / "s.db")) as rt:
+            await rt.start_session("s")
+            await asyncio.gather(*(rt.handle_message("s", f"m{i}") for i in range(50)))
+            state = await rt.get_state("s")
+            assert len(state.messages) == 1 + 2 * 50
+            assert {m.content for m in state.messages if m.role == "user"} == {f"m{i}" for i in range(50)}
+            assert llm.max_active == 1
+
+            # Different sessions still run in parallel.
+            await asyncio.gather(*(rt.handle_message(f"p{i}", "hi") for i in range(10)))
+            assert llm.max_active > 1
+
+            gc.collect()
+            assert len(rt._session_locks) == 0
+
+    asyncio.run(run())
+
+
+def _coalescing_runtime(llm: SlowLLMClient, window: float) -> AgentRuntime:
+    config = AgentConfig(
+        name="R",
+        fields=[FieldConfig(name="email", type="email", prompt="Email?")],
+        personality=PersonalityConfig(greeting="Hi", closing="Bye"),
+    )
+    return AgentRuntime(config, llm, InMemoryStateStore(), coalesce_window=window)
+
+
+def test_burst_is_answered_by_one_turn() -> None:
+    async def run() -> None:
+        llm = SlowLLMClient()
+        rt = _coalescing_runtime(llm, window=0.02)
+        await rt.start_session("s")
+        replies = await asyncio.gather(
+            rt.handle_message("s", "my email is"),
+            rt.handle_message("s", "alice@example.com"),
+            rt.handle_message("s", "sorry, alice@example.org"),
+        )
+        assert replies == ["Noted."] * 3
+        assert llm.calls == 1
+        state = await rt.get_state("s")
+        assert [m.content for m in state.messages if m.role == "user"] == [
+            "my email is\nalice@example.com\nsorry, alice@example.org"
+        ]
+        assert rt.stats.coalesced_messages == 2
+
+    asyncio.run(run())
+
+
+def test_newer_burst_supersedes_in_flight_turn() -> None:
+    async def run() -> None:
+        llm = SlowLLMClient(delay=0.1)
+        rt = _coalescing_runtime(llm, window=0.001)
+        await rt.start_session("s")
+        first = asyncio.create_task(rt.handle_message("s", "my email is"))
+        await asyncio.sleep(0.03)  # first turn is now waiting on the LLM
+        assert rt._agent.awaiting_llm("s")
+        second = await rt.handle_message("s", "alice@example.com")
+        assert await first == second == "Noted."
+        assert llm.calls == 2
+        state = await rt.get_state("s")
+        # The cancelled turn left nothing behind.
+        assert [m.role for m in state.messages] == ["assistant", "user", "assistant"]
+        assert state.messages[1].content == "my email is\nalice@example.com"
+        assert rt.stats.superseded_turns == 1
+
+    asyncio.run(run())
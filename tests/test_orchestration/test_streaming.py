@@ -0,0 +1,88 @@
+"""Streaming turns: incremental response_text parsing and handle_message_stream."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+from konko_agent.config.models import AgentConfig, FieldConfig, PersonalityConfig
+from konko_agent.infrastructure.llm_client import MockLLMClient
+from konko_agent.infrastructure.state_store import InMemoryStateStore
+from konko_agent.orchestration.runtime import AgentRuntime
+from konko_agent.orchestration.stream_parser import ResponseTextStreamer
+
+
+def _config() -> AgentConfig:
+    return AgentConfig(
+        name="S",
+        fields=[
+            FieldConfig(name="email", type="email", prompt="Email?"),
+            FieldConfig(name="name", type="name", prompt="Name?"),
+        ],
+        personality=PersonalityConfig(greeting="Hi", closing="Bye"),
+    )
+
+
+def test_streamer_decodes_escapes_split_across_chunks() -> None:
+    text = 'Line "one"\nsecond é \U0001F44B done'
+    # json.dumps escapes non-ASCII, so this covers \uXXXX and surrogate pairs too.
+    raw = json.dumps({"intent": "off_topic", "response_text": text, "confidence": 0.9})
+    for size in (1, 2, 3, 7):
+        streamer = ResponseTextStreamer()
+        out = "".join(streamer.feed(raw[i : i + size]) for i in range(0, len(raw), size))
+        assert out == text
+        assert streamer.done
+
+
+def test_streamer_ignores_text_before_key() -> None:
+    streamer = ResponseTextStreamer()
+    assert streamer.feed('```json\n{"intent": "field_response", "resp') == ""
+    assert streamer.feed('onse_text": "Got') == "Got"
+    assert streamer.feed(' it", "confidence": 1}') == " it"
+    assert streamer.text == "Got it"
+
+
+def test_handle_message_stream_yields_deltas_and_persists() -> None:
+    async def run() -> None:
+        mock = MockLLMClient(
+            responses=[
+                '{"intent": "field_response", "response_text": "Got your email. Name?", '
+                '"extracted_value": "a@b.com", "confidence": 0.9, "field_name": "email"}',
+            ],
+            chunk_size=4,
+        )
+        rt = AgentRuntime(_config(), mock, InMemoryStateStore())
+        deltas = [d async for d in rt.handle_message_stream("s", "a@b.com")]
+
+        assert len(deltas) > 1
+        assert "".join(deltas) == "Got your email. Name?"
+        state = await rt.get_state("s")
+        assert state is not None
+        assert state.fields["email"].current_value == "a@b.com"
+        assert state.current_field == "name"
+        assert state.messages[-1].content == "Got your email. Name?"
+
+    asyncio.run(run())
+
+
+def test_handle_message_stream_appends_closing_on_escalation() -> None:
+    async def run() -> None:
+        mock = MockLLMClient(
+            responses=[
+                '{"intent": "field_response", "response_text": "Ok.", '
+                '"extracted_value": "a@b.com", "confidence": 0.9, "field_name": "email"}',
+                '{"intent": "field_response", "response_text": "Thanks Al.", '
+                '"extracted_value": "Al", "confidence": 0.9, "field_name": "name"}',
+            ]
+        )
+        rt = AgentRuntime(_config(), mock, InMemoryStateStore())
+        await rt.handle_message("s", "a@b.com")
+        deltas = [d async for d in rt.handle_message_stream("s", "Al")]
+
+        assert "".join(deltas) == "Thanks Al.\nBye"
+        state = await rt.get_state("s")
+        assert state is not None
+        assert state.phase == "escalated"
+        assert state.messages[-1].content == "Bye"
+
+    asyncio.run(run())